@@ -10,6 +10,9 @@ from app.domain.entities.role import Role, user_roles
 from app.domain.entities.permission import Permission, role_permissions
 from app.domain.entities.form_field import FormField
 from app.domain.entities.audit_log import AuditLog
+from app.domain.entities.email_outbox import EmailOutbox
+from app.domain.entities.password_reset_token import PasswordResetToken
+from app.domain.entities.auth_session import AuthSession
 
 
 config = context.config
@@ -0,0 +1,31 @@
+"""users listing indexes
+
+Revision ID: 3f1c9a7d2b10
+Revises: 0d67d4a9dbd9
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7d2b10'
+down_revision = '0d67d4a9dbd9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'])
+    op.create_index('ix_users_is_active_created_at_id', 'users', ['is_active', 'created_at', 'id'])
+    # Functional index (MySQL 8.0.13+) backing the email domain filter
+    op.execute(
+        "CREATE INDEX ix_users_email_domain ON users ((substring_index(email, '@', -1)))"
+    )
+
+
+def downgrade():
+    op.drop_index('ix_users_email_domain', table_name='users')
+    op.drop_index('ix_users_is_active_created_at_id', table_name='users')
+    op.drop_index('ix_users_created_at_id', table_name='users')
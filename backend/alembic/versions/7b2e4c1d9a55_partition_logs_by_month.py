@@ -0,0 +1,73 @@
+"""partition logs by month
+
+Revision ID: 7b2e4c1d9a55
+Revises: 3f1c9a7d2b10
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2e4c1d9a55'
+down_revision = '3f1c9a7d2b10'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+
+def _add_months(year, month, months):
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+def upgrade():
+    # Partitioned tables cannot have foreign keys; deleting a user now
+    # clears logs.user_id in UserRepository.delete_user instead.
+    op.drop_constraint('logs_ibfk_1', 'logs', type_='foreignkey')
+    op.execute("UPDATE logs SET timestamp = UTC_TIMESTAMP() WHERE timestamp IS NULL")
+    op.alter_column('logs', 'timestamp', existing_type=sa.DateTime(), nullable=False)
+    # Every unique key must include the partitioning column
+    op.execute("ALTER TABLE logs DROP PRIMARY KEY, ADD PRIMARY KEY (id, timestamp)")
+
+    op.create_index('ix_logs_timestamp', 'logs', ['timestamp'])
+    op.create_index('ix_logs_user_id_timestamp', 'logs', ['user_id', 'timestamp'])
+    op.create_index('ix_logs_action_timestamp', 'logs', ['action', 'timestamp'])
+
+    now = datetime.utcnow()
+    oldest = op.get_bind().execute(sa.text("SELECT MIN(timestamp) FROM logs")).scalar() or now
+    year, month = oldest.year, oldest.month
+    last_year, last_month = _add_months(now.year, now.month, MONTHS_AHEAD)
+    partitions = []
+    while (year, month) <= (last_year, last_month):
+        next_year, next_month = _add_months(year, month, 1)
+        partitions.append(
+            f"PARTITION p{year:04d}{month:02d} "
+            f"VALUES LESS THAN ('{next_year:04d}-{next_month:02d}-01')"
+        )
+        year, month = next_year, next_month
+    partitions.append("PARTITION p_future VALUES LESS THAN (MAXVALUE)")
+    op.execute(
+        "ALTER TABLE logs PARTITION BY RANGE COLUMNS(timestamp) ("
+        + ", ".join(partitions)
+        + ")"
+    )
+
+
+def downgrade():
+    op.execute("ALTER TABLE logs REMOVE PARTITIONING")
+    op.drop_index('ix_logs_action_timestamp', table_name='logs')
+    op.drop_index('ix_logs_user_id_timestamp', table_name='logs')
+    op.drop_index('ix_logs_timestamp', table_name='logs')
+    op.execute("ALTER TABLE logs DROP PRIMARY KEY, ADD PRIMARY KEY (id)")
+    op.alter_column('logs', 'timestamp', existing_type=sa.DateTime(), nullable=True)
+    op.execute(
+        "UPDATE logs SET user_id = NULL "
+        "WHERE user_id IS NOT NULL AND user_id NOT IN (SELECT id FROM users)"
+    )
+    op.create_foreign_key(
+        'logs_ibfk_1', 'logs', 'users', ['user_id'], ['id'], ondelete='SET NULL'
+    )
@@ -0,0 +1,46 @@
+"""role hierarchy and permission closure
+
+Revision ID: 9c4d2f6e8a13
+Revises: 7b2e4c1d9a55
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c4d2f6e8a13'
+down_revision = '7b2e4c1d9a55'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'role_inheritance',
+        sa.Column('role_id', sa.String(length=36), nullable=False),
+        sa.Column('parent_role_id', sa.String(length=36), nullable=False),
+        sa.ForeignKeyConstraint(['role_id'], ['roles.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['parent_role_id'], ['roles.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('role_id', 'parent_role_id')
+    )
+    op.create_table(
+        'role_effective_permissions',
+        sa.Column('role_id', sa.String(length=36), nullable=False),
+        sa.Column('permission_name', sa.String(length=50), nullable=False),
+        sa.ForeignKeyConstraint(['role_id'], ['roles.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['permission_name'], ['permissions.name'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('role_id', 'permission_name')
+    )
+    # No inheritance exists yet, so the closure is the direct grants
+    op.execute(
+        "INSERT INTO role_effective_permissions (role_id, permission_name) "
+        "SELECT DISTINCT role_id, permission_name FROM role_permissions "
+        "WHERE role_id IS NOT NULL AND permission_name IS NOT NULL"
+    )
+
+
+def downgrade():
+    op.drop_table('role_effective_permissions')
+    op.drop_table('role_inheritance')
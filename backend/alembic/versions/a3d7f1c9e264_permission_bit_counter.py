@@ -0,0 +1,34 @@
+"""permission bit counter
+
+Revision ID: a3d7f1c9e264
+Revises: f2c8a1e5b307
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d7f1c9e264'
+down_revision = 'f2c8a1e5b307'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'permission_bit_counter',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('next_bit', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    # Continue after the highest position handed out so far
+    op.execute(
+        "INSERT INTO permission_bit_counter (id, next_bit) "
+        "SELECT 1, COALESCE(MAX(bit) + 1, 0) FROM permissions"
+    )
+
+
+def downgrade():
+    op.drop_table('permission_bit_counter')
@@ -0,0 +1,33 @@
+"""permission bit positions
+
+Revision ID: b5e8a3c7d214
+Revises: 9c4d2f6e8a13
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e8a3c7d214'
+down_revision = '9c4d2f6e8a13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('permissions', sa.Column('bit', sa.Integer(), nullable=True))
+    op.create_unique_constraint('uq_permissions_bit', 'permissions', ['bit'])
+    # Number the existing permissions in name order; new ones are assigned
+    # the next free position by the application.
+    op.execute(
+        "UPDATE permissions p JOIN ("
+        "SELECT name, ROW_NUMBER() OVER (ORDER BY name) - 1 AS bit FROM permissions"
+        ") numbered ON p.name = numbered.name SET p.bit = numbered.bit"
+    )
+
+
+def downgrade():
+    op.drop_constraint('uq_permissions_bit', 'permissions', type_='unique')
+    op.drop_column('permissions', 'bit')
@@ -0,0 +1,25 @@
+"""auth sessions previous refresh token hash
+
+Revision ID: c6e2a8f4d193
+Revises: a3d7f1c9e264
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6e2a8f4d193'
+down_revision = 'a3d7f1c9e264'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('auth_sessions', sa.Column('previous_refresh_token_hash', mysql.CHAR(length=64), nullable=True))
+
+
+def downgrade():
+    op.drop_column('auth_sessions', 'previous_refresh_token_hash')
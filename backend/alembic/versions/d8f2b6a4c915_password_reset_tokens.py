@@ -0,0 +1,42 @@
+"""hashed password reset tokens
+
+Revision ID: d8f2b6a4c915
+Revises: c1a7e9d3f462
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8f2b6a4c915'
+down_revision = 'c1a7e9d3f462'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'password_reset_tokens',
+        sa.Column('token_hash', mysql.CHAR(length=64), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('token_hash')
+    )
+    op.create_index('ix_password_reset_tokens_user_id', 'password_reset_tokens', ['user_id'])
+    op.create_index('ix_password_reset_tokens_expires_at', 'password_reset_tokens', ['expires_at'])
+    # Outstanding plain-text tokens are discarded; users request a new link.
+    op.drop_column('users', 'reset_token_expires')
+    op.drop_column('users', 'reset_token')
+
+
+def downgrade():
+    op.add_column('users', sa.Column('reset_token', sa.String(length=255), nullable=True))
+    op.add_column('users', sa.Column('reset_token_expires', sa.DateTime(), nullable=True))
+    op.drop_index('ix_password_reset_tokens_expires_at', table_name='password_reset_tokens')
+    op.drop_index('ix_password_reset_tokens_user_id', table_name='password_reset_tokens')
+    op.drop_table('password_reset_tokens')
@@ -0,0 +1,40 @@
+"""auth sessions for refresh tokens
+
+Revision ID: e4b9c2d7a618
+Revises: d8f2b6a4c915
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b9c2d7a618'
+down_revision = 'd8f2b6a4c915'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'auth_sessions',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('refresh_token_hash', mysql.CHAR(length=64), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(), nullable=True),
+        sa.Column('ip_address', sa.String(length=45), nullable=True),
+        sa.Column('user_agent', sa.String(length=255), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_auth_sessions_user_id', 'auth_sessions', ['user_id'])
+
+
+def downgrade():
+    op.drop_index('ix_auth_sessions_user_id', table_name='auth_sessions')
+    op.drop_table('auth_sessions')
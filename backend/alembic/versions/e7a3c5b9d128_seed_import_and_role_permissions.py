@@ -0,0 +1,35 @@
+"""seed user:import and role:manage permissions
+
+Revision ID: e7a3c5b9d128
+Revises: c6e2a8f4d193
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a3c5b9d128'
+down_revision = 'c6e2a8f4d193'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Bits are left NULL; PermissionRepository.get_bits assigns them from
+    # permission_bit_counter on first use.
+    op.execute(
+        "INSERT IGNORE INTO permissions (name, description) VALUES "
+        "('user:import', 'Bulk import users'), "
+        "('role:manage', 'Manage role inheritance')"
+    )
+
+
+def downgrade():
+    op.execute(
+        "DELETE FROM role_effective_permissions WHERE permission_name IN ('user:import', 'role:manage')"
+    )
+    op.execute(
+        "DELETE FROM role_permissions WHERE permission_name IN ('user:import', 'role:manage')"
+    )
+    op.execute("DELETE FROM permissions WHERE name IN ('user:import', 'role:manage')")
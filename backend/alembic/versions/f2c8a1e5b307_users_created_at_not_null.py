@@ -0,0 +1,37 @@
+"""users created_at not null
+
+Revision ID: f2c8a1e5b307
+Revises: e4b9c2d7a618
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c8a1e5b307'
+down_revision = 'e4b9c2d7a618'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset pagination orders by (created_at, id); rows without a timestamp
+    # would never match the cursor condition and could not be paged to.
+    op.execute("UPDATE users SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+    op.alter_column(
+        'users', 'created_at',
+        existing_type=sa.DateTime(),
+        nullable=False,
+        server_default=sa.text('CURRENT_TIMESTAMP'),
+    )
+
+
+def downgrade():
+    op.alter_column(
+        'users', 'created_at',
+        existing_type=sa.DateTime(),
+        nullable=True,
+        server_default=None,
+    )
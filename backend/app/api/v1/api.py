@@ -1,7 +1,9 @@
 from fastapi import APIRouter
-from .endpoints import users, form_fields, auth 
+from .endpoints import users, form_fields, auth, roles, introspection
 
 api_router = APIRouter()
 api_router.include_router(users.router, prefix="/users")
 api_router.include_router(form_fields.router)
-api_router.include_router(auth.router) 
\ No newline at end of file
+api_router.include_router(auth.router)
+api_router.include_router(roles.router)
+api_router.include_router(introspection.router)
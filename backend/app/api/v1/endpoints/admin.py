@@ -21,7 +21,7 @@ router = APIRouter(tags=["Admin"])
 async def update_user_roles(
     user_id: str,
     role_update: UserRoleUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user = Depends(require_admin)
 ):
     """
@@ -1,15 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from fastapi import APIRouter, Cookie, Depends, HTTPException, status, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.auth import Token
-from app.core.utils.security import create_access_token, verify_password
+from app.core.utils.security import (
+    REFRESH_COOKIE_PATH, create_access_token, build_user_claims, access_token_deadline
+)
+from app.core.utils.hashing import verify_and_update_password_async
+from app.core.utils.rate_limit import login_throttle
 from app.infrastructure.repositories.user_repository import UserRepository
 from app.infrastructure.repositories.log_repository import LogRepository
 from app.core.config.database import get_db
-from datetime import datetime, timedelta
-import secrets
+from app.core.config.unit_of_work import after_commit
+from datetime import timedelta
+import math
 from pydantic import BaseModel
-from app.core.utils.email import send_email
+from app.infrastructure.repositories.email_outbox_repository import EmailOutboxRepository
+from app.infrastructure.repositories.auth_session_repository import AuthSessionRepository, RefreshTokenReusedError
+from app.core.utils.token_deny_list import token_deny_list
+from app.infrastructure.repositories.password_reset_token_repository import PasswordResetTokenRepository
+from app.infrastructure.workers.mail_outbox import mail_outbox_worker
 from app.core.config.settings import settings
 
 router = APIRouter(tags=["Authentication"])
@@ -21,24 +30,66 @@ class PasswordResetConfirm(BaseModel):
     token: str
     new_password: str
 
+async def _issue_access_token(user, user_repo: UserRepository, session_id: str) -> str:
+    claims = {"sub": user.username, "sid": session_id}
+    if settings.AUTH_STATELESS_TOKENS:
+        permission_mask = await user_repo.get_permission_mask(user.id)
+        claims.update(build_user_claims(user, permission_mask))
+    return create_access_token(data=claims)
+
+def _set_auth_cookies(response: Response, access_token: str, refresh_token: str) -> None:
+    response.set_cookie(
+        key="access_token",
+        value=access_token,
+        httponly=True,
+        secure=False,  # True em produção HTTPS
+        samesite="lax"
+    )
+    response.set_cookie(
+        key="refresh_token",
+        value=refresh_token,
+        max_age=settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400,
+        path=REFRESH_COOKIE_PATH,
+        httponly=True,
+        secure=False,  # True em produção HTTPS
+        samesite="strict"
+    )
+
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     request: Request = None,
     response: Response = None
 ):
+    ip_address = request.client.host if request else None
+    if settings.LOGIN_RATE_LIMIT_ENABLED:
+        rejected = login_throttle.check(ip_address, form_data.username)
+        if rejected:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, please try again later",
+                headers={"Retry-After": str(math.ceil(rejected[1]))},
+            )
+
     user_repo = UserRepository(db)
     log_repo = LogRepository(db)
     user = await user_repo.get_by_username(form_data.username)
-    
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    verified, new_hash = False, None
+    if user and user.hashed_password:
+        verified, new_hash = await verify_and_update_password_async(form_data.password, user.hashed_password)
+
+    if not verified:
+        if settings.LOGIN_RATE_LIMIT_ENABLED:
+            login_throttle.record_failure(form_data.username)
         await log_repo.create_log(
             user_id=None,
             action="login_failed",
-            ip_address=request.client.host if request else None,
+            ip_address=ip_address,
             details=f"Username: {form_data.username}"
         )
+        # Raising rolls the request back, so persist the audit row first
+        await db.commit()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -49,73 +100,128 @@ async def login_for_access_token(
         await log_repo.create_log(
             user_id=user.id,
             action="login_inactive",
-            ip_address=request.client.host if request else None
+            ip_address=ip_address
         )
+        await db.commit()
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user"
         )
 
+    if settings.LOGIN_RATE_LIMIT_ENABLED:
+        login_throttle.record_success(form_data.username)
+    if new_hash:
+        # Stored hash predates the current policy; committed with the request
+        user.hashed_password = new_hash
     await log_repo.create_log(
         user_id=user.id,
         action="login_success",
-        ip_address=request.client.host if request else None
+        ip_address=ip_address
     )
 
-    token = create_access_token(data={"sub": user.username})
+    session_repo = AuthSessionRepository(db)
+    auth_session, refresh_token = await session_repo.create(
+        user.id,
+        timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        ip_address=ip_address,
+        user_agent=request.headers.get("user-agent") if request else None,
+    )
+    token = await _issue_access_token(user, user_repo, auth_session.id)
     if response:
-        response.set_cookie(
-            key="access_token",
-            value=token,
-            httponly=True,
-            secure=False,  # True em produção HTTPS
-            samesite="lax"
+        _set_auth_cookies(response, token, refresh_token)
+    return {"access_token": token, "token_type": "bearer"}
+
+@router.post("/token/refresh", response_model=Token)
+async def refresh_access_token(
+    response: Response,
+    refresh_token: str = Cookie(None),
+    db: AsyncSession = Depends(get_db, scope="function"),
+    request: Request = None
+):
+    """
+    Exchange the refresh token cookie for a new access token and a rotated
+    refresh token, without checking the password again.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+    )
+    if not refresh_token:
+        raise credentials_exception
+    user_repo = UserRepository(db)
+    log_repo = LogRepository(db)
+    session_repo = AuthSessionRepository(db)
+    try:
+        rotated = await session_repo.rotate(refresh_token)
+    except RefreshTokenReusedError as e:
+        token_deny_list.deny(e.auth_session.id, access_token_deadline())
+        await log_repo.create_log(
+            user_id=e.auth_session.user_id,
+            action="refresh_token_reused",
+            ip_address=request.client.host if request else None
         )
+        # Keep the revocation of the session family despite the error
+        await db.commit()
+        raise credentials_exception
+    if not rotated:
+        raise credentials_exception
+    auth_session, new_refresh_token = rotated
+    user = await user_repo.get_by_id(auth_session.user_id)
+    if not user or not user.is_active:
+        await session_repo.revoke(auth_session.id)
+        await db.commit()
+        raise credentials_exception
+    token = await _issue_access_token(user, user_repo, auth_session.id)
+    _set_auth_cookies(response, token, new_refresh_token)
     return {"access_token": token, "token_type": "bearer"}
 
 @router.post("/password-reset/request")
 async def request_password_reset(
     data: PasswordResetRequest,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     request: Request = None
 ):
     user_repo = UserRepository(db)
     log_repo = LogRepository(db)
+    reset_repo = PasswordResetTokenRepository(db)
+    outbox_repo = EmailOutboxRepository(db)
     user = await user_repo.get_by_email(data.email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    token = secrets.token_urlsafe(32)
-    expires = datetime.utcnow() + timedelta(hours=1)
-    await user_repo.set_reset_token(user.id, token, expires)
+    token = await reset_repo.issue(user.id, timedelta(minutes=settings.PASSWORD_RESET_TOKEN_TTL_MINUTES))
+    reset_link = f"{settings.FRONTEND_URL}/reset?token={token}"
+    outbox_repo.add_email(
+        to_email=user.email,
+        subject="AuthSphere Password Reset",
+        body=f"Use this link to reset your password: {reset_link}"
+    )
+    after_commit(db, mail_outbox_worker.wake)
     # Log: Password reset requested
     await log_repo.create_log(
         user_id=user.id,
         action="password_reset_requested",
         ip_address=request.client.host if request else None
     )
-    reset_link = f"{settings.FRONTEND_URL}/reset?token={token}"
-    send_email(
-        to_email=user.email,
-        subject="AuthSphere Password Reset",
-        body=f"Use this link to reset your password: {reset_link}"
-    )
     return {"msg": "Password reset instructions sent"}
 
 @router.post("/password-reset/confirm")
 async def reset_password(
     data: PasswordResetConfirm,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     request: Request = None
 ):
     user_repo = UserRepository(db)
     log_repo = LogRepository(db)
-    user = await user_repo.get_by_reset_token(data.token)
-    if not user or not user.reset_token_expires or user.reset_token_expires < datetime.utcnow():
+    reset_repo = PasswordResetTokenRepository(db)
+    user = await reset_repo.consume(data.token)
+    if not user:
         raise HTTPException(status_code=400, detail="Invalid or expired token")
-    await user_repo.update_password(user.id, data.new_password)
-    await user_repo.clear_reset_token(user.id)
+    await user_repo.set_password(user, data.new_password)
+    # Access tokens of the revoked sessions stop working once this commits
+    for session_id in await AuthSessionRepository(db).revoke_user_sessions(user.id):
+        after_commit(db, token_deny_list.deny, session_id, access_token_deadline())
     # Log: Password reset confirmed
-    await log_repo.create_log(
+    log_repo.add_log(
         user_id=user.id,
         action="password_reset_confirmed",
         ip_address=request.client.host if request else None
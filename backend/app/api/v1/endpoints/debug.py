@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Query
+from app.core.dependencies.rbac import requires_permission
+from app.core.utils.query_profiler import recent_profiles
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+@router.get(
+    "/queries",
+    summary="Recent query profiles",
+    description=(
+        "SQL profiles of the most recent requests, newest first, with N+1 "
+        "patterns and duplicate statements. Only served when QUERY_PROFILER_ENABLED is set; "
+        "requires the `logs:view` permission."
+    ),
+    dependencies=[Depends(requires_permission("logs:view"))],
+)
+async def get_query_profiles(
+    limit: int = Query(20, ge=1, le=1000),
+    n_plus_one_only: bool = False,
+):
+    profiles = [
+        profile for profile in reversed(recent_profiles)
+        if profile["n_plus_one"] or not n_plus_one_only
+    ]
+    return profiles[:limit]
@@ -1,25 +1,29 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.config.database import get_db
-from app.infrastructure.repositories.form_field_repository import FormFieldRepository
+from fastapi import APIRouter, Depends, Request, Response, status
+from app.core.config.settings import settings
+from app.core.dependencies.fields import get_active_fields
+from app.core.utils.form_field_cache import ActiveFieldSet
 
 router = APIRouter(tags=["Form Fields"])
 
 @router.get(
     "/form-fields",
     summary="List active registration fields",
-    description="Returns the list of active and configurable fields for user registration.",
+    description=(
+        "Returns the list of active and configurable fields for user registration. "
+        "Supports conditional requests through `ETag` / `If-None-Match`."
+    ),
 )
-async def list_form_fields(db: AsyncSession = Depends(get_db)):
-    repo = FormFieldRepository(db)
-    fields = await repo.get_active_fields()
-    return [
-        {
-            "name": field.name,
-            "label": field.label,
-            "field_type": field.field_type,
-            "is_required": field.is_required,
-            "is_active": field.is_active,
-        }
-        for field in fields
-    ]
\ No newline at end of file
+async def list_form_fields(
+    request: Request,
+    response: Response,
+    active_fields: ActiveFieldSet = Depends(get_active_fields),
+):
+    headers = {
+        "ETag": active_fields.etag,
+        "Cache-Control": f"public, max-age={settings.FORM_FIELD_CACHE_TTL_SECONDS}",
+    }
+    if_none_match = request.headers.get("if-none-match", "")
+    if active_fields.etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return active_fields.payload
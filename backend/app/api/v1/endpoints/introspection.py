@@ -0,0 +1,67 @@
+import hmac
+import time
+from fastapi import APIRouter, Depends, Form, Header, HTTPException, status
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config.database import get_db
+from app.core.config.settings import settings
+from app.core.utils.introspection import token_introspector, introspection_duration
+
+router = APIRouter(tags=["Authentication"])
+
+class BatchIntrospectionRequest(BaseModel):
+    tokens: list[str] = Field(..., min_length=1, max_length=100)
+
+def require_introspection_client(authorization: str = Header(None)):
+    """
+    Callers authenticate with `Authorization: Bearer <secret>`, where the
+    secret is one of INTROSPECTION_CLIENT_SECRETS.
+    """
+    scheme, _, secret = (authorization or "").partition(" ")
+    # Compared as bytes: compare_digest rejects non-ASCII str arguments
+    if scheme.lower() != "bearer" or not any(
+        hmac.compare_digest(secret.encode(), allowed.encode())
+        for allowed in settings.INTROSPECTION_CLIENT_SECRETS
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Introspection client not authorized",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+@router.post(
+    "/introspect",
+    summary="Introspect a token",
+    description=(
+        "RFC 7662 token introspection. Returns `active: false` for invalid, "
+        "expired or revoked tokens."
+    ),
+    dependencies=[Depends(require_introspection_client)],
+)
+async def introspect(
+    token: str = Form(...),
+    token_type_hint: str | None = Form(None),
+    db: AsyncSession = Depends(get_db, scope="function"),
+):
+    start = time.perf_counter()
+    try:
+        results = await token_introspector.introspect_many([token], db)
+        return results[0]
+    finally:
+        introspection_duration.observe(time.perf_counter() - start, endpoint="single")
+
+@router.post(
+    "/introspect/batch",
+    summary="Introspect several tokens",
+    description="Introspects up to 100 tokens in one call; results are returned in request order.",
+    dependencies=[Depends(require_introspection_client)],
+)
+async def introspect_batch(
+    data: BatchIntrospectionRequest,
+    db: AsyncSession = Depends(get_db, scope="function"),
+):
+    start = time.perf_counter()
+    try:
+        return {"results": await token_introspector.introspect_many(data.tokens, db)}
+    finally:
+        introspection_duration.observe(time.perf_counter() - start, endpoint="batch")
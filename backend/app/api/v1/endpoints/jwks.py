@@ -0,0 +1,28 @@
+import asyncio
+from fastapi import APIRouter, Request, Response, status
+from app.core.config.settings import settings
+from app.core.utils.jwt_keys import key_ring
+
+router = APIRouter(tags=["Authentication"])
+
+@router.get(
+    "/.well-known/jwks.json",
+    summary="Public signing keys",
+    description=(
+        "JSON Web Key Set with the public keys used to sign access tokens, "
+        "including the next key before it is used. Empty with HS256. "
+        "Supports conditional requests through `ETag` / `If-None-Match`."
+    ),
+)
+async def get_jwks(request: Request):
+    if key_ring.stale:
+        # Loading a new period's keys reads (and may create) key files.
+        await asyncio.to_thread(key_ring.refresh)
+    headers = {
+        "ETag": key_ring.etag,
+        "Cache-Control": f"public, max-age={settings.JWKS_CACHE_MAX_AGE_SECONDS}",
+    }
+    if_none_match = request.headers.get("if-none-match", "")
+    if key_ring.etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=key_ring.jwks_body, media_type="application/json", headers=headers)
@@ -0,0 +1,36 @@
+import hmac
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from app.core.config.settings import settings
+from app.core.utils.metrics import registry, render_prometheus
+
+router = APIRouter(tags=["Monitoring"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def require_metrics_scraper(authorization: str = Header(None)):
+    """
+    When METRICS_BEARER_TOKEN is set, scrapers must send it as
+    `Authorization: Bearer <token>`.
+    """
+    if not settings.METRICS_BEARER_TOKEN:
+        return
+    scheme, _, token = (authorization or "").partition(" ")
+    # Compared as bytes: compare_digest rejects non-ASCII str arguments
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        token.encode(), settings.METRICS_BEARER_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Metrics scraper not authorized",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+@router.get(
+    "/metrics",
+    summary="Prometheus metrics",
+    description="Every application metric in the Prometheus text format.",
+    dependencies=[Depends(require_metrics_scraper)],
+    include_in_schema=False,
+)
+async def get_metrics():
+    return Response(content=render_prometheus(registry.all()), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,83 @@
+from fastapi import APIRouter, Depends, HTTPException, Body, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config.database import get_db
+from app.core.dependencies.rbac import requires_permission
+from app.infrastructure.repositories.role_repository import RoleRepository
+from app.infrastructure.repositories.log_repository import LogRepository
+
+router = APIRouter(tags=["Roles", "Admin"])
+
+@router.put(
+    "/roles/{role_name}/parents",
+    dependencies=[Depends(requires_permission("role:manage"))],
+    summary="Set inherited roles",
+    description="**Required permission:** `role:manage`. The role inherits every permission of the given roles."
+)
+async def set_role_parents(
+    role_name: str,
+    parents: list[str] = Body(..., embed=True),
+    db: AsyncSession = Depends(get_db, scope="function"),
+    request: Request = None
+):
+    try:
+        await RoleRepository(db).set_parents(role_name, parents)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    log_repo = LogRepository(db)
+    await log_repo.create_log(
+        user_id=None,
+        action="role_parents_updated",
+        ip_address=request.client.host if request else None,
+        details=f"role={role_name}, parents={parents}"
+    )
+    return {"detail": "Role inheritance updated"}
+
+@router.post(
+    "/roles/{role_name}/permissions",
+    dependencies=[Depends(requires_permission("role:manage"))],
+    summary="Grant permissions to a role",
+    description="**Required permission:** `role:manage`"
+)
+async def grant_role_permissions(
+    role_name: str,
+    permissions: list[str] = Body(..., embed=True),
+    db: AsyncSession = Depends(get_db, scope="function"),
+    request: Request = None
+):
+    try:
+        await RoleRepository(db).grant_permissions(role_name, permissions)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    log_repo = LogRepository(db)
+    await log_repo.create_log(
+        user_id=None,
+        action="role_permissions_granted",
+        ip_address=request.client.host if request else None,
+        details=f"role={role_name}, permissions={permissions}"
+    )
+    return {"detail": "Permissions granted"}
+
+@router.delete(
+    "/roles/{role_name}/permissions/{permission_name}",
+    dependencies=[Depends(requires_permission("role:manage"))],
+    summary="Revoke a permission from a role",
+    description="**Required permission:** `role:manage`"
+)
+async def revoke_role_permission(
+    role_name: str,
+    permission_name: str,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    request: Request = None
+):
+    try:
+        await RoleRepository(db).revoke_permissions(role_name, [permission_name])
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    log_repo = LogRepository(db)
+    await log_repo.create_log(
+        user_id=None,
+        action="role_permission_revoked",
+        ip_address=request.client.host if request else None,
+        details=f"role={role_name}, permission={permission_name}"
+    )
+    return {"detail": "Permission revoked"}
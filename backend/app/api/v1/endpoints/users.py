@@ -1,18 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body, Request, Response
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from fastapi import APIRouter, Cookie, Depends, HTTPException, status, Body, Request, Response, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.schemas.users import UserCreate, UserRead
-from app.infrastructure.repositories.user_repository import UserRepository
-from app.core.utils.security import get_password_hash
-from app.core.config.database import get_db
+from app.schemas.users import (
+    UserCreate, UserRead, UserPage, UserImportReport, BulkRoleUpdate, BulkRoleUpdateResult
+)
+from app.infrastructure.repositories.user_repository import UserRepository, UserAlreadyExistsError
+from app.core.utils.hashing import hash_password_async
+from app.core.config.database import get_db, AsyncSessionLocal
 from app.core.dependencies.fields import get_active_fields
+from app.core.utils.form_field_cache import ActiveFieldSet
 from app.core.dependencies.rbac import requires_permission
+from app.core.utils.permission_bits import permission_registry
 from app.infrastructure.repositories.log_repository import LogRepository
+from app.domain.entities.log import new_log_entry
 from sqlalchemy import Column, ForeignKey
 from app.core.dependencies.auth import get_current_user
-from typing import List
+from app.core.utils.pagination import encode_cursor, decode_cursor
+from app.core.utils.user_import import UserImporter, iter_csv_rows, iter_ndjson_rows
+from app.core.utils.security import REFRESH_COOKIE_PATH, access_token_deadline, decode_token
+from app.core.utils.token_deny_list import token_deny_list
+from app.infrastructure.repositories.auth_session_repository import AuthSessionRepository
+from app.core.config.settings import settings
 
 router = APIRouter(tags=["Users", "Admin"])
 
+EXPORT_CHUNK_SIZE = 64 * 1024
+
 @router.post(
     "/",
     response_model=UserRead,
@@ -22,59 +39,108 @@ router = APIRouter(tags=["Users", "Admin"])
 )
 async def create_user(
     user_in: UserCreate,
-    db: AsyncSession = Depends(get_db),
-    active_fields: dict = Depends(get_active_fields),
+    db: AsyncSession = Depends(get_db, scope="function"),
+    active_fields: ActiveFieldSet = Depends(get_active_fields),
     request: Request = None
 ):
-    errors = {}
-    for field_name, field_config in active_fields.items():
-        value = getattr(user_in, field_name, None)
-        if field_config.is_required and not value:
-            errors[field_name] = f"{field_config.label} is required"
+    errors = active_fields.validate(user_in)
     if errors:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail={"errors": errors}
         )
 
-    user_repo = UserRepository(db)
-    if await user_repo.get_by_username(user_in.username):
-        raise HTTPException(status_code=409, detail="Username already registered")
-    if await user_repo.get_by_email(user_in.email):
-        raise HTTPException(status_code=409, detail="Email already registered")
+    hashed_password = await hash_password_async(user_in.password)
 
-    hashed_password = get_password_hash(user_in.password)
-    
-    user_data = user_in.model_dump()
-    user_data.pop("consent_lgpd", None)
-    user_data.pop("password", None)  #
-    user = await user_repo.create_user(
-        **user_data,
-        hashed_password=hashed_password
-    )
-    # Log: user created + consent
+    user_repo = UserRepository(db)
     log_repo = LogRepository(db)
-    await log_repo.create_log(
+    user = user_repo.add_user(
+        username=user_in.username,
+        email=user_in.email,
+        hashed_password=hashed_password,
+        consent_lgpd=user_in.consent_lgpd,
+    )
+    # Log: user created + consent, written together with the user
+    ip_address = request.client.host if request else None
+    log_repo.add_log(
         user_id=user.id,
         action="user_created",
-        ip_address=request.client.host if request else None,
+        ip_address=ip_address,
         details=f"username={user.username}, email={user.email}, consent_lgpd={user.consent_lgpd}"
     )
     if user.consent_lgpd:
-        await log_repo.create_log(
+        log_repo.add_log(
             user_id=user.id,
             action="lgpd_consent_given",
-            ip_address=request.client.host if request else None
+            ip_address=ip_address
         )
+    try:
+        await user_repo.flush_new_users()
+    except UserAlreadyExistsError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     return user
 
+@router.post(
+    "/import",
+    response_model=UserImportReport,
+    summary="Bulk import users",
+    description=(
+        "**Required permission:** `user:import`. Accepts a CSV (with a header row) or "
+        "NDJSON file with `username`, `email`, `password` and `consent_lgpd` per row, "
+        "and returns a per-row report. Rows are committed in chunks; if the file stops "
+        "being valid UTF-8 part way through, the rows before that point are kept and "
+        "`error` says where reading stopped."
+    )
+)
+async def import_users(
+    file: UploadFile = File(...),
+    format: str | None = Query(None, pattern="^(csv|ndjson)$"),
+    db: AsyncSession = Depends(get_db, scope="function"),
+    active_fields: ActiveFieldSet = Depends(get_active_fields),
+    current_user = Depends(requires_permission("user:import")),
+    request: Request = None
+):
+    if format is None:
+        filename = (file.filename or "").lower()
+        if filename.endswith(".csv"):
+            format = "csv"
+        elif filename.endswith((".ndjson", ".jsonl")):
+            format = "ndjson"
+        else:
+            raise HTTPException(status_code=400, detail="Unknown file format, pass ?format=csv|ndjson")
+
+    rows = iter_csv_rows(file.file) if format == "csv" else iter_ndjson_rows(file.file)
+    ip_address = request.client.host if request else None
+    importer = UserImporter(
+        db,
+        active_fields,
+        chunk_size=settings.USER_IMPORT_CHUNK_SIZE,
+        ip_address=ip_address,
+    )
+    try:
+        report = await importer.run(rows)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+
+    log_repo = LogRepository(db)
+    await log_repo.create_log(
+        user_id=current_user.id,
+        action="users_imported",
+        ip_address=ip_address,
+        details=(
+            f"created={report.created}, duplicates={report.duplicates}, invalid={report.invalid}"
+            + (", truncated=true" if report.error else "")
+        )
+    )
+    return report
+
 @router.delete(
     "/users/{user_id}",
     dependencies=[Depends(requires_permission("user:delete"))]
 )
 async def delete_user(
     user_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     request: Request = None
 ):
     user_repo = UserRepository(db)
@@ -91,7 +157,6 @@ async def delete_user(
     )
 
     await user_repo.delete_user(user.id)
-    await db.commit()
     
     return {"status": "success"}
 
@@ -104,14 +169,14 @@ async def delete_user(
 async def update_user_roles(
     user_id: str,
     roles: list[str] = Body(..., embed=True),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     request: Request = None
 ):
     user_repo = UserRepository(db)
-    user = await user_repo.get(user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    await user_repo.set_roles(user_id, roles)
+    try:
+        await user_repo.set_roles(user_id, roles)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     # Log: user roles updated
     log_repo = LogRepository(db)
     await log_repo.create_log(
@@ -122,28 +187,144 @@ async def update_user_roles(
     )
     return {"detail": "User roles updated"}
 
+@router.post(
+    "/roles/bulk",
+    response_model=BulkRoleUpdateResult,
+    dependencies=[Depends(requires_permission("user:edit_roles"))],
+    summary="Bulk update user roles",
+    description=(
+        "**Required permission:** `user:edit_roles`. Grants (`add`) and revokes (`remove`) "
+        "roles for many users at once, or sets their exact role list (`replace`)."
+    )
+)
+async def bulk_update_user_roles(
+    update: BulkRoleUpdate,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    request: Request = None
+):
+    user_repo = UserRepository(db)
+    try:
+        changed, missing = await user_repo.update_roles(
+            update.user_ids, add=update.add, remove=update.remove, replace=update.replace
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    # Log: user roles updated, one row per changed user
+    ip_address = request.client.host if request else None
+    if update.replace is not None:
+        details = f"roles={update.replace}"
+    else:
+        details = f"added={update.add}, removed={update.remove}"
+    log_repo = LogRepository(db)
+    await log_repo.bulk_add_logs([
+        new_log_entry(user_id, "user_roles_updated", ip_address, details)
+        for user_id in sorted(changed)
+    ])
+    return {"updated": len(changed), "missing_user_ids": sorted(missing)}
+
+def _log_to_dict(log) -> dict:
+    return {
+        "id": log.id,
+        "user_id": log.user_id,
+        "action": log.action,
+        "timestamp": log.timestamp,
+        "ip_address": log.ip_address,
+        "details": log.details,
+    }
+
+def _log_filters(
+    user_id: str | None = None,
+    action: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> dict:
+    # Log timestamps are stored as naive UTC
+    def to_naive_utc(value: datetime | None) -> datetime | None:
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+    return {
+        "user_id": user_id,
+        "action": action,
+        "since": to_naive_utc(since),
+        "until": to_naive_utc(until),
+    }
+
 @router.get(
     "/logs",
     dependencies=[Depends(requires_permission("logs:view"))],
-    summary="List all audit logs",
-    description="Only accessible by users with the 'logs:view' permission."
+    summary="List audit logs",
+    description=(
+        "Only accessible by users with the 'logs:view' permission. "
+        "Returns one page of logs, newest first; pass `next_cursor` as `cursor` to continue."
+    )
 )
 async def list_logs(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = None,
+    filters: dict = Depends(_log_filters),
 ):
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
     log_repo = LogRepository(db)
-    logs = await log_repo.get_all_logs()
-    return [
-        {
-            "id": log.id,
-            "user_id": log.user_id,
-            "action": log.action,
-            "timestamp": log.timestamp,
-            "ip_address": log.ip_address,
-            "details": log.details,
-        }
-        for log in logs
-    ]
+    logs, has_more = await log_repo.list_logs_page(limit, after=after, **filters)
+    next_cursor = None
+    if has_more and logs:
+        next_cursor = encode_cursor(logs[-1].timestamp, logs[-1].id)
+    return {"items": [_log_to_dict(log) for log in logs], "next_cursor": next_cursor}
+
+@router.get(
+    "/logs/export",
+    dependencies=[Depends(requires_permission("logs:view"))],
+    summary="Export audit logs",
+    description=(
+        "Streams every matching audit log as NDJSON or CSV with constant memory. "
+        "Only accessible by users with the 'logs:view' permission."
+    )
+)
+async def export_logs(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    filters: dict = Depends(_log_filters),
+):
+    async def rows():
+        # The export outlives the request-scoped session, so it opens its own
+        async with AsyncSessionLocal() as session:
+            log_repo = LogRepository(session)
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            if format == "csv":
+                writer.writerow(["id", "user_id", "action", "timestamp", "ip_address", "details"])
+            async for log in log_repo.stream_logs(**filters):
+                if format == "csv":
+                    writer.writerow([
+                        log.id,
+                        log.user_id or "",
+                        log.action,
+                        log.timestamp.isoformat() if log.timestamp else "",
+                        log.ip_address or "",
+                        log.details or "",
+                    ])
+                else:
+                    buffer.write(json.dumps(_log_to_dict(log), default=datetime.isoformat) + "\n")
+                if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        rows(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="audit_logs.{format}"'},
+    )
 
 @router.delete(
     "/users/{user_id}/anonymize",
@@ -153,23 +334,15 @@ async def list_logs(
 )
 async def anonymize_user(
     user_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     request: Request = None
 ):
     user_repo = UserRepository(db)
     log_repo = LogRepository(db)
-    user = await user_repo.get_by_id(user_id)
+    user = await user_repo.anonymize_user(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user.username = f"anon_{user.id[:8]}"
-    user.email = f"anon_{user.id[:8]}@anon.local"
-    user.hashed_password = ""
-    user.is_active = False
-    user.consent_lgpd = False
-
-    await db.commit()
-
     await log_repo.create_log(
         user_id=user.id,
         action="user_anonymized",
@@ -185,7 +358,7 @@ async def anonymize_user(
 )
 async def revoke_consent(
     user_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     request: Request = None
 ):
     user_repo = UserRepository(db)
@@ -194,7 +367,6 @@ async def revoke_consent(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     user.consent_lgpd = False
-    await db.commit()
     await log_repo.create_log(
         user_id=user.id,
         action="lgpd_consent_revoked",
@@ -204,11 +376,16 @@ async def revoke_consent(
 
 @router.get("/me", response_model=UserRead)
 async def get_me(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user=Depends(get_current_user)
 ):
-    user_repo = UserRepository(db)
-    permissions = await user_repo.get_permissions(current_user.id)
+    permission_mask = getattr(current_user, "permission_mask", None)
+    if permission_mask is None:
+        user_repo = UserRepository(db)
+        permissions = sorted(await user_repo.get_permission_set(current_user.id))
+    else:
+        await permission_registry.ensure_loaded(db)
+        permissions = permission_registry.names(permission_mask)
     return {
         "id": current_user.id,
         "username": current_user.username,
@@ -217,7 +394,33 @@ async def get_me(
     }
 
 @router.post("/logout")
-def logout(response: Response, db: AsyncSession = Depends(get_db)):
+async def logout(
+    response: Response,
+    access_token: str = Cookie(None),
+    refresh_token: str = Cookie(None),
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+    """
+    Revoke the current access token and its session, then clear the cookies.
+    """
+    payload = {}
+    if access_token:
+        try:
+            payload = decode_token(access_token)
+        except HTTPException:
+            payload = {}
+    if payload.get("jti") and payload.get("exp"):
+        token_deny_list.deny(payload["jti"], payload["exp"])
+
+    session_repo = AuthSessionRepository(db)
+    auth_session = None
+    if payload.get("sid"):
+        auth_session = await session_repo.revoke(payload["sid"])
+    elif refresh_token:
+        auth_session = await session_repo.revoke_by_refresh_token(refresh_token)
+    if auth_session:
+        token_deny_list.deny(auth_session.id, access_token_deadline())
+
     response.delete_cookie(
         key="access_token",
         path="/",
@@ -225,28 +428,69 @@ def logout(response: Response, db: AsyncSession = Depends(get_db)):
         httponly=True,
         samesite="strict"
     )
+    response.delete_cookie(
+        key="refresh_token",
+        path=REFRESH_COOKIE_PATH,
+        secure=True,
+        httponly=True,
+        samesite="strict"
+    )
     return {"msg": "Logged out"}
 
 @router.get(
     "/",
-    response_model=List[UserRead],
-    summary="List all users",
-    description="Returns a list of all users. Admin only."
+    response_model=UserPage,
+    summary="List users",
+    description=(
+        "Returns one page of users, newest first. Admin only. "
+        "Pass `next_cursor` from the previous page as `cursor` to continue. "
+        "Set `include_total=true` to also count all matching users."
+    )
 )
 async def list_users(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    is_active: bool | None = None,
+    role: str | None = None,
+    username_prefix: str | None = Query(None, max_length=50),
+    email_domain: str | None = Query(None, max_length=100),
+    include_total: bool = False,
 ):
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
     user_repo = UserRepository(db)
-    users = await user_repo.list_all_users()
-    result = []
+    users, has_more, total = await user_repo.list_users_page(
+        limit,
+        after=after,
+        include_total=include_total,
+        is_active=is_active,
+        role=role,
+        username_prefix=username_prefix,
+        email_domain=email_domain,
+    )
+    items = []
     for user in users:
-        roles = [role.name for role in getattr(user, "roles", [])]
-        result.append({
+        roles = [user_role.name for user_role in user.roles]
+        permissions = sorted({
+            permission.name
+            for user_role in user.roles
+            for permission in user_role.effective_permissions
+        })
+        items.append({
             "id": user.id,
             "username": user.username,
             "email": user.email,
-            "is_active": user.is_active, 
+            "is_active": user.is_active,
             "roles": roles,
-            "permissions": await user_repo.get_permissions(user.id)
+            "permissions": permissions
         })
-    return result
+    next_cursor = None
+    if has_more and users:
+        next_cursor = encode_cursor(users[-1].created_at, users[-1].id)
+    return {"items": items, "next_cursor": next_cursor, "total": total}
@@ -1,32 +1,98 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 from app.core.config.settings import settings
+from app.core.config.routing import RoutingSession
+from app.core.config import unit_of_work  # noqa: F401  registers the after-commit hooks
+from app.core.utils.instrumentation import TimedQueuePool, instrument_engine
+from app.core.utils.metrics import registry
+from app.core.utils.query_profiler import profile_engine
 
-DATABASE_URL = (
-    f"mysql+asyncmy://{settings.DB_USER}:{settings.DB_PASSWORD}"
-    f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
-    f"?charset=utf8mb4"
-)
 
-engine = create_async_engine(
-    DATABASE_URL,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    echo=settings.DEBUG
-)
+def register_pool_metrics(engine, name: str) -> None:
+    """
+    Expose the connection pool of `engine` as gauges read at collection time.
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return
+    capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    registry.gauge(
+        f"authsphere_db_{name}_pool_checked_out",
+        f"Connections of the {name} pool currently in use.",
+        callback=pool.checkedout,
+    )
+    registry.gauge(
+        f"authsphere_db_{name}_pool_idle",
+        f"Idle connections kept open by the {name} pool.",
+        callback=pool.checkedin,
+    )
+    registry.gauge(
+        f"authsphere_db_{name}_pool_overflow",
+        f"Connections opened beyond the {name} pool size.",
+        callback=lambda: max(pool.overflow(), 0),
+    )
+    registry.gauge(
+        f"authsphere_db_{name}_pool_utilization",
+        f"Share of the {name} pool capacity (size plus overflow) in use.",
+        callback=lambda: pool.checkedout() / capacity if capacity else 0,
+    )
+
+
+def build_engine(url: str, name: str):
+    connect_args = {"connect_timeout": settings.DB_CONNECT_TIMEOUT_SECONDS}
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        # MySQL aborts SELECTs running longer than this; writes are not limited.
+        connect_args["init_command"] = (
+            f"SET SESSION max_execution_time={settings.DB_STATEMENT_TIMEOUT_MS}"
+        )
+    # Without metrics, no timing hooks are installed at all.
+    instrumentation = {"poolclass": TimedQueuePool, "pool_logging_name": name} if settings.METRICS_ENABLED else {}
+    engine = create_async_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+        echo=settings.DEBUG,
+        **instrumentation
+    )
+    register_pool_metrics(engine, name)
+    if settings.METRICS_ENABLED:
+        instrument_engine(engine, name)
+    if settings.QUERY_PROFILER_ENABLED:
+        profile_engine(engine)
+    return engine
+
+
+engine = build_engine(settings.DB_URL, "primary")
+replica_engine = build_engine(settings.DB_REPLICA_URL, "replica") if settings.DB_REPLICA_URL else None
 
 AsyncSessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    replica_bind=replica_engine.sync_engine if replica_engine else None,
     expire_on_commit=False
 )
 
 Base = declarative_base()
 
 async def get_db() -> AsyncSession:
+    """
+    Request-scoped unit of work: repositories only stage and flush, and the
+    request's writes are committed once when the endpoint returns, or rolled
+    back if it raises. Declare it as `Depends(get_db, scope="function")` so
+    the commit happens before the response is sent.
+    """
     async with AsyncSessionLocal() as session:
-        yield session
+        try:
+            yield session
+            await session.commit()
+        except BaseException:
+            await session.rollback()
+            raise
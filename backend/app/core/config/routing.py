@@ -0,0 +1,42 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Execution option that marks a SELECT as safe to answer from the replica.
+# Repositories set it only on listings and reports that tolerate replica
+# lag; lookups feeding authentication, authorization or a later write
+# (users by name/email/id, permissions) always read the primary:
+#
+#     select(User).where(...).execution_options(replica=True)
+REPLICA_OPTION = "replica"
+WROTE_KEY = "wrote_to_primary"
+
+
+class RoutingSession(Session):
+    """
+    Session that sends statements marked with the `replica` execution option
+    to `replica_bind` and everything else to the primary. Once the current
+    transaction has written anything, marked reads go to the primary too, so
+    a request always reads its own writes. Without a replica it behaves like
+    a plain Session.
+    """
+    def __init__(self, *args, replica_bind=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica_bind = replica_bind
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.replica_bind is not None:
+            if self._flushing or (clause is not None and clause.is_dml):
+                self.info[WROTE_KEY] = True
+            elif (
+                clause is not None
+                and not self.info.get(WROTE_KEY)
+                and clause.get_execution_options().get(REPLICA_OPTION)
+            ):
+                return self.replica_bind
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_routing(session: RoutingSession, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(WROTE_KEY, None)
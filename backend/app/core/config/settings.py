@@ -2,8 +2,14 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     SECRET_KEY: str
-    ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    ALGORITHM: str = "HS256"  # HS256, or RS256/RS384/RS512/ES256/ES384 for a rotating key ring
+    JWT_KEYS_DIR: str = "keys"  # Private keys of the key ring, shared by all workers
+    JWT_KEY_ROTATION_DAYS: int = 30
+    JWKS_CACHE_MAX_AGE_SECONDS: int = 3600
+    INTROSPECTION_CLIENT_SECRETS: list[str] = []  # Bearer secrets allowed to call /introspect
+    INTROSPECTION_CACHE_SIZE: int = 10000
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
     DB_USER: str
     DB_PASSWORD: str
     DB_HOST: str
@@ -11,12 +17,70 @@ class Settings(BaseSettings):
     DB_NAME: str
     DB_ROOT_PASSWORD: str 
     DB_SCHEMA: str | None = None  # Optional schema for MySQL
+    DB_REPLICA_HOST: str | None = None  # Read replica for read-only queries; unset sends everything to DB_HOST
+    DB_REPLICA_PORT: int | None = None  # Defaults to DB_PORT
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 3600
+    DB_POOL_PRE_PING: bool = True  # Test connections on checkout; otherwise rely on DB_POOL_RECYCLE_SECONDS
+    DB_CONNECT_TIMEOUT_SECONDS: int = 10
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # MySQL max_execution_time for SELECTs; 0 disables
     DEBUG: bool = False
     SMTP_SERVER: str
     SMTP_PORT: int
     SMTP_USER: str
     SMTP_PASSWORD: str
+    SMTP_FROM: str | None = None  # Defaults to SMTP_USER
+    SMTP_STARTTLS: bool = True
+    SMTP_SSL: bool = False
+    SMTP_LOGIN: bool = True  # Disable for a local stand-in server without auth
+    SMTP_POOL_SIZE: int = 2
+    SMTP_TIMEOUT_SECONDS: float = 10.0
+    MAIL_OUTBOX_WORKER: bool = True  # Deliver queued emails from the API process
+    MAIL_OUTBOX_BATCH_SIZE: int = 20
+    MAIL_OUTBOX_POLL_INTERVAL_SECONDS: float = 5.0
+    MAIL_OUTBOX_MAX_ATTEMPTS: int = 5
+    MAIL_OUTBOX_RETRY_BACKOFF_SECONDS: float = 30.0
+    MAIL_OUTBOX_RATE_LIMIT_PER_SECOND: float = 5.0  # 0 disables the limit
     FRONTEND_URL: str = "http://localhost:5173"
+    LOGIN_RATE_LIMIT_ENABLED: bool = True
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: int = 60
+    LOGIN_RATE_LIMIT_PER_IP: int = 20
+    LOGIN_RATE_LIMIT_PER_USERNAME: int = 5
+    LOGIN_LOCKOUT_THRESHOLD: int = 5  # Consecutive failures before a lockout
+    LOGIN_LOCKOUT_BASE_SECONDS: int = 30  # Doubles with every further failure
+    LOGIN_LOCKOUT_MAX_SECONDS: int = 3600
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    PASSWORD_RESET_TOKEN_TTL_MINUTES: int = 60
+    PASSWORD_RESET_SWEEP_INTERVAL_SECONDS: int = 3600  # 0 disables the sweeper
+    PASSWORD_HASH_SCHEME: str = "argon2"  # "argon2" (argon2id) or "bcrypt"; the other still verifies
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST_KIB: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_POOL: str = "thread"  # "thread" or "process"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    PERMISSION_CACHE_SIZE: int = 10000
+    PERMISSION_CACHE_TTL_SECONDS: int = 60
+    AUTH_STATELESS_TOKENS: bool = False  # Trust claims embedded in tokens; other workers then see revocations only at token expiry
+    AUDIT_LOG_BUFFERED: bool = True
+    AUDIT_LOG_BUFFER_SIZE: int = 10000
+    AUDIT_LOG_BATCH_SIZE: int = 500
+    AUDIT_LOG_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_LOG_OVERFLOW_POLICY: str = "block"  # "block", "drop_oldest" or "drop_newest"; dropping loses audit rows
+    LOG_PARTITION_MAINTENANCE: bool = True
+    LOG_PARTITION_MAINTENANCE_INTERVAL_SECONDS: int = 21600
+    LOG_PARTITION_MONTHS_AHEAD: int = 3
+    LOG_RETENTION_MONTHS: int = 0  # 0 keeps logs forever
+    FORM_FIELD_CACHE_TTL_SECONDS: int = 60
+    USER_IMPORT_CHUNK_SIZE: int = 1000
+    METRICS_ENABLED: bool = False  # Serve /metrics and time every request and query
+    METRICS_BEARER_TOKEN: str | None = None  # Required by /metrics when set
+    QUERY_PROFILER_ENABLED: bool = False  # Development only: profile SQL per request, serve /debug/queries
+    QUERY_PROFILER_N_PLUS_ONE_THRESHOLD: int = 5  # Executions of one statement shape flagged as N+1
+    QUERY_PROFILER_HISTORY: int = 100  # Recent request profiles kept for /debug/queries
 
     class Config:
         env_file = ".env"
@@ -29,4 +93,13 @@ class Settings(BaseSettings):
             f"@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}?charset=utf8mb4"
         )
 
+    @property
+    def DB_REPLICA_URL(self):
+        if not self.DB_REPLICA_HOST:
+            return None
+        return (
+            f"mysql+asyncmy://{self.DB_USER}:{self.DB_PASSWORD}"
+            f"@{self.DB_REPLICA_HOST}:{self.DB_REPLICA_PORT or self.DB_PORT}/{self.DB_NAME}?charset=utf8mb4"
+        )
+
 settings = Settings()
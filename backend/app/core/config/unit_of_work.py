@@ -0,0 +1,66 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+# Callbacks registered on a session run once its transaction commits and are
+# discarded on rollback, so caches and in-memory revocation state only change
+# for writes that actually reached the database.
+AFTER_COMMIT_KEY = "after_commit_callbacks"
+
+
+def after_commit(session: AsyncSession | Session, callback, *args) -> None:
+    """
+    Run `callback(*args)` after the session's current transaction commits.
+    """
+    sync_session = getattr(session, "sync_session", session)
+    # Begin the transaction if nothing has run yet; a rollback without one
+    # emits no event and would leave the callback for the next commit.
+    if not sync_session.in_transaction():
+        sync_session.begin()
+    session.info.setdefault(AFTER_COMMIT_KEY, []).append((callback, args))
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    for callback, args in session.info.pop(AFTER_COMMIT_KEY, []):
+        callback(*args)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_commit(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(AFTER_COMMIT_KEY, None)
+
+
+class CommitCounter:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+
+@contextmanager
+def count_commits():
+    """
+    Count the commits and rollbacks of every session while the block runs,
+    e.g. to check that an endpoint commits exactly once:
+
+        with count_commits() as counter:
+            client.post("/api/v1/users/", json=...)
+        assert counter.commits == 1
+    """
+    counter = CommitCounter()
+
+    def on_commit(session):
+        counter.commits += 1
+
+    def on_rollback(session):
+        counter.rollbacks += 1
+
+    event.listen(Session, "after_commit", on_commit)
+    event.listen(Session, "after_rollback", on_rollback)
+    try:
+        yield counter
+    finally:
+        event.remove(Session, "after_commit", on_commit)
+        event.remove(Session, "after_rollback", on_rollback)
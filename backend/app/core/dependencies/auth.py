@@ -4,13 +4,18 @@ from app.core.utils.security import decode_token
 from app.core.config.settings import settings
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config.database import get_db
+from app.core.utils.token_versions import token_versions
+from app.core.utils.token_deny_list import token_deny_list
+from app.core.utils.permission_bits import decode_mask
+from app.infrastructure.repositories.auth_session_repository import AuthSessionRepository
 from app.infrastructure.repositories.user_repository import UserRepository
+from app.schemas.auth import CurrentUser
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/token")
 
 async def get_current_user(
     access_token: str = Cookie(None),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     if not access_token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
@@ -28,7 +33,32 @@ async def get_current_user(
     username: str = payload.get("sub")
     if not username:
         raise credentials_exception
-    
+
+    if token_deny_list.is_denied(payload.get("jti")) or token_deny_list.is_denied(payload.get("sid")):
+        raise credentials_exception
+
+    user_id = payload.get("uid")
+    if user_id is not None and token_versions.is_revoked(user_id, payload.get("tv", 0)):
+        raise credentials_exception
+
+    if settings.AUTH_STATELESS_TOKENS and user_id is not None and payload.get("act"):
+        permission_mask = None
+        if payload.get("pv") == token_versions.permission_version(user_id):
+            permission_mask = decode_mask(payload.get("pm"))
+        return CurrentUser(
+            id=user_id,
+            username=username,
+            email=payload.get("email"),
+            is_active=True,
+            permission_mask=permission_mask,
+        )
+
+    # The deny list and token versions only know this process's revocations;
+    # the session row also reflects logouts and resets on other workers.
+    session_id = payload.get("sid")
+    if session_id and not await AuthSessionRepository(db).get_active_ids([session_id]):
+        raise credentials_exception
+
     user_repo = UserRepository(db)
     user = await user_repo.get_by_username(username)
     if not user:
@@ -1,12 +1,10 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.infrastructure.repositories.form_field_repository import FormFieldRepository
 from app.core.config.database import get_db
+from app.core.utils.form_field_cache import form_field_cache, ActiveFieldSet
 
-async def get_active_fields(db: AsyncSession = Depends(get_db)):
+async def get_active_fields(db: AsyncSession = Depends(get_db, scope="function")) -> ActiveFieldSet:
     """
-    Dependency to fetch all active form fields from the database.
+    Dependency returning the cached set of active form fields.
     """
-    repo = FormFieldRepository(db)
-    fields = await repo.get_active_fields()
-    return {field.name: field for field in fields}
+    return await form_field_cache.get(db)
@@ -4,19 +4,34 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config.database import get_db
 from app.infrastructure.repositories.user_repository import UserRepository
 from app.core.dependencies.auth import get_current_user
+from app.core.utils.permission_bits import permission_registry
 from fastapi import APIRouter
 
 router = APIRouter()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/token")
 
-def requires_permission(permission: str):
+def _permission_dependency(permissions: tuple[str, ...], match_all: bool):
+    required = {"version": None, "mask": None}
+
     async def dependency(
-        db: AsyncSession = Depends(get_db),
+        db: AsyncSession = Depends(get_db, scope="function"),
         current_user = Depends(get_current_user)
     ):
-        user_repo = UserRepository(db)
-        if not await user_repo.has_permission(current_user.id, permission):
+        await permission_registry.ensure_loaded(db, permissions)
+        if required["version"] != permission_registry.version:
+            required["mask"] = permission_registry.mask(permissions, strict=match_all)
+            required["version"] = permission_registry.version
+        user_mask = getattr(current_user, "permission_mask", None)
+        if user_mask is None:
+            user_repo = UserRepository(db)
+            user_mask = await user_repo.get_permission_mask(current_user.id)
+        mask = required["mask"]
+        if match_all:
+            allowed = mask is not None and user_mask & mask == mask
+        else:
+            allowed = bool(user_mask & mask)
+        if not allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permissions"
@@ -24,11 +39,22 @@ def requires_permission(permission: str):
         return current_user
     return dependency
 
+def requires_all(*permissions: str):
+    """Require every one of the given permissions."""
+    return _permission_dependency(permissions, match_all=True)
+
+def requires_any(*permissions: str):
+    """Require at least one of the given permissions."""
+    return _permission_dependency(permissions, match_all=False)
+
+def requires_permission(permission: str):
+    return requires_all(permission)
+
 @router.patch(
     "/users/{user_id}/roles",
     dependencies=[Depends(requires_permission("user:edit_roles"))]
 )
-async def update_user_roles(user_id: int, roles: list, db: AsyncSession = Depends(get_db)):
+async def update_user_roles(user_id: int, roles: list, db: AsyncSession = Depends(get_db, scope="function")):
     user_repo = UserRepository(db)
     await user_repo.update_roles(user_id, roles)
     return {"msg": "User roles updated successfully"}
@@ -1,20 +1,136 @@
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
 from app.core.config.settings import settings
 
-def send_email(to_email, subject, body):
-    print(f"send_email called for {to_email}") 
-    import smtplib
-    from email.mime.text import MIMEText
-
-    msg = MIMEText(body)
-    msg["Subject"] = subject
-    msg["From"] = settings.SMTP_USER
-    msg["To"] = to_email
-
-    try:
-        with smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT) as server:
-            server.starttls()
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.sendmail(settings.SMTP_USER, [to_email], msg.as_string())
-        print(f"Email sent to {to_email}")
-    except Exception as e:
-        print(f"Failed to send email: {e}")
\ No newline at end of file
+
+def build_message(to_email: str, subject: str, body: str) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = subject
+    message["From"] = settings.SMTP_FROM or settings.SMTP_USER
+    message["To"] = to_email
+    message.set_content(body)
+    return message
+
+
+def is_permanent_failure(error: Exception) -> bool:
+    """
+    Whether retrying a failed send is pointless, i.e. the server rejected
+    the message itself with a 5xx reply.
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+
+
+class SMTPConnectionPool:
+    """
+    Keeps up to `size` authenticated SMTP connections open and reuses them
+    across messages, so the TLS handshake and login happen once per
+    connection instead of once per email. Methods block and are meant to
+    run on worker threads.
+    """
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str | None = None,
+        password: str | None = None,
+        starttls: bool = True,
+        use_ssl: bool = False,
+        size: int = 2,
+        timeout: float = 10.0,
+        max_idle: float = 60.0,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.use_ssl = use_ssl
+        self.size = size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle: list[tuple[smtplib.SMTP, float]] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.use_ssl:
+            connection = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls and not self.use_ssl:
+                connection.starttls()
+            if self.username and self.password:
+                connection.login(self.username, self.password)
+        except Exception:
+            self._close(connection)
+            raise
+        return connection
+
+    def _acquire(self) -> smtplib.SMTP:
+        with self._lock:
+            while self._idle:
+                connection, released_at = self._idle.pop()
+                if time.monotonic() - released_at < self.max_idle:
+                    return connection
+                self._close(connection)
+        return self._connect()
+
+    def _release(self, connection: smtplib.SMTP) -> None:
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append((connection, time.monotonic()))
+                return
+        self._close(connection)
+
+    @staticmethod
+    def _close(connection: smtplib.SMTP) -> None:
+        try:
+            connection.quit()
+        except Exception:
+            connection.close()
+
+    def send(self, message: EmailMessage) -> None:
+        """
+        Send a message on a pooled connection, reconnecting once if the
+        server dropped the idle connection.
+        """
+        for attempt in range(2):
+            connection = self._acquire() if attempt == 0 else self._connect()
+            try:
+                connection.send_message(message)
+            except smtplib.SMTPServerDisconnected:
+                self._close(connection)
+                if attempt:
+                    raise
+                continue
+            except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+                # The server answered, so the connection is still usable.
+                self._release(connection)
+                raise
+            except Exception:
+                self._close(connection)
+                raise
+            self._release(connection)
+            return
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self._close(connection)
+
+
+smtp_pool = SMTPConnectionPool(
+    settings.SMTP_SERVER,
+    settings.SMTP_PORT,
+    username=settings.SMTP_USER if settings.SMTP_LOGIN else None,
+    password=settings.SMTP_PASSWORD if settings.SMTP_LOGIN else None,
+    starttls=settings.SMTP_STARTTLS,
+    use_ssl=settings.SMTP_SSL,
+    size=settings.SMTP_POOL_SIZE,
+    timeout=settings.SMTP_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,115 @@
+import asyncio
+import hashlib
+import json
+import time
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config.settings import settings
+from app.core.config.unit_of_work import after_commit
+from app.domain.entities.form_field import FormField
+from app.infrastructure.repositories.form_field_repository import FormFieldRepository
+
+
+class FieldRule:
+    """
+    Validation plan for one active form field, compiled once per
+    configuration version instead of on every request.
+    """
+    __slots__ = ("name", "label", "field_type", "is_required", "checks")
+
+    def __init__(self, name: str, label: str, field_type: str, is_required: bool):
+        self.name = name
+        self.label = label
+        self.field_type = field_type
+        self.is_required = is_required
+        checks = []
+        if is_required:
+            checks.append((lambda value: bool(value), f"{label} is required"))
+        self.checks = tuple(checks)
+
+    def validate(self, value) -> str | None:
+        """
+        Return the first error message for `value`, or None if it is valid.
+        """
+        for check, message in self.checks:
+            if not check(value):
+                return message
+        return None
+
+
+class ActiveFieldSet:
+    """
+    Snapshot of the active form fields with their compiled rules and a
+    content-derived version used as the HTTP ETag.
+    """
+    def __init__(self, fields):
+        self.payload = [
+            {
+                "name": field.name,
+                "label": field.label,
+                "field_type": field.field_type,
+                "is_required": bool(field.is_required),
+                "is_active": bool(field.is_active),
+            }
+            for field in sorted(fields, key=lambda field: field.name)
+        ]
+        self.rules = {
+            item["name"]: FieldRule(item["name"], item["label"], item["field_type"], item["is_required"])
+            for item in self.payload
+        }
+        digest = hashlib.sha256(json.dumps(self.payload, sort_keys=True).encode()).hexdigest()
+        self.version = digest[:16]
+        self.etag = f'"{self.version}"'
+
+    def validate(self, data) -> dict[str, str]:
+        """
+        Validate an object against every active field and return the errors
+        keyed by field name.
+        """
+        errors = {}
+        for name, rule in self.rules.items():
+            error = rule.validate(getattr(data, name, None))
+            if error:
+                errors[name] = error
+        return errors
+
+
+class FormFieldCache:
+    """
+    Process-wide cache of the active field set, reloaded after `ttl`
+    seconds. Changes to form fields committed through the ORM in this
+    process invalidate it immediately; changes made elsewhere (raw SQL,
+    other workers) show up once the TTL expires.
+    """
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._current: ActiveFieldSet | None = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self, session: AsyncSession) -> ActiveFieldSet:
+        if self._current is not None and time.monotonic() < self._expires_at:
+            return self._current
+        async with self._lock:
+            if self._current is None or time.monotonic() >= self._expires_at:
+                fields = await FormFieldRepository(session).get_active_fields()
+                self._current = ActiveFieldSet(fields)
+                self._expires_at = time.monotonic() + self.ttl
+        return self._current
+
+    def invalidate(self) -> None:
+        """
+        Force a reload on next access, e.g. after an admin changed the fields.
+        """
+        self._expires_at = 0.0
+
+
+form_field_cache = FormFieldCache(settings.FORM_FIELD_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_on_field_change(session: Session, flush_context) -> None:
+    changed = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(obj, FormField) for obj in changed):
+        after_commit(session, form_field_cache.invalidate)
@@ -0,0 +1,75 @@
+"""
+Calibrate password hashing cost to a target verify latency on this host:
+
+    python -m app.core.utils.hash_calibration --target-ms 250
+
+Prints settings to copy into the environment.
+"""
+import argparse
+import time
+from app.core.utils.security import build_password_context
+
+SAMPLE_PASSWORD = "calibration-password"
+
+
+def _verify_seconds(context, samples: int) -> float:
+    hashed = context.hash(SAMPLE_PASSWORD)
+    best = float("inf")
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.verify(SAMPLE_PASSWORD, hashed)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def calibrate_argon2(target: float, memory_cost: int, parallelism: int, samples: int) -> tuple[int, float]:
+    """
+    Smallest time cost whose verify takes at least `target` seconds at the
+    given memory cost, or the largest tried if the target is not reached.
+    """
+    time_cost, elapsed = 1, 0.0
+    while time_cost <= 20:
+        context = build_password_context(
+            "argon2", argon2_time_cost=time_cost,
+            argon2_memory_cost=memory_cost, argon2_parallelism=parallelism,
+        )
+        elapsed = _verify_seconds(context, samples)
+        if elapsed >= target:
+            break
+        time_cost += 1
+    return time_cost, elapsed
+
+
+def calibrate_bcrypt(target: float, samples: int) -> tuple[int, float]:
+    rounds, elapsed = 10, 0.0
+    while rounds <= 16:
+        elapsed = _verify_seconds(build_password_context("bcrypt", bcrypt_rounds=rounds), samples)
+        if elapsed >= target:
+            break
+        rounds += 1
+    return rounds, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Calibrate password hashing cost for this host.")
+    parser.add_argument("--target-ms", type=float, default=250, help="target verify latency")
+    parser.add_argument("--memory-kib", type=int, default=65536, help="argon2 memory cost")
+    parser.add_argument("--parallelism", type=int, default=4, help="argon2 lanes")
+    parser.add_argument("--samples", type=int, default=3, help="measurements per setting")
+    args = parser.parse_args()
+    target = args.target_ms / 1000
+
+    time_cost, elapsed = calibrate_argon2(target, args.memory_kib, args.parallelism, args.samples)
+    print(f"# argon2id verify: {elapsed * 1000:.0f} ms")
+    print("PASSWORD_HASH_SCHEME=argon2")
+    print(f"ARGON2_TIME_COST={time_cost}")
+    print(f"ARGON2_MEMORY_COST_KIB={args.memory_kib}")
+    print(f"ARGON2_PARALLELISM={args.parallelism}")
+
+    rounds, elapsed = calibrate_bcrypt(target, args.samples)
+    print(f"# bcrypt verify: {elapsed * 1000:.0f} ms")
+    print(f"BCRYPT_ROUNDS={rounds}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from fastapi import HTTPException, status
+from app.core.config.settings import settings
+from app.core.utils import security
+from app.core.utils.metrics import registry
+
+hash_duration = registry.histogram(
+    "authsphere_password_hash_seconds",
+    "Time spent hashing or verifying a password, including queue wait.",
+)
+hash_rejected = registry.counter(
+    "authsphere_password_hash_rejected_total",
+    "Password hash operations rejected because the worker pool was saturated.",
+)
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification on a bounded worker pool so the
+    event loop is never blocked by bcrypt.
+    """
+    def __init__(self, workers: int, pool: str = "thread", max_pending: int = 64):
+        if pool not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash pool type '{pool}'")
+        self.workers = workers
+        self.pool = pool
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.pool == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    async def _run(self, operation: str, func, *args):
+        if self.pending >= self.max_pending:
+            hash_rejected.inc(operation=operation)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again shortly",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.pending -= 1
+            hash_duration.observe(time.perf_counter() - start, operation=operation)
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password on the worker pool.
+        """
+        return await self._run("hash", security.hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify a password against its hash on the worker pool.
+        """
+        return await self._run("verify", security.verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """
+        Verify a password on the worker pool, returning a replacement hash
+        when the stored one is outdated.
+        """
+        return await self._run(
+            "verify", security.verify_and_update_password, plain_password, hashed_password
+        )
+
+    async def hash_many(self, passwords: list[str]) -> list[str]:
+        """
+        Hash a batch of passwords for bulk jobs. At most `workers` hashes are
+        in flight at once so interactive logins keep getting pool capacity.
+        """
+        semaphore = asyncio.Semaphore(self.workers)
+        loop = asyncio.get_running_loop()
+
+        async def hash_one(password: str) -> str:
+            async with semaphore:
+                self.pending += 1
+                start = time.perf_counter()
+                try:
+                    return await loop.run_in_executor(
+                        self._get_executor(), security.hash_password, password
+                    )
+                finally:
+                    self.pending -= 1
+                    hash_duration.observe(time.perf_counter() - start, operation="bulk_hash")
+
+        return await asyncio.gather(*(hash_one(password) for password in passwords))
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    pool=settings.PASSWORD_HASH_POOL,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+registry.gauge(
+    "authsphere_password_hash_pending",
+    "Password hash operations queued or running on the worker pool.",
+    callback=lambda: password_hasher.pending,
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password for storing in the database without blocking the event loop.
+    """
+    return await password_hasher.hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a plain password against its hash without blocking the event loop.
+    """
+    return await password_hasher.verify(plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verify a password and get an upgraded hash, if needed, without blocking the event loop.
+    """
+    return await password_hasher.verify_and_update(plain_password, hashed_password)
@@ -0,0 +1,141 @@
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.core.utils.metrics import registry
+
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250)
+
+request_count = registry.counter(
+    "authsphere_http_requests_total",
+    "HTTP requests handled, by method, route template and status code.",
+)
+request_duration = registry.histogram(
+    "authsphere_http_request_seconds",
+    "Time spent handling an HTTP request, by method and route template.",
+)
+request_queries = registry.histogram(
+    "authsphere_http_request_db_queries",
+    "Database queries issued while handling one request, by route template.",
+    buckets=QUERY_COUNT_BUCKETS,
+)
+request_db_duration = registry.histogram(
+    "authsphere_http_request_db_seconds",
+    "Time spent in database queries while handling one request, by route template.",
+)
+query_duration = registry.histogram(
+    "authsphere_db_query_seconds",
+    "Time spent executing one database statement, by engine and statement type.",
+)
+checkout_duration = registry.histogram(
+    "authsphere_db_pool_checkout_seconds",
+    "Time spent waiting for a pooled connection, including opening a new one, by engine.",
+)
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# Statistics of the request being handled, set by MetricsMiddleware.
+current_request_stats: ContextVar[RequestStats | None] = ContextVar("current_request_stats", default=None)
+
+
+def _statement_type(statement: str) -> str:
+    verb = statement.lstrip()[:6].upper()
+    return verb if verb in ("SELECT", "INSERT", "UPDATE", "DELETE") else "OTHER"
+
+
+def instrument_engine(engine, name: str) -> None:
+    """
+    Time every statement run through `engine` and add it to the statistics
+    of the current request.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_started_at = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_started_at
+        query_duration.observe(elapsed, engine=name, statement=_statement_type(statement))
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+
+
+def route_template(scope) -> str:
+    """
+    Path template of the route that handled the request, e.g.
+    `/api/v1/users/users/{user_id}`, or "unmatched".
+    """
+    template = getattr(scope.get("route"), "path_format", None)
+    if template is None:
+        return "unmatched"
+    # Routes of included routers may report their path without the router
+    # prefix; recover the prefix from the concrete request path.
+    concrete = template
+    for name, value in scope.get("path_params", {}).items():
+        concrete = concrete.replace("{" + name + "}", str(value))
+    path = scope.get("path", "")
+    if path.endswith(concrete):
+        return path[: len(path) - len(concrete)] + template
+    return template
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each checkout waited, labelled with the
+    engine's `pool_logging_name`.
+    """
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            checkout_duration.observe(time.perf_counter() - start, engine=self.logging_name)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the count and latency of every request, and
+    the number and duration of its database queries, per route template.
+    Routes are labelled by their path template so the number of series
+    stays bounded.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_request_stats.reset(token)
+            path = route_template(scope)
+            method = scope["method"]
+            request_count.inc(method=method, route=path, status=str(status_code))
+            request_duration.observe(elapsed, method=method, route=path)
+            request_queries.observe(stats.queries, route=path)
+            request_db_duration.observe(stats.db_seconds, route=path)
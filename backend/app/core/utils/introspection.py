@@ -0,0 +1,133 @@
+import hashlib
+import time
+from jose.exceptions import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config.settings import settings
+from app.core.utils.cache import TTLCache
+from app.core.utils.jwt_keys import key_ring
+from app.core.utils.metrics import registry
+from app.core.utils.token_deny_list import token_deny_list
+from app.core.utils.token_versions import token_versions
+from app.infrastructure.repositories.auth_session_repository import AuthSessionRepository
+from app.infrastructure.repositories.user_repository import UserRepository
+
+INACTIVE = {"active": False}
+
+introspection_duration = registry.histogram(
+    "authsphere_token_introspection_seconds",
+    "Time spent answering an introspection request, by endpoint.",
+)
+introspection_lookups = registry.counter(
+    "authsphere_token_introspection_lookups_total",
+    "Introspected tokens, by whether the validation cache answered.",
+)
+
+
+class CachedIntrospection:
+    __slots__ = ("response", "user_id", "token_version", "jti", "sid")
+
+    def __init__(self, response: dict, user_id: str, token_version: int, jti: str | None, sid: str | None):
+        self.response = response
+        self.user_id = user_id
+        self.token_version = token_version
+        self.jti = jti
+        self.sid = sid
+
+    def still_valid(self) -> bool:
+        # Revocations are in-memory checks, so they are re-applied on every
+        # hit instead of being baked into the cached answer.
+        return (
+            token_versions.token_version(self.user_id) == self.token_version
+            and not token_deny_list.is_denied(self.jti)
+            and not token_deny_list.is_denied(self.sid)
+        )
+
+
+class TokenIntrospector:
+    """
+    RFC 7662 style token introspection. Validated tokens are cached by the
+    SHA-256 of the token until they expire, so repeated checks of the same
+    token skip signature verification and the user lookup.
+    """
+    def __init__(self, maxsize: int):
+        self.cache = TTLCache(maxsize=maxsize, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+    @staticmethod
+    def _decode(token: str) -> dict | None:
+        try:
+            payload = key_ring.decode(token)
+        except (JWTError, ValueError):
+            return None
+        if not payload.get("sub") or not payload.get("exp"):
+            return None
+        if token_deny_list.is_denied(payload.get("jti")) or token_deny_list.is_denied(payload.get("sid")):
+            return None
+        return payload
+
+    async def introspect_many(self, tokens: list[str], session: AsyncSession) -> list[dict]:
+        """
+        Introspect tokens in order. Cache misses are validated together,
+        with one query for all of their users and one for their sessions.
+        """
+        results: list[dict | None] = [None] * len(tokens)
+        pending = []
+        for index, token in enumerate(tokens):
+            key = hashlib.sha256(token.encode()).hexdigest()
+            cached = self.cache.get(key)
+            if cached is not None and cached.still_valid():
+                introspection_lookups.inc(cache="hit")
+                results[index] = cached.response
+                continue
+            introspection_lookups.inc(cache="miss")
+            payload = self._decode(token)
+            if payload is None:
+                results[index] = INACTIVE
+            else:
+                pending.append((index, key, payload))
+
+        if pending:
+            users = await UserRepository(session).get_by_usernames(
+                payload["sub"] for _, _, payload in pending
+            )
+            active_sessions = await AuthSessionRepository(session).get_active_ids(
+                payload["sid"] for _, _, payload in pending if payload.get("sid")
+            )
+            now = time.time()
+            for index, key, payload in pending:
+                user = users.get(payload["sub"])
+                if (
+                    not user
+                    or not user.is_active
+                    or token_versions.is_revoked(user.id, payload.get("tv", 0))
+                    or (payload.get("sid") and payload["sid"] not in active_sessions)
+                ):
+                    results[index] = INACTIVE
+                    continue
+                response = {
+                    "active": True,
+                    "token_type": "access_token",
+                    "sub": user.id,
+                    "username": user.username,
+                    "exp": payload["exp"],
+                }
+                for claim in ("jti", "sid"):
+                    if claim in payload:
+                        response[claim] = payload[claim]
+                results[index] = response
+                remaining = payload["exp"] - now
+                if remaining > 0:
+                    self.cache.set(
+                        key,
+                        CachedIntrospection(
+                            response,
+                            user.id,
+                            token_versions.token_version(user.id),
+                            payload.get("jti"),
+                            payload.get("sid"),
+                        ),
+                        ttl=remaining,
+                    )
+        return results
+
+
+token_introspector = TokenIntrospector(settings.INTROSPECTION_CACHE_SIZE)
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwk, jwt
+from jose.exceptions import JWTError
+from app.core.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = {
+    "RS256": lambda: rsa.generate_private_key(public_exponent=65537, key_size=2048),
+    "RS384": lambda: rsa.generate_private_key(public_exponent=65537, key_size=3072),
+    "RS512": lambda: rsa.generate_private_key(public_exponent=65537, key_size=4096),
+    "ES256": lambda: ec.generate_private_key(ec.SECP256R1()),
+    "ES384": lambda: ec.generate_private_key(ec.SECP384R1()),
+}
+
+
+class KeyRing:
+    """
+    Signing and verification keys for access tokens.
+
+    With an asymmetric algorithm, time is split into rotation periods and
+    each period has its own key pair, stored as `<kid>.pem` in `keys_dir`.
+    The key of the current period signs; the previous period's key keeps
+    verifying tokens issued just before a rotation, and the next period's
+    key is published in advance so cached JWKS documents already contain
+    it when signing switches over. Every worker derives the same kid from
+    the clock, and the first to need a key creates it. The next period's
+    key is generated on a background thread, so a request crossing a
+    rotation boundary never waits for key generation; only a missing
+    current key, e.g. on first start, is created inline.
+
+    Verifier objects and the JWKS document are built once per period, not
+    per request.
+    """
+    def __init__(self, algorithm: str, secret: str, keys_dir: str, rotation_days: int):
+        if algorithm != "HS256" and algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"Unsupported JWT algorithm '{algorithm}'")
+        self.algorithm = algorithm
+        self.keys_dir = keys_dir
+        self.rotation_seconds = rotation_days * 86400
+        self._period: int | None = None
+        self._lock = threading.Lock()
+        self._generating: set[str] = set()
+        self.signing_kid: str | None = None
+        self._signing_key = jwk.construct(secret, algorithm) if algorithm == "HS256" else None
+        self.verifiers = {None: self._signing_key} if algorithm == "HS256" else {}
+        self.jwks = {"keys": []}
+        self.jwks_body = json.dumps(self.jwks).encode()
+        self.etag = f'"{hashlib.sha256(self.jwks_body).hexdigest()[:16]}"'
+
+    @property
+    def asymmetric(self) -> bool:
+        return self.algorithm in ASYMMETRIC_ALGORITHMS
+
+    def _kid(self, period: int) -> str:
+        start = datetime.fromtimestamp(period * self.rotation_seconds, tz=timezone.utc)
+        return f"{self.algorithm.lower()}-{start:%Y%m%d}"
+
+    def _load_pem(self, kid: str, create: bool) -> bytes | None:
+        path = os.path.join(self.keys_dir, f"{kid}.pem")
+        try:
+            with open(path, "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            if not create:
+                return None
+        os.makedirs(self.keys_dir, exist_ok=True)
+        pem = ASYMMETRIC_ALGORITHMS[self.algorithm]().private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        # Write to a temporary file and link it into place, so concurrent
+        # workers never read a partial key and exactly one key wins.
+        fd, tmp_path = tempfile.mkstemp(dir=self.keys_dir)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(pem)
+            os.link(tmp_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(tmp_path)
+        with open(path, "rb") as file:
+            return file.read()
+
+    @property
+    def stale(self) -> bool:
+        """
+        True when `refresh` has keys to load, i.e. it would read (or create)
+        key files instead of returning immediately.
+        """
+        return self.asymmetric and int(time.time() // self.rotation_seconds) != self._period
+
+    def refresh(self) -> None:
+        """
+        Load the keys of the current rotation period if it changed.
+        """
+        if not self.stale:
+            return
+        period = int(time.time() // self.rotation_seconds)
+        with self._lock:
+            if period == self._period:
+                return
+            verifiers = {}
+            published = []
+            signing_key = None
+            for offset in (-1, 0, 1):
+                kid = self._kid(period + offset)
+                pem = self._load_pem(kid, create=offset == 0)
+                if pem is None:
+                    if offset == 1:
+                        self._generate_in_background(kid)
+                    continue
+                private_key = jwk.construct(pem, self.algorithm)
+                public_key = private_key.public_key()
+                verifiers[kid] = public_key
+                published.append({**public_key.to_dict(), "kid": kid, "use": "sig"})
+                if offset == 0:
+                    signing_key = private_key
+            self.jwks = {"keys": published}
+            self.jwks_body = json.dumps(self.jwks, separators=(",", ":")).encode()
+            self.etag = f'"{hashlib.sha256(self.jwks_body).hexdigest()[:16]}"'
+            self.verifiers = verifiers
+            self.signing_kid = self._kid(period)
+            self._signing_key = signing_key
+            self._period = period
+
+    def _generate_in_background(self, kid: str) -> None:
+        if kid in self._generating:
+            return
+        self._generating.add(kid)
+        threading.Thread(target=self._generate, args=(kid,), name="jwt-keygen", daemon=True).start()
+
+    def _generate(self, kid: str) -> None:
+        try:
+            self._load_pem(kid, create=True)
+        except Exception:
+            logger.exception("Could not generate JWT signing key %s", kid)
+            with self._lock:
+                self._generating.discard(kid)
+            return
+        with self._lock:
+            self._generating.discard(kid)
+            # Reload on the next call so the new key is published
+            self._period = None
+
+    def encode(self, claims: dict) -> str:
+        self.refresh()
+        headers = {"kid": self.signing_kid} if self.signing_kid else None
+        return jwt.encode(claims, self._signing_key, algorithm=self.algorithm, headers=headers)
+
+    def decode(self, token: str) -> dict:
+        """
+        Verify a token against the precomputed key for its `kid`.
+        Raises JWTError if the token is invalid, expired or signed by an
+        unknown key.
+        """
+        self.refresh()
+        kid = jwt.get_unverified_header(token).get("kid") if self.asymmetric else None
+        verifier = self.verifiers.get(kid)
+        if verifier is None:
+            raise JWTError("Unknown signing key")
+        return jwt.decode(token, verifier, algorithms=[self.algorithm])
+
+
+key_ring = KeyRing(
+    settings.ALGORITHM,
+    settings.SECRET_KEY,
+    keys_dir=settings.JWT_KEYS_DIR,
+    rotation_days=settings.JWT_KEY_ROTATION_DAYS,
+)
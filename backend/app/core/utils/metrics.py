@@ -0,0 +1,172 @@
+import threading
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    """
+    Monotonic counter, optionally split by label values.
+    """
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(sorted(labels.items())), 0.0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._values)
+
+
+class Gauge:
+    """
+    Value that can go up and down. A callback can be supplied to read the
+    value lazily when metrics are collected.
+    """
+    def __init__(self, name: str, description: str, callback=None):
+        self.name = name
+        self.description = description
+        self.callback = callback
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._value -= amount
+
+    def value(self) -> float:
+        return float(self.callback()) if self.callback else self._value
+
+
+class Histogram:
+    """
+    Cumulative histogram of observed values (seconds by default), split by
+    label values.
+    """
+    def __init__(self, name: str, description: str, buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0, "max": 0.0}
+                self._series[key] = series
+            series["counts"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+            if value > series["max"]:
+                series["max"] = value
+
+    def summary(self, **labels) -> dict:
+        series = self._series.get(tuple(sorted(labels.items())))
+        if not series:
+            return {"count": 0, "sum": 0.0, "avg": 0.0, "max": 0.0}
+        return {
+            "count": series["count"],
+            "sum": series["sum"],
+            "avg": series["sum"] / series["count"],
+            "max": series["max"],
+        }
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                key: {"counts": list(s["counts"]), "sum": s["sum"], "count": s["count"]}
+                for key, s in self._series.items()
+            }
+
+
+class MetricsRegistry:
+    """
+    In-process registry holding every metric exposed by the application.
+    """
+    def __init__(self):
+        self._metrics: dict[str, object] = {}
+
+    def _register(self, metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, description: str) -> Counter:
+        return self._register(Counter(name, description))
+
+    def gauge(self, name: str, description: str, callback=None) -> Gauge:
+        return self._register(Gauge(name, description, callback))
+
+    def histogram(self, name: str, description: str, buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, description, buckets))
+
+    def all(self) -> list:
+        return list(self._metrics.values())
+
+
+registry = MetricsRegistry()
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name, str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        )
+        for name, value in labels
+    )
+    return "{" + pairs + "}"
+
+
+def render_prometheus(metrics) -> str:
+    """
+    Render metrics in the Prometheus text exposition format (version 0.0.4).
+    """
+    lines = []
+    for metric in metrics:
+        description = metric.description.replace("\\", "\\\\").replace("\n", "\\n")
+        lines.append(f"# HELP {metric.name} {description}")
+        if isinstance(metric, Counter):
+            lines.append(f"# TYPE {metric.name} counter")
+            for labels, value in sorted(metric.snapshot().items()):
+                lines.append(f"{metric.name}{_format_labels(labels)} {_format_value(value)}")
+        elif isinstance(metric, Gauge):
+            lines.append(f"# TYPE {metric.name} gauge")
+            lines.append(f"{metric.name} {_format_value(metric.value())}")
+        elif isinstance(metric, Histogram):
+            lines.append(f"# TYPE {metric.name} histogram")
+            for labels, series in sorted(metric.snapshot().items()):
+                cumulative = 0
+                for bound, count in zip(metric.buckets + (float("inf"),), series["counts"]):
+                    cumulative += count
+                    bucket_labels = labels + (("le", _format_value(bound)),)
+                    lines.append(f"{metric.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+                lines.append(f"{metric.name}_sum{_format_labels(labels)} {_format_value(series['sum'])}")
+                lines.append(f"{metric.name}_count{_format_labels(labels)} {series['count']}")
+    return "\n".join(lines) + "\n"
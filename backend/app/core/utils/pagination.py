@@ -0,0 +1,24 @@
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(timestamp: datetime, key: str) -> str:
+    """
+    Encode the (timestamp, id) of the last row of a page into an opaque cursor.
+    """
+    raw = json.dumps([timestamp.isoformat(), key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(timestamp), str(key)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
@@ -0,0 +1,97 @@
+import asyncio
+import time
+from typing import Iterable, NamedTuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.repositories.permission_repository import PermissionRepository
+
+# Minimum seconds between reloads triggered by unknown permission names, so a
+# route guarded by a permission that does not exist cannot cause a reload storm.
+RELOAD_INTERVAL_SECONDS = 30.0
+
+
+class EffectivePermissions(NamedTuple):
+    names: frozenset[str]
+    mask: int
+
+
+class PermissionRegistry:
+    """
+    Maps permission names to the stable bit positions stored in
+    `permissions.bit`, so a permission set is a single integer and checks
+    are bitwise operations instead of string lookups or SQL joins.
+    """
+    def __init__(self):
+        self.bits: dict[str, int] = {}
+        self.names_by_bit: dict[int, str] = {}
+        self.version = 0
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def load(self, session: AsyncSession) -> None:
+        version = self.version
+        async with self._lock:
+            if self.version != version:
+                return
+            bits = await PermissionRepository(session).get_bits()
+            self.bits = bits
+            self.names_by_bit = {bit: name for name, bit in bits.items()}
+            self._loaded_at = time.monotonic()
+            self.version += 1
+
+    async def ensure_loaded(self, session: AsyncSession, names: Iterable[str] = ()) -> None:
+        """
+        Load the registry on first use, and reload it when `names` contains
+        permissions created since the last load.
+        """
+        if not self.version:
+            await self.load(session)
+        elif any(name not in self.bits for name in names):
+            if time.monotonic() - self._loaded_at >= RELOAD_INTERVAL_SECONDS:
+                await self.load(session)
+
+    def mask(self, names: Iterable[str], strict: bool = False) -> int | None:
+        """
+        Encode permission names as a bitmask. Unknown names are skipped, or
+        make the result None when `strict` is set.
+        """
+        mask = 0
+        for name in names:
+            bit = self.bits.get(name)
+            if bit is None:
+                if strict:
+                    return None
+                continue
+            mask |= 1 << bit
+        return mask
+
+    def names(self, mask: int) -> list[str]:
+        """
+        Decode a bitmask into sorted permission names.
+        """
+        names = []
+        while mask:
+            low = mask & -mask
+            name = self.names_by_bit.get(low.bit_length() - 1)
+            if name is not None:
+                names.append(name)
+            mask ^= low
+        return sorted(names)
+
+
+permission_registry = PermissionRegistry()
+
+
+def encode_mask(mask: int) -> str:
+    """
+    Compact token representation of a permission bitmask.
+    """
+    return format(mask, "x")
+
+
+def decode_mask(value) -> int | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        return int(value, 16)
+    except ValueError:
+        return None
@@ -0,0 +1,26 @@
+from app.core.config.settings import settings
+from app.core.utils.cache import TTLCache
+from app.core.utils.token_versions import token_versions
+
+# user_id -> EffectivePermissions (names and bitmask)
+permission_cache = TTLCache(
+    maxsize=settings.PERMISSION_CACHE_SIZE,
+    ttl=settings.PERMISSION_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_user_permissions(*user_ids: str) -> None:
+    """
+    Drop the cached permissions of the given users after their role
+    membership changed.
+    """
+    permission_cache.invalidate(*user_ids)
+    token_versions.bump_permissions(*user_ids)
+
+
+def invalidate_all_permissions() -> None:
+    """
+    Drop every cached permission set, e.g. after a role's permissions changed.
+    """
+    permission_cache.clear()
+    token_versions.bump_all_permissions()
@@ -0,0 +1,181 @@
+import logging
+import re
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config.settings import settings
+from app.core.utils.instrumentation import route_template
+
+logger = logging.getLogger(__name__)
+
+# Placeholder lists such as "IN (?, ?, ?)" or multi-row VALUES differ only
+# in length between executions, so they are collapsed into one shape.
+PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))*\s*\)")
+REPEATED_LISTS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    shape = WHITESPACE.sub(" ", statement).strip()
+    shape = PLACEHOLDER_LIST.sub("(...)", shape)
+    return REPEATED_LISTS.sub("(...)", shape)
+
+
+class QueryProfile:
+    """
+    Every statement executed while profiling, with its shape, parameters
+    and duration.
+    """
+    def __init__(self, method: str | None = None, path: str | None = None):
+        self.method = method
+        self.path = path
+        self.statements: list[tuple[str, str, float]] = []
+
+    def record(self, statement: str, parameters, elapsed: float) -> None:
+        self.statements.append((statement_shape(statement), repr(parameters), elapsed))
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum((elapsed for _, _, elapsed in self.statements), 0.0)
+
+    def summary(self, n_plus_one_threshold: int) -> dict:
+        """
+        Aggregate the statements by shape. A shape run `n_plus_one_threshold`
+        times or more is reported as an N+1 pattern; a statement repeated
+        with identical parameters is reported as a duplicate.
+        """
+        shapes: dict[str, dict] = {}
+        executions = Counter()
+        for shape, parameters, elapsed in self.statements:
+            entry = shapes.setdefault(shape, {"statement": shape, "count": 0, "total_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += elapsed * 1000
+            executions[shape, parameters] += 1
+        duplicates = Counter()
+        for (shape, _), count in executions.items():
+            if count > 1:
+                duplicates[shape] += count - 1
+        for shape, entry in shapes.items():
+            entry["total_ms"] = round(entry["total_ms"], 3)
+            entry["duplicates"] = duplicates[shape]
+        return {
+            "method": self.method,
+            "path": self.path,
+            "queries": self.count,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "duplicates": sum(duplicates.values()),
+            "n_plus_one": [
+                entry for entry in shapes.values() if entry["count"] >= n_plus_one_threshold
+            ],
+            "statements": sorted(shapes.values(), key=lambda entry: entry["total_ms"], reverse=True),
+        }
+
+
+# Profile of the request being handled, set by QueryProfilerMiddleware.
+current_query_profile: ContextVar[QueryProfile | None] = ContextVar("current_query_profile", default=None)
+recent_profiles: deque = deque(maxlen=settings.QUERY_PROFILER_HISTORY)
+
+
+def _listen(target, profile_for) -> tuple:
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        context._profile_started_at = time.perf_counter()
+
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = profile_for()
+        if profile is not None:
+            profile.record(statement, parameters, time.perf_counter() - context._profile_started_at)
+
+    event.listen(target, "before_cursor_execute", before_execute)
+    event.listen(target, "after_cursor_execute", after_execute)
+    return before_execute, after_execute
+
+
+def profile_engine(engine) -> None:
+    """
+    Record the statements run through `engine` in the current request's profile.
+    """
+    _listen(getattr(engine, "sync_engine", engine), current_query_profile.get)
+
+
+class QueryProfilerMiddleware:
+    """
+    ASGI middleware profiling the SQL issued by each request. The summary is
+    returned in `X-Query-Count`, `X-Query-Time-Ms`, `X-Query-Duplicates` and
+    `X-Query-N-Plus-One` headers and kept for the /debug/queries endpoint.
+    Meant for development; it keeps every statement of a request in memory.
+    """
+    def __init__(self, app, n_plus_one_threshold: int = 5):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        profile = QueryProfile(scope["method"], scope.get("path"))
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                summary = profile.summary(self.n_plus_one_threshold)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-query-count", str(summary["queries"]).encode()),
+                    (b"x-query-time-ms", str(summary["total_ms"]).encode()),
+                    (b"x-query-duplicates", str(summary["duplicates"]).encode()),
+                    (b"x-query-n-plus-one", str(len(summary["n_plus_one"])).encode()),
+                ]
+            await send(message)
+
+        token = current_query_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_profile.reset(token)
+            profile.path = route_template(scope)
+            summary = profile.summary(self.n_plus_one_threshold)
+            for entry in summary["n_plus_one"]:
+                logger.warning(
+                    "Possible N+1 in %s %s: %d executions of %s",
+                    profile.method, profile.path, entry["count"], entry["statement"],
+                )
+            recent_profiles.append(summary)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries: int, n_plus_one_threshold: int | None = None):
+    """
+    Profile every statement run by any engine while the block runs and fail
+    if there were more than `max_queries`, or, with `n_plus_one_threshold`,
+    if a statement shape repeated that often. Usable from tests, e.g.:
+
+        with query_budget(5, n_plus_one_threshold=3):
+            client.get("/api/v1/users/?limit=50", cookies=admin_cookies)
+    """
+    profile = QueryProfile()
+    listeners = _listen(Engine, lambda: profile)
+    try:
+        yield profile
+    finally:
+        event.remove(Engine, "before_cursor_execute", listeners[0])
+        event.remove(Engine, "after_cursor_execute", listeners[1])
+    summary = profile.summary(n_plus_one_threshold or max_queries + 1)
+    if profile.count > max_queries:
+        raise QueryBudgetExceeded(
+            f"{profile.count} queries exceed the budget of {max_queries}: "
+            + "; ".join(f"{entry['count']}x {entry['statement']}" for entry in summary["statements"])
+        )
+    if n_plus_one_threshold and summary["n_plus_one"]:
+        raise QueryBudgetExceeded(
+            "N+1 pattern: "
+            + "; ".join(f"{entry['count']}x {entry['statement']}" for entry in summary["n_plus_one"])
+        )
@@ -0,0 +1,166 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from app.core.config.settings import settings
+from app.core.utils.cache import TTLCache
+from app.core.utils.metrics import registry
+
+login_rejected = registry.counter(
+    "authsphere_login_rejected_total",
+    "Login attempts rejected before checking credentials, by reason.",
+)
+login_lockouts = registry.counter(
+    "authsphere_login_lockouts_total",
+    "Usernames locked out after repeated failed logins.",
+)
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage for limiter state. The in-process backend is the default; a
+    backend shared between workers (e.g. Redis) must make `update` atomic.
+    """
+    @abstractmethod
+    def get(self, key: str):
+        ...
+
+    @abstractmethod
+    def update(self, key: str, func, ttl: float):
+        """
+        Replace the state under `key` with `func(current_state)`, keep it for
+        `ttl` seconds and return the new state.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Per-process backend on a bounded LRU, so a flood of distinct keys cannot
+    grow memory without limit.
+    """
+    def __init__(self, maxsize: int):
+        self._cache = TTLCache(maxsize=maxsize, ttl=3600)
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        return self._cache.get(key)
+
+    def update(self, key: str, func, ttl: float):
+        with self._lock:
+            state = func(self._cache.get(key))
+            self._cache.set(key, state, ttl=ttl)
+            return state
+
+    def delete(self, key: str) -> None:
+        self._cache.invalidate(key)
+
+
+class TokenBucketLimiter:
+    """
+    Allows bursts of up to `capacity` hits per key, refilled continuously
+    over `window` seconds, which behaves like a smooth sliding window.
+    """
+    def __init__(self, backend: RateLimitBackend, prefix: str, capacity: int, window: float):
+        self.backend = backend
+        self.prefix = prefix
+        self.capacity = capacity
+        self.window = window
+        self.rate = capacity / window
+
+    def acquire(self, key: str) -> float:
+        """
+        Take one token for `key`. Returns 0 if allowed, otherwise the seconds
+        until a token becomes available.
+        """
+        now = time.time()
+
+        def take(state):
+            tokens, updated_at, _ = state or (self.capacity, now, 0.0)
+            tokens = min(self.capacity, tokens + (now - updated_at) * self.rate)
+            if tokens >= 1:
+                return tokens - 1, now, 0.0
+            return tokens, now, (1 - tokens) / self.rate
+
+        _, _, retry_after = self.backend.update(f"{self.prefix}:{key}", take, ttl=self.window)
+        return retry_after
+
+
+class LoginThrottle:
+    """
+    Throttles logins per client IP and per username, and locks a username
+    out for exponentially longer periods after repeated failures. Checks run
+    before any database access or password hashing.
+    """
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        per_ip: int,
+        per_username: int,
+        window: float,
+        lockout_threshold: int,
+        lockout_base: float,
+        lockout_max: float,
+    ):
+        self.backend = backend
+        self.ip_limiter = TokenBucketLimiter(backend, "login:ip", per_ip, window)
+        self.username_limiter = TokenBucketLimiter(backend, "login:user", per_username, window)
+        self.lockout_threshold = lockout_threshold
+        self.lockout_base = lockout_base
+        self.lockout_max = lockout_max
+
+    @staticmethod
+    def _failure_key(username: str) -> str:
+        return f"login:failures:{username.lower()}"
+
+    def check(self, ip_address: str | None, username: str) -> tuple[str, float] | None:
+        """
+        Return `(reason, retry_after)` if the attempt must be rejected.
+        """
+        state = self.backend.get(self._failure_key(username))
+        if state is not None:
+            retry_after = state[1] - time.time()
+            if retry_after > 0:
+                login_rejected.inc(reason="lockout")
+                return "lockout", retry_after
+        if ip_address:
+            retry_after = self.ip_limiter.acquire(ip_address)
+            if retry_after:
+                login_rejected.inc(reason="ip")
+                return "ip", retry_after
+        retry_after = self.username_limiter.acquire(username.lower())
+        if retry_after:
+            login_rejected.inc(reason="username")
+            return "username", retry_after
+        return None
+
+    def record_failure(self, username: str) -> None:
+        now = time.time()
+
+        def fail(state):
+            failures, locked_until = state or (0, 0.0)
+            failures += 1
+            if failures >= self.lockout_threshold:
+                exponent = failures - self.lockout_threshold
+                locked_until = now + min(self.lockout_base * 2 ** exponent, self.lockout_max)
+            return failures, locked_until
+
+        failures, _ = self.backend.update(self._failure_key(username), fail, ttl=self.lockout_max)
+        if failures >= self.lockout_threshold:
+            login_lockouts.inc()
+
+    def record_success(self, username: str) -> None:
+        self.backend.delete(self._failure_key(username))
+
+
+login_throttle = LoginThrottle(
+    MemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS),
+    per_ip=settings.LOGIN_RATE_LIMIT_PER_IP,
+    per_username=settings.LOGIN_RATE_LIMIT_PER_USERNAME,
+    window=settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+    lockout_threshold=settings.LOGIN_LOCKOUT_THRESHOLD,
+    lockout_base=settings.LOGIN_LOCKOUT_BASE_SECONDS,
+    lockout_max=settings.LOGIN_LOCKOUT_MAX_SECONDS,
+)
@@ -1,10 +1,54 @@
 from datetime import datetime, timedelta, timezone
-from jose import JWTError, jwt
+import time
+import uuid
+from jose import JWTError
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.core.config.settings import settings
+from app.core.utils.token_versions import token_versions
+from app.core.utils.permission_bits import encode_mask
+from app.core.utils.jwt_keys import key_ring
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+HASH_SCHEMES = ("argon2", "bcrypt")
+
+
+def build_password_context(
+    scheme: str = "argon2",
+    argon2_time_cost: int = 3,
+    argon2_memory_cost: int = 65536,
+    argon2_parallelism: int = 4,
+    bcrypt_rounds: int = 12,
+) -> CryptContext:
+    """
+    Hashing policy: new hashes use `scheme` with the given cost parameters;
+    hashes made with the other scheme, or with older parameters, still verify
+    but are reported by `needs_update` so they can be upgraded on login.
+    """
+    if scheme not in HASH_SCHEMES:
+        raise ValueError(f"Unknown password hash scheme '{scheme}'")
+    return CryptContext(
+        schemes=[scheme] + [other for other in HASH_SCHEMES if other != scheme],
+        default=scheme,
+        deprecated="auto",
+        argon2__type="ID",
+        argon2__time_cost=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism,
+        bcrypt__rounds=bcrypt_rounds,
+    )
+
+
+pwd_context = build_password_context(
+    settings.PASSWORD_HASH_SCHEME,
+    argon2_time_cost=settings.ARGON2_TIME_COST,
+    argon2_memory_cost=settings.ARGON2_MEMORY_COST_KIB,
+    argon2_parallelism=settings.ARGON2_PARALLELISM,
+    bcrypt_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# The refresh token cookie is only sent to the API, i.e. the refresh and
+# logout endpoints, not to the frontend.
+REFRESH_COOKIE_PATH = "/api/v1"
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -12,6 +56,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verify a password and, if its hash is outdated under the current policy,
+    also return a fresh hash to store in its place.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def hash_password(password: str) -> str:
     """
     Hash a password for storing in the database.
@@ -25,7 +76,28 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    to_encode.setdefault("jti", uuid.uuid4().hex)
+    return key_ring.encode(to_encode)
+
+def access_token_deadline() -> float:
+    """
+    Unix time by which every access token issued now has expired.
+    """
+    return time.time() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+def build_user_claims(user, permission_mask: int) -> dict:
+    """
+    Build the user claims embedded in access tokens when stateless
+    authentication is enabled. Permissions travel as a hex bitmask.
+    """
+    return {
+        "uid": user.id,
+        "email": user.email,
+        "act": bool(user.is_active),
+        "pm": encode_mask(permission_mask),
+        "pv": token_versions.permission_version(user.id),
+        "tv": token_versions.token_version(user.id),
+    }
 
 def decode_token(token: str) -> dict:
     """
@@ -33,7 +105,7 @@ def decode_token(token: str) -> dict:
     Raises HTTPException if the token is invalid or expired.
     """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = key_ring.decode(token)
         return payload
     except JWTError:
         raise HTTPException(
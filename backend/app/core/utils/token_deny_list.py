@@ -0,0 +1,49 @@
+import heapq
+import threading
+import time
+
+
+class TokenDenyList:
+    """
+    In-memory set of revoked token ids (`jti`) and session ids (`sid`).
+    Each entry is kept only until the tokens it blocks expire, so the set
+    stays proportional to recent revocations; lookups are O(1).
+
+    Like the token version registry it is per process: it only covers
+    revocations made on this worker.
+    """
+    def __init__(self):
+        self._entries: dict[str, float] = {}
+        self._expiry: list[tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float) -> None:
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry)
+            if self._entries.get(key) == expires_at:
+                del self._entries[key]
+
+    def deny(self, key: str, expires_at: float) -> None:
+        """
+        Reject `key` until the unix timestamp `expires_at`.
+        """
+        now = time.time()
+        if expires_at <= now:
+            return
+        with self._lock:
+            self._evict(now)
+            if self._entries.get(key, 0) < expires_at:
+                self._entries[key] = expires_at
+                heapq.heappush(self._expiry, (expires_at, key))
+
+    def is_denied(self, key: str | None) -> bool:
+        if key is None:
+            return False
+        expires_at = self._entries.get(key)
+        return expires_at is not None and expires_at > time.time()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_deny_list = TokenDenyList()
@@ -0,0 +1,46 @@
+import threading
+
+
+class TokenVersionRegistry:
+    """
+    In-memory version map used to validate claims embedded in access tokens.
+
+    The token version (`tv`) is bumped when every outstanding token of a user
+    must stop working (deletion, anonymization, password change). The
+    permission version (`pv`) is bumped when the user's roles change, which
+    only makes the embedded permission list stale.
+
+    The map is per process and starts empty, so it only covers revocations
+    that happened during the access token lifetime on this worker.
+    """
+    def __init__(self):
+        self._token_versions: dict[str, int] = {}
+        self._permission_versions: dict[str, int] = {}
+        self._permission_epoch = 0
+        self._lock = threading.Lock()
+
+    def token_version(self, user_id: str) -> int:
+        return self._token_versions.get(user_id, 0)
+
+    def permission_version(self, user_id: str) -> int:
+        return self._permission_epoch + self._permission_versions.get(user_id, 0)
+
+    def revoke_tokens(self, *user_ids: str) -> None:
+        with self._lock:
+            for user_id in user_ids:
+                self._token_versions[user_id] = self._token_versions.get(user_id, 0) + 1
+
+    def bump_permissions(self, *user_ids: str) -> None:
+        with self._lock:
+            for user_id in user_ids:
+                self._permission_versions[user_id] = self._permission_versions.get(user_id, 0) + 1
+
+    def bump_all_permissions(self) -> None:
+        with self._lock:
+            self._permission_epoch += 1
+
+    def is_revoked(self, user_id: str, version: int) -> bool:
+        return version < self.token_version(user_id)
+
+
+token_versions = TokenVersionRegistry()
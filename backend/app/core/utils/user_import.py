@@ -0,0 +1,194 @@
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import BinaryIO, Iterable, Iterator
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.users import UserCreate, UserImportReport, UserImportRow
+from app.core.utils.form_field_cache import ActiveFieldSet
+from app.core.utils.hashing import password_hasher
+from app.domain.entities.log import new_log_entry
+from app.infrastructure.repositories.user_repository import UserRepository, UserAlreadyExistsError
+from app.infrastructure.repositories.log_repository import LogRepository
+
+IMPORT_FIELDS = ("username", "email", "password", "consent_lgpd")
+
+
+def iter_csv_rows(file: BinaryIO) -> Iterator[dict]:
+    """
+    Lazily read an uploaded CSV file with a header row.
+    """
+    yield from csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+
+
+def iter_ndjson_rows(file: BinaryIO) -> Iterator[dict | None]:
+    """
+    Lazily read an uploaded NDJSON file; malformed lines yield None.
+    """
+    for line in io.TextIOWrapper(file, encoding="utf-8"):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield row if isinstance(row, dict) else None
+
+
+class UserImporter:
+    """
+    Imports users in chunks: rows are validated against the active form
+    fields, deduplicated within the file and against the database with
+    set-based lookups, hashed on the worker pool and inserted with
+    multi-row INSERTs. Unlike request handlers, the importer commits one
+    transaction per chunk so a large file never holds a single huge one.
+    """
+    def __init__(
+        self,
+        session: AsyncSession,
+        active_fields: ActiveFieldSet,
+        chunk_size: int = 1000,
+        ip_address: str | None = None,
+    ):
+        self.session = session
+        self.user_repo = UserRepository(session)
+        self.log_repo = LogRepository(session)
+        self.active_fields = active_fields
+        self.chunk_size = chunk_size
+        self.ip_address = ip_address
+        self.report = UserImportReport()
+        self._seen_usernames: set[str] = set()
+        self._seen_emails: set[str] = set()
+
+    async def run(self, rows: Iterable[dict | None]) -> UserImportReport:
+        """
+        Import every row and return the per-row report. Chunks are committed
+        as they fill, so if the file turns out not to be UTF-8 part way
+        through, the rows read so far are still imported and the report says
+        where reading stopped. Raises UnicodeDecodeError only if not a single
+        row could be read.
+        """
+        chunk = []
+        number = 0
+        try:
+            for number, raw in enumerate(rows, start=1):
+                user = self._validate(number, raw)
+                if user is not None:
+                    chunk.append((number, user))
+                if len(chunk) >= self.chunk_size:
+                    await self._import_chunk(chunk)
+                    chunk = []
+        except UnicodeDecodeError:
+            if number == 0:
+                raise
+            self.report.error = f"File is not valid UTF-8 after row {number}; later rows were not read"
+        if chunk:
+            await self._import_chunk(chunk)
+        self.report.rows.sort(key=lambda row: row.row)
+        return self.report
+
+    def _reject(self, number: int, username: str | None, status: str, error: str) -> None:
+        self.report.rows.append(UserImportRow(row=number, username=username, status=status, error=error))
+        if status == "duplicate":
+            self.report.duplicates += 1
+        else:
+            self.report.invalid += 1
+
+    def _validate(self, number: int, raw: dict | None) -> UserCreate | None:
+        if raw is None:
+            self._reject(number, None, "invalid", "Malformed row")
+            return None
+        username = raw.get("username")
+        try:
+            user = UserCreate(**{field: raw.get(field) for field in IMPORT_FIELDS})
+        except ValidationError as e:
+            error = "; ".join(
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+            self._reject(number, username, "invalid", error)
+            return None
+        errors = self.active_fields.validate(user)
+        if errors:
+            self._reject(number, username, "invalid", "; ".join(errors.values()))
+            return None
+        if user.username.lower() in self._seen_usernames:
+            self._reject(number, username, "duplicate", "Username repeated in file")
+            return None
+        if user.email.lower() in self._seen_emails:
+            self._reject(number, username, "duplicate", "Email repeated in file")
+            return None
+        self._seen_usernames.add(user.username.lower())
+        self._seen_emails.add(user.email.lower())
+        return user
+
+    async def _drop_existing(self, chunk: list) -> list:
+        existing_usernames, existing_emails = await self.user_repo.find_existing(
+            [user.username for _, user in chunk],
+            [user.email for _, user in chunk],
+        )
+        remaining = []
+        for item in chunk:
+            number, user = item
+            if user.username.lower() in existing_usernames:
+                self._reject(number, user.username, "duplicate", "Username already registered")
+            elif user.email.lower() in existing_emails:
+                self._reject(number, user.username, "duplicate", "Email already registered")
+            else:
+                remaining.append(item)
+        return remaining
+
+    async def _import_chunk(self, chunk: list) -> None:
+        chunk = await self._drop_existing(chunk)
+        if not chunk:
+            return
+        hashes = await password_hasher.hash_many([user.password for _, user in chunk])
+        hashed = {number: hashed_password for (number, _), hashed_password in zip(chunk, hashes)}
+
+        # A concurrent signup can still win the race between the lookup and
+        # the insert; re-check once and retry without the conflicting rows.
+        for attempt in range(2):
+            now = datetime.now(timezone.utc)
+            users, logs = [], []
+            for number, user in chunk:
+                user_id = str(uuid.uuid4())
+                users.append({
+                    "id": user_id,
+                    "username": user.username,
+                    "email": user.email,
+                    "hashed_password": hashed[number],
+                    "created_at": now,
+                    "is_active": True,
+                    "role": "user",
+                    "consent_lgpd": user.consent_lgpd,
+                })
+                logs.append(new_log_entry(
+                    user_id,
+                    "user_created",
+                    self.ip_address,
+                    f"username={user.username}, email={user.email}, "
+                    f"consent_lgpd={user.consent_lgpd}, source=import",
+                ))
+                if user.consent_lgpd:
+                    logs.append(new_log_entry(user_id, "lgpd_consent_given", self.ip_address))
+            try:
+                await self.user_repo.bulk_insert_users(users)
+                await self.log_repo.bulk_add_logs(logs)
+                await self.user_repo.flush_new_users()
+                await self.session.commit()
+                break
+            except UserAlreadyExistsError:
+                await self.session.rollback()
+                if attempt:
+                    for number, user in chunk:
+                        self._reject(number, user.username, "duplicate", "Conflicted with a concurrent registration")
+                    return
+                chunk = await self._drop_existing(chunk)
+                if not chunk:
+                    return
+
+        for number, user in chunk:
+            self.report.rows.append(UserImportRow(row=number, username=user.username, status="created"))
+        self.report.created += len(chunk)
@@ -0,0 +1,26 @@
+from app.core.config.database import Base
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.mysql import CHAR
+from datetime import datetime
+import uuid
+
+class AuthSession(Base):
+    __tablename__ = "auth_sessions"
+
+    # The refresh token is "<id>.<secret>"; only the SHA-256 of the secret is
+    # stored and it changes on every refresh.
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    refresh_token_hash = Column(CHAR(64), nullable=False)
+    # Hash of the secret rotated out last; presenting it again is token reuse.
+    previous_refresh_token_hash = Column(CHAR(64), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_used_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+    ip_address = Column(String(45), nullable=True)
+    user_agent = Column(String(255), nullable=True)
+
+    __table_args__ = (
+        Index("ix_auth_sessions_user_id", "user_id"),
+    )
@@ -0,0 +1,26 @@
+from app.core.config.database import Base
+from sqlalchemy import Column, String, DateTime, Integer, Text, Index
+from datetime import datetime
+import uuid
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    to_email = Column(String(100), nullable=False)
+    subject = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(String(20), nullable=False, default="pending")  # pending, sent or failed
+    attempts = Column(Integer, nullable=False, default=0)
+    # When the message is next due; pushed forward while a worker holds it.
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+    last_error = Column(String(1024), nullable=True)
+
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    def __repr__(self):
+        return f"<EmailOutbox {self.to_email} {self.status}>"
@@ -1,5 +1,5 @@
 from app.core.config.database import Base
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, Index
 from sqlalchemy.dialects.mysql import CHAR
 from datetime import datetime
 import uuid
@@ -7,9 +7,33 @@ import uuid
 class Log(Base):
     __tablename__ = "logs"
 
+    # `logs` is range-partitioned by month on `timestamp`, so the timestamp is
+    # part of the primary key and `user_id` carries no foreign key (MySQL
+    # does not support foreign keys on partitioned tables).
     id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(CHAR(36), ForeignKey("users.id"), nullable=True)
+    user_id = Column(CHAR(36), nullable=True)
     action = Column(String(255), nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, primary_key=True, default=datetime.utcnow)
     ip_address = Column(String(45), nullable=True)
-    details = Column(String(1024), nullable=True)
\ No newline at end of file
+    details = Column(String(1024), nullable=True)
+
+    __table_args__ = (
+        Index("ix_logs_timestamp", "timestamp"),
+        Index("ix_logs_user_id_timestamp", "user_id", "timestamp"),
+        Index("ix_logs_action_timestamp", "action", "timestamp"),
+    )
+
+
+def new_log_entry(user_id, action, ip_address=None, details=None) -> dict:
+    """
+    Build a `logs` row as a plain dict for multi-row INSERTs, stamped with
+    its id and timestamp at creation time.
+    """
+    return {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id if user_id else None,
+        "action": action,
+        "timestamp": datetime.utcnow(),
+        "ip_address": ip_address,
+        "details": details,
+    }
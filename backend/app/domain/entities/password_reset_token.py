@@ -0,0 +1,19 @@
+from app.core.config.database import Base
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.mysql import CHAR
+from datetime import datetime
+
+class PasswordResetToken(Base):
+    __tablename__ = "password_reset_tokens"
+
+    # Only the SHA-256 of the emailed token is stored, so a database leak
+    # does not expose usable reset links.
+    token_hash = Column(CHAR(64), primary_key=True)
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_password_reset_tokens_user_id", "user_id"),
+        Index("ix_password_reset_tokens_expires_at", "expires_at"),
+    )
@@ -1,5 +1,5 @@
 from app.core.config.database import Base
-from sqlalchemy import Column, String, Table, ForeignKey
+from sqlalchemy import Column, Integer, String, Table, ForeignKey
 from sqlalchemy.orm import relationship
 
 role_permissions = Table(
@@ -9,10 +9,31 @@ role_permissions = Table(
     Column("permission_name", String(50), ForeignKey("permissions.name"), index=True)
 )
 
+# Materialized closure: every permission a role holds directly or through
+# the roles it inherits from. Maintained by RoleRepository.
+role_effective_permissions = Table(
+    "role_effective_permissions",
+    Base.metadata,
+    Column("role_id", String(36), ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True),
+    Column("permission_name", String(50), ForeignKey("permissions.name", ondelete="CASCADE"), primary_key=True),
+)
+
+# Single-row counter holding the next bit position to hand out. Positions
+# only ever grow, so a deleted permission's bit is never given to another.
+permission_bit_counter = Table(
+    "permission_bit_counter",
+    Base.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("next_bit", Integer, nullable=False),
+)
+
 class Permission(Base):
     __tablename__ = "permissions"
 
     name = Column(String(50), primary_key=True) 
     description = Column(String(100))
+    # Stable bit position used to encode permission sets as integers; assigned
+    # once by PermissionRepository and never reused.
+    bit = Column(Integer, unique=True, nullable=True)
 
-    roles = relationship("Role", secondary=role_permissions, back_populates="permissions")
+    roles = relationship("Role", secondary=role_permissions, back_populates="permissions", viewonly=True)
@@ -2,7 +2,7 @@ import uuid
 from app.core.config.database import Base
 from sqlalchemy import Column, String, Table, ForeignKey
 from sqlalchemy.orm import relationship
-from app.domain.entities.permission import role_permissions
+from app.domain.entities.permission import role_permissions, role_effective_permissions
 
 user_roles = Table(
     "user_roles",
@@ -11,11 +11,29 @@ user_roles = Table(
     Column("role_id", String(36), ForeignKey("roles.id"), primary_key=True),
 )
 
+# A role inherits every permission of its parent roles, transitively
+role_inheritance = Table(
+    "role_inheritance",
+    Base.metadata,
+    Column("role_id", String(36), ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True),
+    Column("parent_role_id", String(36), ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True),
+)
+
 class Role(Base):
     __tablename__ = "roles"
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String(50), unique=True)
     
-    permissions = relationship("Permission", secondary=role_permissions, back_populates="roles")
+    # Read-only: grants go through RoleRepository so the materialized
+    # closure in `role_effective_permissions` is rebuilt with them.
+    permissions = relationship("Permission", secondary=role_permissions, back_populates="roles", viewonly=True)
+    effective_permissions = relationship("Permission", secondary=role_effective_permissions, viewonly=True)
+    parents = relationship(
+        "Role",
+        secondary=role_inheritance,
+        primaryjoin=lambda: Role.id == role_inheritance.c.role_id,
+        secondaryjoin=lambda: Role.id == role_inheritance.c.parent_role_id,
+        viewonly=True,
+    )
     users = relationship("User", secondary=user_roles, back_populates="roles")
@@ -1,5 +1,5 @@
 from app.core.config.database import Base
-from sqlalchemy import Column, String, DateTime, Boolean, Index
+from sqlalchemy import Column, String, DateTime, Boolean, Index, func
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 
@@ -10,11 +10,14 @@ class User(Base):
     username = Column(String(50), nullable=False)
     email = Column(String(100), nullable=False)
     hashed_password = Column(String(255), nullable=False)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+    )
     is_active = Column(Boolean, default=True)
     role = Column(String(20), default="user")
-    reset_token = Column(String(255), nullable=True)
-    reset_token_expires = Column(DateTime, nullable=True)
     consent_lgpd = Column(Boolean, default=False)
 
     roles = relationship("Role", secondary="user_roles", back_populates="users")
@@ -22,6 +25,8 @@ class User(Base):
     __table_args__ = (
         Index("ix_users_username", "username", unique=True),
         Index("ix_users_email", "email", unique=True),
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_is_active_created_at_id", "is_active", "created_at", "id"),
     )
 
     def __repr__(self):
@@ -0,0 +1,136 @@
+import hashlib
+import hmac
+import secrets
+from datetime import datetime, timedelta
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.entities.auth_session import AuthSession
+
+
+class RefreshTokenReusedError(ValueError):
+    """
+    A rotated-out refresh token was presented again, which means it leaked.
+    The session has been revoked.
+    """
+    def __init__(self, auth_session: AuthSession):
+        super().__init__("Refresh token reuse detected")
+        self.auth_session = auth_session
+
+
+def _hash_secret(secret: str) -> str:
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+
+class AuthSessionRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(
+        self,
+        user_id: str,
+        ttl: timedelta,
+        ip_address: str | None = None,
+        user_agent: str | None = None,
+    ) -> tuple[AuthSession, str]:
+        """
+        Open a session and return it with its first refresh token.
+        """
+        secret = secrets.token_urlsafe(32)
+        now = datetime.utcnow()
+        auth_session = AuthSession(
+            user_id=user_id,
+            refresh_token_hash=_hash_secret(secret),
+            created_at=now,
+            last_used_at=now,
+            expires_at=now + ttl,
+            ip_address=ip_address,
+            user_agent=user_agent[:255] if user_agent else None,
+        )
+        self.session.add(auth_session)
+        await self.session.flush()
+        return auth_session, f"{auth_session.id}.{secret}"
+
+    async def rotate(self, refresh_token: str) -> tuple[AuthSession, str] | None:
+        """
+        Exchange a refresh token for a new one. Returns None if the session
+        is unknown, revoked or expired, or the secret is not its current
+        one. Raises RefreshTokenReusedError, after revoking the session, if
+        the secret is the one rotated out last; the caller must still commit
+        that revocation.
+        """
+        session_id, _, secret = refresh_token.partition(".")
+        if not session_id or not secret:
+            return None
+        result = await self.session.execute(
+            select(AuthSession).where(AuthSession.id == session_id).with_for_update()
+        )
+        auth_session = result.scalar_one_or_none()
+        now = datetime.utcnow()
+        if not auth_session or auth_session.revoked_at or auth_session.expires_at <= now:
+            return None
+        secret_hash = _hash_secret(secret)
+        if not hmac.compare_digest(auth_session.refresh_token_hash, secret_hash):
+            previous_hash = auth_session.previous_refresh_token_hash
+            if previous_hash and hmac.compare_digest(previous_hash, secret_hash):
+                auth_session.revoked_at = now
+                await self.session.flush()
+                raise RefreshTokenReusedError(auth_session)
+            return None
+        new_secret = secrets.token_urlsafe(32)
+        auth_session.previous_refresh_token_hash = auth_session.refresh_token_hash
+        auth_session.refresh_token_hash = _hash_secret(new_secret)
+        auth_session.last_used_at = now
+        await self.session.flush()
+        return auth_session, f"{auth_session.id}.{new_secret}"
+
+    async def get_active_ids(self, session_ids) -> set[str]:
+        """
+        Return the ids among `session_ids` of sessions that are neither
+        revoked nor expired, with a single query.
+        """
+        ids = set(session_ids)
+        if not ids:
+            return set()
+        result = await self.session.execute(
+            select(AuthSession.id).where(
+                AuthSession.id.in_(ids)
+                & AuthSession.revoked_at.is_(None)
+                & (AuthSession.expires_at > datetime.utcnow())
+            )
+        )
+        return set(result.scalars().all())
+
+    async def revoke(self, session_id: str) -> AuthSession | None:
+        auth_session = await self.session.get(AuthSession, session_id)
+        if auth_session and not auth_session.revoked_at:
+            auth_session.revoked_at = datetime.utcnow()
+            await self.session.flush()
+        return auth_session
+
+    async def revoke_by_refresh_token(self, refresh_token: str) -> AuthSession | None:
+        """
+        Revoke the session a refresh token belongs to, if the token is current.
+        """
+        session_id, _, secret = refresh_token.partition(".")
+        auth_session = await self.session.get(AuthSession, session_id) if session_id else None
+        if not auth_session or not hmac.compare_digest(auth_session.refresh_token_hash, _hash_secret(secret)):
+            return None
+        return await self.revoke(auth_session.id)
+
+    async def revoke_user_sessions(self, user_id: str) -> list[str]:
+        """
+        Revoke every open session of a user and return their ids.
+        """
+        result = await self.session.execute(
+            select(AuthSession.id)
+            .where((AuthSession.user_id == user_id) & AuthSession.revoked_at.is_(None))
+            .with_for_update()
+        )
+        session_ids = result.scalars().all()
+        if session_ids:
+            await self.session.execute(
+                update(AuthSession)
+                .where(AuthSession.id.in_(session_ids))
+                .values(revoked_at=datetime.utcnow())
+            )
+        return session_ids
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.entities.email_outbox import EmailOutbox
+
+class EmailOutboxRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def add_email(self, to_email: str, subject: str, body: str) -> EmailOutbox:
+        """
+        Stage an email in the outbox; it is only sent if the surrounding
+        transaction commits.
+        """
+        email = EmailOutbox(to_email=to_email, subject=subject, body=body)
+        self.session.add(email)
+        return email
+
+    async def enqueue(self, to_email: str, subject: str, body: str) -> EmailOutbox:
+        email = self.add_email(to_email, subject, body)
+        await self.session.flush()
+        return email
+
+    async def claim_due(self, limit: int, lease_seconds: float) -> list[EmailOutbox]:
+        """
+        Lock up to `limit` due messages and push their next attempt past the
+        lease, so other workers skip them and a crashed worker's messages are
+        picked up again once the lease expires.
+        """
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            select(EmailOutbox)
+            .where((EmailOutbox.status == "pending") & (EmailOutbox.next_attempt_at <= now))
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        emails = result.scalars().all()
+        for email in emails:
+            email.attempts += 1
+            email.next_attempt_at = now + timedelta(seconds=lease_seconds)
+        await self.session.flush()
+        return emails
+
+    # Bodies can carry credentials such as password reset links, so they are
+    # erased once a message is sent or given up on; only the envelope stays.
+    async def mark_sent(self, email_ids: list[str]) -> None:
+        if not email_ids:
+            return
+        await self.session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(email_ids))
+            .values(status="sent", sent_at=datetime.utcnow(), last_error=None, body="")
+        )
+
+    async def mark_retry(self, email_id: str, error: str, next_attempt_at: datetime) -> None:
+        await self.session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id == email_id)
+            .values(next_attempt_at=next_attempt_at, last_error=error[:1024])
+        )
+
+    async def mark_failed(self, email_id: str, error: str) -> None:
+        await self.session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id == email_id)
+            .values(status="failed", last_error=error[:1024], body="")
+        )
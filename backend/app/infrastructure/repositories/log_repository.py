@@ -1,16 +1,121 @@
+import time
+from datetime import datetime
+from typing import AsyncIterator
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.domain.entities.log import Log
+from sqlalchemy import select, insert, and_, or_
+from app.domain.entities.log import Log, new_log_entry
+from app.core.config.unit_of_work import after_commit
+from app.core.utils.metrics import registry
+from app.infrastructure.workers.audit_log_writer import audit_log_writer
+
+write_duration = registry.histogram(
+    "authsphere_audit_log_write_seconds",
+    "Time a request spends recording one audit event, by whether it was buffered.",
+)
+
+LOG_COLUMNS = (Log.id, Log.user_id, Log.action, Log.timestamp, Log.ip_address, Log.details)
 
 class LogRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_all_logs(self):
-        result = await self.session.execute(select(Log).order_by(Log.timestamp.desc()))
-        return result.scalars().all()
+    def _log_filters(
+        self,
+        user_id: str | None = None,
+        action: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list:
+        filters = []
+        if user_id:
+            filters.append(Log.user_id == user_id)
+        if action:
+            filters.append(Log.action == action)
+        if since:
+            filters.append(Log.timestamp >= since)
+        if until:
+            filters.append(Log.timestamp < until)
+        return filters
+
+    async def list_logs_page(
+        self,
+        limit: int,
+        after: tuple[datetime, str] | None = None,
+        **filters,
+    ) -> tuple[list, bool]:
+        """
+        Return one page of logs, newest first, using keyset pagination on
+        (timestamp, id). Returns the rows and whether a next page exists.
+        """
+        stmt = (
+            select(*LOG_COLUMNS)
+            .where(*self._log_filters(**filters))
+            .order_by(Log.timestamp.desc(), Log.id.desc())
+            .limit(limit + 1)
+            .execution_options(replica=True)
+        )
+        if after is not None:
+            timestamp, log_id = after
+            stmt = stmt.where(
+                or_(
+                    Log.timestamp < timestamp,
+                    and_(Log.timestamp == timestamp, Log.id < log_id),
+                )
+            )
+        result = await self.session.execute(stmt)
+        rows = result.all()
+        return rows[:limit], len(rows) > limit
+
+    async def stream_logs(self, batch_size: int = 1000, **filters) -> AsyncIterator:
+        """
+        Yield every matching log row, newest first, through a server-side
+        cursor so memory use stays constant regardless of table size.
+        """
+        stmt = (
+            select(*LOG_COLUMNS)
+            .where(*self._log_filters(**filters))
+            .order_by(Log.timestamp.desc(), Log.id.desc())
+            .execution_options(yield_per=batch_size, replica=True)
+        )
+        result = await self.session.stream(stmt)
+        async for row in result:
+            yield row
+
+    def add_log(self, user_id, action, ip_address=None, details=None) -> Log:
+        """
+        Stage an audit row in the current transaction; it is written by the
+        caller's next commit.
+        """
+        log = Log(
+            user_id=user_id if user_id else None,
+            action=action,
+            timestamp=datetime.utcnow(),
+            ip_address=ip_address,
+            details=details
+        )
+        self.session.add(log)
+        return log
+
+    async def bulk_add_logs(self, entries: list[dict]) -> None:
+        """
+        Insert many audit rows in the current transaction with one
+        multi-row INSERT; the caller commits.
+        """
+        if entries:
+            await self.session.execute(insert(Log), entries)
 
     async def create_log(self, user_id, action, ip_address=None, details=None):
+        """
+        Record an audit event. Goes through the buffered writer when it is
+        running, otherwise the row is written with the current transaction.
+        Either way it is only recorded if the transaction commits.
+        """
+        start = time.perf_counter()
+        if audit_log_writer.running:
+            entry = new_log_entry(user_id, action, ip_address, details)
+            after_commit(self.session, audit_log_writer.submit, entry)
+            write_duration.observe(time.perf_counter() - start, mode="buffered")
+            return
         log = Log(
             user_id=user_id if user_id else None,
             action=action,
@@ -18,4 +123,5 @@ class LogRepository:
             details=details
         )
         self.session.add(log)
-        await self.session.commit()
\ No newline at end of file
+        await self.session.flush()
+        write_duration.observe(time.perf_counter() - start, mode="direct")
@@ -0,0 +1,60 @@
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.entities.password_reset_token import PasswordResetToken
+from app.domain.entities.user import User
+
+
+def hash_reset_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class PasswordResetTokenRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def issue(self, user_id: str, ttl: timedelta) -> str:
+        """
+        Replace the user's outstanding reset tokens with a new one and return
+        the plain token.
+        """
+        await self.session.execute(
+            delete(PasswordResetToken).where(PasswordResetToken.user_id == user_id)
+        )
+        token = secrets.token_urlsafe(32)
+        self.session.add(PasswordResetToken(
+            token_hash=hash_reset_token(token),
+            user_id=user_id,
+            expires_at=datetime.utcnow() + ttl,
+        ))
+        return token
+
+    async def consume(self, token: str) -> User | None:
+        """
+        Look up the user owning a valid token, lock the token row and delete
+        every reset token of that user. Returns None if the token is unknown
+        or expired.
+        """
+        result = await self.session.execute(
+            select(PasswordResetToken.user_id)
+            .where(
+                (PasswordResetToken.token_hash == hash_reset_token(token))
+                & (PasswordResetToken.expires_at > datetime.utcnow())
+            )
+            .with_for_update()
+        )
+        user_id = result.scalar_one_or_none()
+        if user_id is None:
+            return None
+        await self.session.execute(
+            delete(PasswordResetToken).where(PasswordResetToken.user_id == user_id)
+        )
+        return await self.session.get(User, user_id)
+
+    async def delete_expired(self) -> int:
+        result = await self.session.execute(
+            delete(PasswordResetToken).where(PasswordResetToken.expires_at <= datetime.utcnow())
+        )
+        return result.rowcount
@@ -0,0 +1,55 @@
+from sqlalchemy import select, insert, update, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.entities.permission import Permission, permission_bit_counter
+
+class PermissionRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_bits(self) -> dict[str, int]:
+        """
+        Return the bit position of every permission, first assigning new
+        positions from `permission_bit_counter` to permissions created
+        without one. Positions are assigned in a transaction of their own,
+        independent of the caller's unit of work, because they are cached
+        process-wide.
+        """
+        result = await self.session.execute(select(Permission.name, Permission.bit))
+        rows = result.all()
+        bits = {name: bit for name, bit in rows if bit is not None}
+        if all(bit is not None for _, bit in rows):
+            return bits
+
+        async with AsyncSession(self.session.bind) as session:
+            try:
+                # The counter row lock serializes workers assigning positions.
+                next_bit = await session.scalar(
+                    select(permission_bit_counter.c.next_bit)
+                    .where(permission_bit_counter.c.id == 1)
+                    .with_for_update()
+                )
+                if next_bit is None:
+                    next_bit = await session.scalar(select(func.coalesce(func.max(Permission.bit) + 1, 0)))
+                    await session.execute(insert(permission_bit_counter).values(id=1, next_bit=next_bit))
+                result = await session.execute(
+                    select(Permission.name).where(Permission.bit.is_(None)).order_by(Permission.name)
+                )
+                unassigned = result.scalars().all()
+                for offset, name in enumerate(unassigned):
+                    await session.execute(
+                        update(Permission).where(Permission.name == name).values(bit=next_bit + offset)
+                    )
+                await session.execute(
+                    update(permission_bit_counter)
+                    .where(permission_bit_counter.c.id == 1)
+                    .values(next_bit=next_bit + len(unassigned))
+                )
+                await session.commit()
+            except IntegrityError:
+                # Another worker created the counter row first; use its positions.
+                await session.rollback()
+            result = await session.execute(
+                select(Permission.name, Permission.bit).where(Permission.bit.is_not(None))
+            )
+            return dict(result.all())
@@ -0,0 +1,160 @@
+from collections import defaultdict
+from sqlalchemy import select, insert, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.entities.permission import Permission, role_permissions, role_effective_permissions
+from app.domain.entities.role import Role, role_inheritance, user_roles
+from app.core.config.unit_of_work import after_commit
+from app.core.utils.permission_cache import invalidate_user_permissions
+
+class RoleRepository:
+    """
+    Manages role permissions and inheritance, keeping the materialized
+    `role_effective_permissions` closure in sync so permission checks are a
+    single join regardless of how deep the hierarchy is. After editing the
+    role tables by hand, rebuild the closure with
+    `python -m app.infrastructure.workers.role_closure`.
+    """
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_by_name(self, name: str) -> Role | None:
+        result = await self.session.execute(select(Role).where(Role.name == name))
+        return result.scalars().first()
+
+    async def _require_role(self, name: str) -> Role:
+        role = await self.get_by_name(name)
+        if not role:
+            raise ValueError(f"Role '{name}' not found")
+        return role
+
+    async def _parents_map(self, lock: bool = False) -> dict[str, set[str]]:
+        stmt = select(role_inheritance.c.role_id, role_inheritance.c.parent_role_id)
+        if lock:
+            # A locking read sees the latest committed edges, not the snapshot
+            # taken at the transaction's first read.
+            stmt = stmt.with_for_update(read=True)
+        result = await self.session.execute(stmt)
+        parents = defaultdict(set)
+        for role_id, parent_id in result.all():
+            parents[role_id].add(parent_id)
+        return parents
+
+    @staticmethod
+    def _closure(start: str, edges: dict[str, set[str]]) -> set[str]:
+        """Every role reachable from `start` following `edges`, including itself."""
+        seen = {start}
+        stack = [start]
+        while stack:
+            for next_id in edges.get(stack.pop(), ()):
+                if next_id not in seen:
+                    seen.add(next_id)
+                    stack.append(next_id)
+        return seen
+
+    async def _rebuild(self, role_ids: set[str]) -> None:
+        """
+        Recompute the effective permissions of the given roles and of every
+        role that inherits from them, then invalidate the affected users.
+        """
+        parents = await self._parents_map()
+        children = defaultdict(set)
+        for role_id, parent_ids in parents.items():
+            for parent_id in parent_ids:
+                children[parent_id].add(role_id)
+        affected = set()
+        for role_id in role_ids:
+            affected |= self._closure(role_id, children)
+
+        ancestors = {role_id: self._closure(role_id, parents) for role_id in affected}
+        involved = set().union(*ancestors.values()) if ancestors else set()
+        result = await self.session.execute(
+            select(role_permissions.c.role_id, role_permissions.c.permission_name)
+            .where(role_permissions.c.role_id.in_(involved))
+        )
+        direct = defaultdict(set)
+        for role_id, permission_name in result.all():
+            direct[role_id].add(permission_name)
+
+        rows = [
+            {"role_id": role_id, "permission_name": permission_name}
+            for role_id, role_ancestors in ancestors.items()
+            for permission_name in set().union(*(direct[ancestor] for ancestor in role_ancestors))
+        ]
+        await self.session.execute(
+            delete(role_effective_permissions).where(role_effective_permissions.c.role_id.in_(affected))
+        )
+        if rows:
+            await self.session.execute(insert(role_effective_permissions), rows)
+
+        result = await self.session.execute(
+            select(user_roles.c.user_id).where(user_roles.c.role_id.in_(affected)).distinct()
+        )
+        user_ids = result.scalars().all()
+        if user_ids:
+            after_commit(self.session, invalidate_user_permissions, *user_ids)
+
+    async def grant_permissions(self, role_name: str, permission_names: list[str]) -> None:
+        """Grant permissions directly to a role."""
+        role = await self._require_role(role_name)
+        names = set(permission_names)
+        result = await self.session.execute(select(Permission.name).where(Permission.name.in_(names)))
+        missing = sorted(names - set(result.scalars().all()))
+        if missing:
+            raise ValueError(f"Permission '{missing[0]}' not found")
+        result = await self.session.execute(
+            select(role_permissions.c.permission_name).where(role_permissions.c.role_id == role.id)
+        )
+        new_names = names - set(result.scalars().all())
+        if new_names:
+            await self.session.execute(
+                insert(role_permissions),
+                [{"role_id": role.id, "permission_name": name} for name in new_names],
+            )
+        await self._rebuild({role.id})
+
+    async def revoke_permissions(self, role_name: str, permission_names: list[str]) -> None:
+        """Revoke permissions granted directly to a role."""
+        role = await self._require_role(role_name)
+        await self.session.execute(
+            delete(role_permissions).where(
+                (role_permissions.c.role_id == role.id)
+                & role_permissions.c.permission_name.in_(set(permission_names))
+            )
+        )
+        await self._rebuild({role.id})
+
+    async def set_parents(self, role_name: str, parent_names: list[str]) -> None:
+        """
+        Replace the roles `role_name` inherits from.
+        Raises ValueError if a role is unknown or the change would create a cycle.
+        """
+        role = await self._require_role(role_name)
+        names = set(parent_names)
+        result = await self.session.execute(select(Role.name, Role.id).where(Role.name.in_(names)))
+        found = dict(result.all())
+        missing = sorted(names - found.keys())
+        if missing:
+            raise ValueError(f"Role '{missing[0]}' not found")
+        parent_ids = set(found.values())
+        # Serialize hierarchy changes: two concurrent edits could each pass
+        # the cycle check against a graph missing the other's new edge.
+        # Locking every role row, in key order, acts as a table-wide mutex
+        # that plain reads of roles do not wait on.
+        await self.session.execute(select(Role.id).order_by(Role.id).with_for_update())
+        parents = await self._parents_map(lock=True)
+        parents[role.id] = parent_ids
+        if role.id in set().union(*(self._closure(parent_id, parents) for parent_id in parent_ids)):
+            raise ValueError("Role inheritance cannot contain cycles")
+
+        await self.session.execute(delete(role_inheritance).where(role_inheritance.c.role_id == role.id))
+        if parent_ids:
+            await self.session.execute(
+                insert(role_inheritance),
+                [{"role_id": role.id, "parent_role_id": parent_id} for parent_id in parent_ids],
+            )
+        await self._rebuild({role.id})
+
+    async def rebuild_all(self) -> None:
+        """Recompute the effective permissions of every role."""
+        result = await self.session.execute(select(Role.id))
+        await self._rebuild(set(result.scalars().all()))
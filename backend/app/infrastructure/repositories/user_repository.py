@@ -1,12 +1,51 @@
+import re
 import uuid
-from sqlalchemy import select
+from datetime import datetime, timezone
+from sqlalchemy import select, insert, update, delete, and_, or_, func, tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from app.domain.entities.permission import Permission, role_permissions
+from app.domain.entities.permission import role_effective_permissions
 from app.domain.entities.role import Role, user_roles
 from app.domain.entities.user import User
-from app.core.utils.security import hash_password
+from app.domain.entities.log import Log
+from app.core.utils.hashing import hash_password_async
+from app.core.config.unit_of_work import after_commit
+from app.core.utils.permission_cache import permission_cache, invalidate_user_permissions
+from app.core.utils.permission_bits import EffectivePermissions, permission_registry
+from app.core.utils.token_versions import token_versions
+
+class UserAlreadyExistsError(ValueError):
+    """Raised when a username or email violates its unique index."""
+    def __init__(self, field: str):
+        self.field = field
+        super().__init__(f"{field.capitalize()} already registered")
+
+# Unique key named by the driver, without its table prefix, mapped to the
+# user field it guards. MySQL names the index ("Duplicate entry 'x' for key
+# 'users.ix_users_email'", or 'ix_users_email' before 8.0); SQLite names the
+# column ("UNIQUE constraint failed: users.email").
+USER_UNIQUE_KEYS = {
+    "ix_users_username": "username",
+    "ix_users_email": "email",
+    "username": "username",
+    "email": "email",
+}
+_UNIQUE_KEY_PATTERN = re.compile(r"for key '([^']+)'|UNIQUE constraint failed: (\S+)")
+
+def duplicate_user_field(error: IntegrityError) -> str | None:
+    """
+    Name the user field whose unique index caused `error`, or None if it
+    was some other integrity violation.
+    """
+    args = getattr(error.orig, "args", ())
+    message = str(args[-1]) if args else str(error.orig)
+    match = _UNIQUE_KEY_PATTERN.search(message)
+    if not match:
+        return None
+    key = match.group(1) or match.group(2)
+    return USER_UNIQUE_KEYS.get(key.rsplit(".", 1)[-1])
 
 class UserRepository:
     def __init__(self, session: AsyncSession):
@@ -19,6 +58,16 @@ class UserRepository:
         )
         return result.scalars().first()
 
+    async def get_by_usernames(self, usernames) -> dict[str, User]:
+        """Retrieve several users by username in one query, keyed by username."""
+        names = set(usernames)
+        if not names:
+            return {}
+        result = await self.session.execute(
+            select(User).where(User.username.in_(names))
+        )
+        return {user.username: user for user in result.scalars().all()}
+
     async def get_by_email(self, email: str) -> User | None:
         """Retrieve a user by email."""
         result = await self.session.execute(
@@ -26,48 +75,175 @@ class UserRepository:
         )
         return result.scalars().first()
 
-    async def create_user(self, username: str, email: str, hashed_password: str) -> User:
-        """Create and persist a new user."""
+    def add_user(
+        self,
+        username: str,
+        email: str,
+        hashed_password: str,
+        consent_lgpd: bool = False,
+    ) -> User:
+        """
+        Stage a new user in the session; it is inserted on the next commit.
+        All columns are set here so no refresh is needed afterwards.
+        """
         new_user = User(
             id=str(uuid.uuid4()),
             username=username,
             email=email,
             hashed_password=hashed_password,
+            created_at=datetime.now(timezone.utc),
+            is_active=True,
+            role="user",
+            consent_lgpd=consent_lgpd,
         )
         self.session.add(new_user)
-        await self.session.commit()
-        await self.session.refresh(new_user)
         return new_user
 
-    async def set_roles(self, user_id: str, role_names: list[str]) -> None:
+    async def flush_new_users(self) -> None:
         """
-        Replace the user's roles with the provided list of role names.
+        Flush staged users, relying on the unique indexes on username and
+        email instead of checking for duplicates beforehand.
+        Raises UserAlreadyExistsError on a duplicate; the transaction must
+        then be rolled back.
+        """
+        try:
+            await self.session.flush()
+        except IntegrityError as e:
+            field = duplicate_user_field(e)
+            if field is None:
+                raise
+            raise UserAlreadyExistsError(field) from e
+
+    async def find_existing(
+        self, usernames: list[str], emails: list[str]
+    ) -> tuple[set[str], set[str]]:
+        """
+        Return the lowercased usernames and emails among the given ones that
+        are already registered, using one IN query per column.
+        """
+        existing_usernames, existing_emails = set(), set()
+        if usernames:
+            result = await self.session.execute(
+                select(User.username).where(User.username.in_(usernames))
+            )
+            existing_usernames = {username.lower() for username in result.scalars()}
+        if emails:
+            result = await self.session.execute(
+                select(User.email).where(User.email.in_(emails))
+            )
+            existing_emails = {email.lower() for email in result.scalars()}
+        return existing_usernames, existing_emails
+
+    async def bulk_insert_users(self, rows: list[dict]) -> None:
         """
-        async with self.session.begin():
-            user = await self.session.get(User, user_id)
-            if not user:
-                raise ValueError(f"User {user_id} not found")
+        Insert many users with a single multi-row INSERT. Each row must carry
+        every column.
+        Raises UserAlreadyExistsError on a duplicate; the transaction must
+        then be rolled back.
+        """
+        if rows:
+            try:
+                await self.session.execute(insert(User), rows)
+            except IntegrityError as e:
+                field = duplicate_user_field(e)
+                if field is None:
+                    raise
+                raise UserAlreadyExistsError(field) from e
+
+    async def create_user(
+        self,
+        username: str,
+        email: str,
+        hashed_password: str,
+        consent_lgpd: bool = False,
+    ) -> User:
+        """Create a new user in the current transaction."""
+        new_user = self.add_user(username, email, hashed_password, consent_lgpd)
+        await self.flush_new_users()
+        return new_user
 
-            new_roles = []
-            for role_name in role_names:
-                result = await self.session.execute(select(Role).where(Role.name == role_name))
-                role = result.scalars().first()
-                if not role:
-                    raise ValueError(f"Role '{role_name}' not found")
-                new_roles.append(role)
+    async def _role_ids(self, role_names) -> dict[str, str]:
+        """Resolve role names to ids with a single IN query."""
+        names = set(role_names)
+        if not names:
+            return {}
+        result = await self.session.execute(
+            select(Role.name, Role.id).where(Role.name.in_(names))
+        )
+        role_ids = dict(result.all())
+        missing = sorted(names - role_ids.keys())
+        if missing:
+            raise ValueError(f"Role '{missing[0]}' not found")
+        return role_ids
 
-            user.roles = new_roles
+    async def update_roles(
+        self,
+        user_ids: list[str],
+        add: list[str] = (),
+        remove: list[str] = (),
+        replace: list[str] | None = None,
+    ) -> tuple[set[str], set[str]]:
+        """
+        Change the roles of many users at once. With `replace`, every user
+        ends up with exactly those roles; otherwise `add` roles are granted
+        and `remove` roles revoked. Only the difference to the current
+        memberships is written, as multi-row INSERT/DELETE statements.
+        Returns the ids of users whose roles changed and the unknown ids.
+        """
+        user_ids = set(user_ids)
+        role_ids = await self._role_ids([*add, *remove, *(replace or [])])
+        result = await self.session.execute(select(User.id).where(User.id.in_(user_ids)))
+        found = set(result.scalars().all())
+        result = await self.session.execute(
+            select(user_roles.c.user_id, user_roles.c.role_id)
+            .where(user_roles.c.user_id.in_(found))
+        )
+        current = {tuple(row) for row in result.all()}
+
+        if replace is not None:
+            target = {(user_id, role_ids[name]) for user_id in found for name in replace}
+            to_add = target - current
+            to_remove = current - target
+        else:
+            add_ids = {role_ids[name] for name in add}
+            remove_ids = {role_ids[name] for name in remove} - add_ids
+            to_add = {(user_id, role_id) for user_id in found for role_id in add_ids} - current
+            to_remove = {pair for pair in current if pair[1] in remove_ids}
+
+        if to_remove:
+            await self.session.execute(
+                delete(user_roles).where(
+                    tuple_(user_roles.c.user_id, user_roles.c.role_id).in_(list(to_remove))
+                )
+            )
+        if to_add:
+            await self.session.execute(
+                insert(user_roles),
+                [{"user_id": user_id, "role_id": role_id} for user_id, role_id in to_add],
+            )
+        await self.session.flush()
+
+        changed = {user_id for user_id, _ in to_add | to_remove}
+        if changed:
+            after_commit(self.session, invalidate_user_permissions, *changed)
+        return changed, user_ids - found
+
+    async def set_roles(self, user_id: str, role_names: list[str]) -> None:
+        """
+        Replace the user's roles with the provided list of role names.
+        """
+        _, missing = await self.update_roles([user_id], replace=role_names)
+        if missing:
+            raise ValueError(f"User {user_id} not found")
 
     async def has_permission(self, user_id: str, permission_name: str) -> bool:
         stmt = (
-            select(Permission.name)
-            .select_from(Permission)
-            .join(role_permissions, Permission.name == role_permissions.c.permission_name)
-            .join(Role, role_permissions.c.role_id == Role.id)
-            .join(user_roles, Role.id == user_roles.c.role_id)
+            select(role_effective_permissions.c.permission_name)
+            .select_from(user_roles)
+            .join(role_effective_permissions, user_roles.c.role_id == role_effective_permissions.c.role_id)
             .where(
                 (user_roles.c.user_id == user_id) &
-                (Permission.name == permission_name)
+                (role_effective_permissions.c.permission_name == permission_name)
             )
             .limit(1)
         )
@@ -75,51 +251,150 @@ class UserRepository:
         return result.scalar() is not None
 
     async def delete_user(self, user_id: str) -> None:
-        user = await self.session.get(User, user_id)
+        # Lock the user row before touching logs, the same order the buffered
+        # writer uses (user row, then logs), so the two cannot deadlock.
+        result = await self.session.execute(
+            select(User).where(User.id == user_id).with_for_update()
+        )
+        user = result.scalars().first()
         if user:
             await self.session.delete(user)
-            await self.session.commit()
-
-    async def set_reset_token(self, user_id, token, expires):
-        user = await self.get_by_id(user_id)
-        user.reset_token = token
-        user.reset_token_expires = expires
-        await self.session.commit()
-
-    async def get_by_reset_token(self, token):
-        result = await self.session.execute(select(User).where(User.reset_token == token))
-        return result.scalar_one_or_none()
+            await self.session.flush()
+            # logs.user_id has no FK (the table is partitioned), so clear it
+            # here; the buffered writer does the same for rows still queued
+            await self.session.execute(
+                update(Log).where(Log.user_id == user_id).values(user_id=None)
+            )
+            after_commit(self.session, invalidate_user_permissions, user_id)
+            after_commit(self.session, token_versions.revoke_tokens, user_id)
 
-    async def update_password(self, user_id, new_password):
+    async def anonymize_user(self, user_id: str) -> User | None:
+        """
+        Replace the user's personal data with anonymous placeholders and
+        deactivate the account.
+        """
         user = await self.get_by_id(user_id)
-        user.hashed_password = hash_password(new_password)
-        await self.session.commit()
+        if not user:
+            return None
+        user.username = f"anon_{user.id[:8]}"
+        user.email = f"anon_{user.id[:8]}@anon.local"
+        user.hashed_password = ""
+        user.is_active = False
+        user.consent_lgpd = False
+        await self.session.flush()
+        after_commit(self.session, invalidate_user_permissions, user_id)
+        after_commit(self.session, token_versions.revoke_tokens, user_id)
+        return user
 
-    async def clear_reset_token(self, user_id):
-        user = await self.get_by_id(user_id)
-        user.reset_token = None
-        user.reset_token_expires = None
-        await self.session.commit()
+    async def set_password(self, user: User, new_password: str) -> None:
+        """
+        Hash and stage a new password; the user's existing access tokens are
+        revoked once it commits.
+        """
+        user.hashed_password = await hash_password_async(new_password)
+        after_commit(self.session, token_versions.revoke_tokens, user.id)
 
     async def get_by_id(self, user_id):
-        result = await self.session.execute(select(User).where(User.id == user_id))
+        result = await self.session.execute(
+            select(User).where(User.id == user_id)
+        )
         return result.scalar_one_or_none()
 
     async def get_permissions(self, user_id: str) -> list[str]:
         stmt = (
-            select(Permission.name)
+            select(role_effective_permissions.c.permission_name)
             .select_from(user_roles)
-            .join(Role, user_roles.c.role_id == Role.id)
-            .join(role_permissions, Role.id == role_permissions.c.role_id)
-            .join(Permission, role_permissions.c.permission_name == Permission.name)
+            .join(role_effective_permissions, user_roles.c.role_id == role_effective_permissions.c.role_id)
             .where(user_roles.c.user_id == user_id)
+            .distinct()
         )
         result = await self.session.execute(stmt)
         permissions = [row[0] for row in result.all()]
         return permissions
 
+    async def get_effective_permissions(self, user_id: str) -> EffectivePermissions:
+        """
+        Return the user's effective permissions as names and as a bitmask,
+        served from the in-memory cache when possible.
+        """
+        permissions = permission_cache.get(user_id)
+        if permissions is not None:
+            return permissions
+        generation = permission_cache.generation
+        names = frozenset(await self.get_permissions(user_id))
+        await permission_registry.ensure_loaded(self.session, names)
+        permissions = EffectivePermissions(names, permission_registry.mask(names))
+        permission_cache.set(user_id, permissions, generation=generation)
+        return permissions
+
+    async def get_permission_set(self, user_id: str) -> frozenset[str]:
+        return (await self.get_effective_permissions(user_id)).names
+
+    async def get_permission_mask(self, user_id: str) -> int:
+        return (await self.get_effective_permissions(user_id)).mask
+
     async def list_all_users(self):
         result = await self.session.execute(
-            select(User).options(selectinload(User.roles))
+            select(User).options(selectinload(User.roles)).execution_options(replica=True)
+        )
+        return result.scalars().all()
+
+    def _user_filters(
+        self,
+        is_active: bool | None = None,
+        role: str | None = None,
+        username_prefix: str | None = None,
+        email_domain: str | None = None,
+    ) -> list:
+        filters = []
+        if is_active is not None:
+            filters.append(User.is_active == is_active)
+        if role:
+            filters.append(User.roles.any(Role.name == role))
+        if username_prefix:
+            filters.append(User.username.startswith(username_prefix, autoescape=True))
+        if email_domain:
+            # Matches the functional index ix_users_email_domain
+            filters.append(func.substring_index(User.email, "@", -1) == email_domain.lower())
+        return filters
+
+    async def list_users_page(
+        self,
+        limit: int,
+        after: tuple[datetime, str] | None = None,
+        include_total: bool = False,
+        **filters,
+    ) -> tuple[list[User], bool, int | None]:
+        """
+        Return one page of users ordered by newest first, using keyset
+        pagination on (created_at, id), with roles and permissions eager-loaded.
+        Returns the users, whether a next page exists and, if requested,
+        the total number of matching users.
+        """
+        conditions = self._user_filters(**filters)
+        stmt = (
+            select(User)
+            .options(selectinload(User.roles).selectinload(Role.effective_permissions))
+            .where(*conditions)
+            .order_by(User.created_at.desc(), User.id.desc())
+            .limit(limit + 1)
+            .execution_options(replica=True)
         )
-        return result.scalars().all()
\ No newline at end of file
+        if after is not None:
+            created_at, user_id = after
+            stmt = stmt.where(
+                or_(
+                    User.created_at < created_at,
+                    and_(User.created_at == created_at, User.id < user_id),
+                )
+            )
+        result = await self.session.execute(stmt)
+        users = list(result.scalars().all())
+        has_more = len(users) > limit
+
+        total = None
+        if include_total:
+            total = await self.session.scalar(
+                select(func.count()).select_from(User).where(*conditions).execution_options(replica=True)
+            )
+        return users[:limit], has_more, total
@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import time
+from sqlalchemy import insert, select
+from app.core.config.settings import settings
+from app.core.config.database import AsyncSessionLocal
+from app.core.utils.metrics import registry
+from app.domain.entities.log import Log
+from app.domain.entities.user import User
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+flush_duration = registry.histogram(
+    "authsphere_audit_log_flush_seconds",
+    "Time spent writing one batch of audit log rows.",
+)
+logs_written = registry.counter(
+    "authsphere_audit_logs_written_total",
+    "Audit log rows written by the buffered writer.",
+)
+logs_dropped = registry.counter(
+    "authsphere_audit_logs_dropped_total",
+    "Audit log rows discarded because the buffer was full or the write failed.",
+)
+
+
+class AuditLogWriter:
+    """
+    Buffers audit log rows in memory and writes them in batches with a
+    multi-row INSERT, flushing when `batch_size` rows are queued or every
+    `flush_interval` seconds.
+    """
+    def __init__(
+        self,
+        session_factory,
+        max_buffer: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        overflow_policy: str = "block",
+        flush_attempts: int = 3,
+        retry_delay: float = 0.5,
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown audit log overflow policy '{overflow_policy}'")
+        self.session_factory = session_factory
+        self.max_buffer = max_buffer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.flush_attempts = flush_attempts
+        self.retry_delay = retry_delay
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._flushing: asyncio.Task | None = None
+        self._stopping = False
+        self._collected: list[dict] = []
+        self._pending: set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_buffer)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop the background task and flush everything still buffered.
+        """
+        if self._task is None:
+            return
+        if self._pending:
+            await asyncio.gather(*self._pending)
+        self._stopping = True
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._stopping = False
+        if self._flushing is not None:
+            await self._flushing
+            self._flushing = None
+        await self._flush(self._collected)
+        self._collected = []
+        while not self._queue.empty():
+            await self._flush(self._drain(self.batch_size))
+
+    def submit(self, entry: dict) -> None:
+        """
+        Queue an audit log row built with `new_log_entry`, which assigns the
+        id and timestamp when the event happens, not when it is flushed.
+        Called once the recording transaction commits, so it cannot wait:
+        under the "block" policy a full buffer hands the row to a task that
+        waits for room.
+        """
+        if not self._queue.full():
+            self._queue.put_nowait(entry)
+        elif self.overflow_policy == "block":
+            task = asyncio.get_running_loop().create_task(self._queue.put(entry))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+        elif self.overflow_policy == "drop_newest":
+            logs_dropped.inc(reason="overflow")
+        else:
+            self._queue.get_nowait()
+            self._queue.put_nowait(entry)
+            logs_dropped.inc(reason="overflow")
+
+    def _drain(self, limit: int) -> list[dict]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        # Rows taken off the queue live in self._collected until handed to a
+        # flush, so stop() can still write them if cancelled mid-batch.
+        while True:
+            self._collected.append(await self._queue.get())
+            deadline = time.monotonic() + self.flush_interval
+            while len(self._collected) < self.batch_size:
+                self._collected.extend(self._drain(self.batch_size - len(self._collected)))
+                remaining = deadline - time.monotonic()
+                if len(self._collected) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    self._collected.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+                if self._stopping:
+                    # wait_for swallows a cancel that lands just as get()
+                    # completes (bpo-42130); honour it here instead.
+                    raise asyncio.CancelledError
+            batch, self._collected = self._collected, []
+            self._flushing = asyncio.create_task(self._flush(batch))
+            await asyncio.shield(self._flushing)
+            self._flushing = None
+
+    @staticmethod
+    async def _clear_deleted_users(session, batch: list[dict]) -> None:
+        """
+        logs.user_id has no FK, so null the ids of users deleted since their
+        rows were queued, as delete_user does for rows already written. The
+        shared lock on the user rows is taken before the insert, the order
+        delete_user locks in: a delete in progress makes this wait and then
+        see the user gone, and a delete arriving later waits for this batch
+        and nulls its rows itself.
+        """
+        user_ids = {entry["user_id"] for entry in batch if entry["user_id"]}
+        if not user_ids:
+            return
+        result = await session.execute(
+            select(User.id).where(User.id.in_(user_ids)).with_for_update(read=True)
+        )
+        existing = set(result.scalars().all())
+        for entry in batch:
+            if entry["user_id"] not in existing:
+                entry["user_id"] = None
+
+    async def _flush(self, batch: list[dict]) -> None:
+        """
+        Write one batch, retrying with exponential backoff so a deadlock or a
+        dropped connection does not lose audit rows. Only a batch that fails
+        every attempt is counted as dropped.
+        """
+        if not batch:
+            return
+        start = time.perf_counter()
+        try:
+            for attempt in range(1, self.flush_attempts + 1):
+                try:
+                    async with self.session_factory() as session:
+                        await self._clear_deleted_users(session, batch)
+                        await session.execute(insert(Log), batch)
+                        await session.commit()
+                except Exception:
+                    if attempt == self.flush_attempts:
+                        logs_dropped.inc(len(batch), reason="error")
+                        logger.exception(
+                            "Failed to write %d audit log rows after %d attempts", len(batch), attempt
+                        )
+                        return
+                    logger.warning(
+                        "Writing %d audit log rows failed, retrying (attempt %d of %d)",
+                        len(batch), attempt, self.flush_attempts, exc_info=True,
+                    )
+                    await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+                else:
+                    logs_written.inc(len(batch))
+                    return
+        finally:
+            flush_duration.observe(time.perf_counter() - start)
+
+audit_log_writer = AuditLogWriter(
+    AsyncSessionLocal,
+    max_buffer=settings.AUDIT_LOG_BUFFER_SIZE,
+    batch_size=settings.AUDIT_LOG_BATCH_SIZE,
+    flush_interval=settings.AUDIT_LOG_FLUSH_INTERVAL_SECONDS,
+    overflow_policy=settings.AUDIT_LOG_OVERFLOW_POLICY,
+)
+
+registry.gauge(
+    "authsphere_audit_log_queue_depth",
+    "Audit log rows waiting to be written.",
+    callback=lambda: audit_log_writer.depth,
+)
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import re
+from datetime import datetime
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from app.core.config.settings import settings
+from app.core.config.database import engine
+
+logger = logging.getLogger(__name__)
+
+PARTITION_NAME = re.compile(r"^p(\d{4})(\d{2})$")
+LOCK_NAME = "authsphere_log_partitions"
+
+
+def _add_months(year: int, month: int, months: int) -> tuple[int, int]:
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+async def _monthly_partitions(conn: AsyncConnection) -> list[tuple[int, int]]:
+    result = await conn.execute(text(
+        "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'logs' "
+        "AND PARTITION_NAME IS NOT NULL"
+    ))
+    months = []
+    for (name,) in result.all():
+        match = PARTITION_NAME.match(name)
+        if match:
+            months.append((int(match.group(1)), int(match.group(2))))
+    return sorted(months)
+
+
+async def ensure_future_partitions(conn: AsyncConnection, months_ahead: int, now: datetime) -> list[str]:
+    """
+    Split `p_future` so that a partition exists for every month up to
+    `months_ahead` months from now.
+    """
+    months = await _monthly_partitions(conn)
+    if not months:
+        return []
+    target = _add_months(now.year, now.month, months_ahead)
+    year, month = _add_months(*months[-1], 1)
+    created = []
+    definitions = []
+    while (year, month) <= target:
+        next_year, next_month = _add_months(year, month, 1)
+        name = f"p{year:04d}{month:02d}"
+        definitions.append(
+            f"PARTITION {name} VALUES LESS THAN ('{next_year:04d}-{next_month:02d}-01')"
+        )
+        created.append(name)
+        year, month = next_year, next_month
+    if definitions:
+        await conn.execute(text(
+            "ALTER TABLE logs REORGANIZE PARTITION p_future INTO ("
+            + ", ".join(definitions)
+            + ", PARTITION p_future VALUES LESS THAN (MAXVALUE))"
+        ))
+    return created
+
+
+async def drop_expired_partitions(conn: AsyncConnection, retention_months: int, now: datetime) -> list[str]:
+    """
+    Drop monthly partitions whose rows are all older than the retention
+    window. Dropping a partition is a metadata operation, unlike DELETE.
+    """
+    cutoff = _add_months(now.year, now.month, -retention_months)
+    expired = [
+        f"p{year:04d}{month:02d}"
+        for year, month in await _monthly_partitions(conn)
+        if _add_months(year, month, 1) <= cutoff
+    ]
+    if expired:
+        await conn.execute(text("ALTER TABLE logs DROP PARTITION " + ", ".join(expired)))
+    return expired
+
+
+async def maintain_log_partitions() -> None:
+    """
+    Create upcoming monthly partitions and drop expired ones. Guarded by a
+    MySQL named lock so only one worker runs it at a time.
+    """
+    async with engine.connect() as conn:
+        acquired = await conn.scalar(text("SELECT GET_LOCK(:name, 0)"), {"name": LOCK_NAME})
+        if not acquired:
+            return
+        try:
+            now = datetime.utcnow()
+            created = await ensure_future_partitions(conn, settings.LOG_PARTITION_MONTHS_AHEAD, now)
+            dropped = []
+            if settings.LOG_RETENTION_MONTHS > 0:
+                dropped = await drop_expired_partitions(conn, settings.LOG_RETENTION_MONTHS, now)
+            if created or dropped:
+                logger.info("Log partitions created: %s, dropped: %s", created, dropped)
+        finally:
+            await conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": LOCK_NAME})
+
+
+async def run_log_partition_maintenance(interval: float) -> None:
+    """
+    Run partition maintenance every `interval` seconds until cancelled.
+    """
+    while True:
+        try:
+            await maintain_log_partitions()
+        except Exception:
+            logger.exception("Log partition maintenance failed")
+        await asyncio.sleep(interval)
+
+
+async def _main() -> None:
+    try:
+        await maintain_log_partitions()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
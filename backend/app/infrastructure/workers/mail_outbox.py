@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from app.core.config.settings import settings
+from app.core.config.database import AsyncSessionLocal
+from app.core.utils.email import SMTPConnectionPool, build_message, is_permanent_failure, smtp_pool
+from app.core.utils.metrics import registry
+from app.infrastructure.repositories.email_outbox_repository import EmailOutboxRepository
+
+logger = logging.getLogger(__name__)
+
+# How long a claimed message stays hidden from other workers while it is sent.
+LEASE_SECONDS = 300
+MAX_BACKOFF_SECONDS = 3600
+
+send_duration = registry.histogram(
+    "authsphere_email_send_seconds",
+    "Time spent delivering one email over SMTP.",
+)
+emails_processed = registry.counter(
+    "authsphere_emails_total",
+    "Outbox emails processed, by outcome.",
+)
+
+
+class MailOutboxWorker:
+    """
+    Delivers messages from the `email_outbox` table over a pooled SMTP
+    connection. Failed sends are retried with exponential backoff until
+    `max_attempts`, and deliveries are spaced to respect `rate_limit`
+    messages per second.
+    """
+    def __init__(
+        self,
+        session_factory,
+        pool: SMTPConnectionPool,
+        batch_size: int = 20,
+        poll_interval: float = 5.0,
+        max_attempts: int = 5,
+        retry_backoff: float = 30.0,
+        rate_limit: float = 5.0,
+    ):
+        self.session_factory = session_factory
+        self.pool = pool
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.rate_limit = rate_limit
+        self._task: asyncio.Task | None = None
+        self._wake: asyncio.Event | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._next_send_at = 0.0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.pool.close()
+
+    def wake(self) -> None:
+        """
+        Deliver newly queued messages now instead of at the next poll.
+        """
+        if self._wake is not None:
+            self._wake.set()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.pool.size, thread_name_prefix="smtp"
+            )
+        return self._executor
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                delivered = await self.deliver_due()
+            except Exception:
+                logger.exception("Mail outbox delivery failed")
+                delivered = 0
+            if delivered < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+
+    async def _throttle(self) -> None:
+        if self.rate_limit <= 0:
+            return
+        now = time.monotonic()
+        delay = self._next_send_at - now
+        self._next_send_at = max(now, self._next_send_at) + 1 / self.rate_limit
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _backoff(self, attempts: int) -> timedelta:
+        delay = min(self.retry_backoff * 2 ** (attempts - 1), MAX_BACKOFF_SECONDS)
+        return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+    async def _send(self, email, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            await self._throttle()
+            message = build_message(email.to_email, email.subject, email.body)
+            start = time.perf_counter()
+            try:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(self._get_executor(), self.pool.send, message)
+                return None
+            except Exception as e:
+                return e
+            finally:
+                send_duration.observe(time.perf_counter() - start)
+
+    async def deliver_due(self) -> int:
+        """
+        Claim and send one batch of due messages. Returns how many were claimed.
+        """
+        async with self.session_factory() as session:
+            emails = await EmailOutboxRepository(session).claim_due(self.batch_size, LEASE_SECONDS)
+            await session.commit()
+        if not emails:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.pool.size)
+        errors = await asyncio.gather(*(self._send(email, semaphore) for email in emails))
+
+        async with self.session_factory() as session:
+            outbox_repo = EmailOutboxRepository(session)
+            sent = [email.id for email, error in zip(emails, errors) if error is None]
+            await outbox_repo.mark_sent(sent)
+            emails_processed.inc(len(sent), outcome="sent")
+            for email, error in zip(emails, errors):
+                if error is None:
+                    continue
+                message = f"{type(error).__name__}: {error}"
+                if is_permanent_failure(error) or email.attempts >= self.max_attempts:
+                    logger.warning("Giving up on email %s after %d attempts: %s", email.id, email.attempts, message)
+                    await outbox_repo.mark_failed(email.id, message)
+                    emails_processed.inc(outcome="failed")
+                else:
+                    await outbox_repo.mark_retry(
+                        email.id, message, datetime.utcnow() + self._backoff(email.attempts)
+                    )
+                    emails_processed.inc(outcome="retried")
+            await session.commit()
+        return len(emails)
+
+
+mail_outbox_worker = MailOutboxWorker(
+    AsyncSessionLocal,
+    smtp_pool,
+    batch_size=settings.MAIL_OUTBOX_BATCH_SIZE,
+    poll_interval=settings.MAIL_OUTBOX_POLL_INTERVAL_SECONDS,
+    max_attempts=settings.MAIL_OUTBOX_MAX_ATTEMPTS,
+    retry_backoff=settings.MAIL_OUTBOX_RETRY_BACKOFF_SECONDS,
+    rate_limit=settings.MAIL_OUTBOX_RATE_LIMIT_PER_SECOND,
+)
+
+
+async def _main() -> None:
+    # Run the worker on its own, e.g. when MAIL_OUTBOX_WORKER is disabled in the API.
+    mail_outbox_worker.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await mail_outbox_worker.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,27 @@
+import asyncio
+import logging
+from app.core.config.database import AsyncSessionLocal
+from app.infrastructure.repositories.password_reset_token_repository import PasswordResetTokenRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def sweep_expired_reset_tokens() -> int:
+    async with AsyncSessionLocal() as session:
+        deleted = await PasswordResetTokenRepository(session).delete_expired()
+        await session.commit()
+        return deleted
+
+
+async def run_reset_token_sweeper(interval: float) -> None:
+    """
+    Delete expired password reset tokens every `interval` seconds until cancelled.
+    """
+    while True:
+        try:
+            deleted = await sweep_expired_reset_tokens()
+            if deleted:
+                logger.info("Deleted %d expired password reset tokens", deleted)
+        except Exception:
+            logger.exception("Password reset token sweep failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,28 @@
+import asyncio
+import logging
+from app.core.config.database import AsyncSessionLocal, engine
+from app.infrastructure.repositories.role_repository import RoleRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_role_closure() -> None:
+    """
+    Recompute `role_effective_permissions` for every role, e.g. after roles
+    or grants were changed directly in the database.
+    """
+    async with AsyncSessionLocal() as session:
+        await RoleRepository(session).rebuild_all()
+        await session.commit()
+    logger.info("Role permission closure rebuilt")
+
+
+async def _main() -> None:
+    try:
+        await rebuild_role_closure()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -1,9 +1,48 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1 import api
+from app.api.v1.endpoints import debug, jwks, metrics
 from app.core.config.settings import settings
+from app.core.utils.hashing import password_hasher
+from app.core.utils.instrumentation import MetricsMiddleware
+from app.core.utils.jwt_keys import key_ring
+from app.core.utils.query_profiler import QueryProfilerMiddleware
+from app.infrastructure.workers.audit_log_writer import audit_log_writer
+from app.infrastructure.workers.log_partitions import run_log_partition_maintenance
+from app.infrastructure.workers.mail_outbox import mail_outbox_worker
+from app.infrastructure.workers.reset_token_sweeper import run_reset_token_sweeper
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    background = []
+    # Create or load the signing keys off the event loop before serving
+    await asyncio.to_thread(key_ring.refresh)
+    if settings.AUDIT_LOG_BUFFERED:
+        audit_log_writer.start()
+    if settings.MAIL_OUTBOX_WORKER:
+        mail_outbox_worker.start()
+    if settings.LOG_PARTITION_MAINTENANCE:
+        background.append(asyncio.create_task(
+            run_log_partition_maintenance(settings.LOG_PARTITION_MAINTENANCE_INTERVAL_SECONDS)
+        ))
+    if settings.PASSWORD_RESET_SWEEP_INTERVAL_SECONDS > 0:
+        background.append(asyncio.create_task(
+            run_reset_token_sweeper(settings.PASSWORD_RESET_SWEEP_INTERVAL_SECONDS)
+        ))
+    yield
+    for task in background:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await audit_log_writer.stop()
+    await mail_outbox_worker.stop()
+    password_hasher.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -12,5 +51,18 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.QUERY_PROFILER_ENABLED:
+    app.add_middleware(
+        QueryProfilerMiddleware,
+        n_plus_one_threshold=settings.QUERY_PROFILER_N_PLUS_ONE_THRESHOLD,
+    )
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 app.include_router(api.api_router, prefix="/api/v1")
+# Served from the root so resource servers find it at the standard location
+app.include_router(jwks.router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
+if settings.QUERY_PROFILER_ENABLED:
+    app.include_router(debug.router)
@@ -7,6 +7,17 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     username: str | None = None
 
+class CurrentUser(BaseModel):
+    """
+    Authenticated user rebuilt from the claims of a stateless access token.
+    `permission_mask` is None when the embedded bitmask is stale.
+    """
+    id: str
+    username: str
+    email: str
+    is_active: bool = True
+    permission_mask: int | None = None
+
 class LoginRequest(BaseModel):
     username: str
     password: str
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, constr
+from pydantic import BaseModel, EmailStr, Field, constr, model_validator
 
 class UserCreate(BaseModel):
     username: constr(min_length=3, max_length=50)
@@ -15,5 +15,45 @@ class UserRead(BaseModel):
     class Config:
         from_attributes = True  
 
+class UserListItem(UserRead):
+    is_active: bool | None = None
+    roles: list[str] = []
+
+class UserPage(BaseModel):
+    items: list[UserListItem]
+    next_cursor: str | None = None
+    total: int | None = None
+
+class UserImportRow(BaseModel):
+    row: int
+    username: str | None = None
+    status: str  # "created", "duplicate" or "invalid"
+    error: str | None = None
+
+class UserImportReport(BaseModel):
+    created: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    rows: list[UserImportRow] = []
+    error: str | None = None  # set when the file could not be read to the end
+
 class UserRoleUpdate(BaseModel):
     roles: list[str]  # List of role names, e.g., ["admin", "auditor"]
+
+class BulkRoleUpdate(BaseModel):
+    user_ids: list[str] = Field(..., min_length=1, max_length=10000)
+    add: list[str] = []
+    remove: list[str] = []
+    replace: list[str] | None = None  # Exact role set; excludes add/remove
+
+    @model_validator(mode="after")
+    def check_operation(self):
+        if self.replace is not None and (self.add or self.remove):
+            raise ValueError("Use either 'replace' or 'add'/'remove', not both")
+        if self.replace is None and not (self.add or self.remove):
+            raise ValueError("Nothing to do: provide 'replace', 'add' or 'remove'")
+        return self
+
+class BulkRoleUpdateResult(BaseModel):
+    updated: int
+    missing_user_ids: list[str] = []
@@ -0,0 +1,157 @@
+import asyncio
+import os
+
+# Settings are read at import time; provide what a test run needs before the
+# app is imported. Hashing is made cheap and background workers are disabled.
+for name, value in {
+    "SECRET_KEY": "test-secret",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "3306",
+    "DB_NAME": "authsphere",
+    "DB_ROOT_PASSWORD": "test",
+    "SMTP_SERVER": "localhost",
+    "SMTP_PORT": "25",
+    "SMTP_USER": "test@example.com",
+    "SMTP_PASSWORD": "test",
+    "ARGON2_TIME_COST": "1",
+    "ARGON2_MEMORY_COST_KIB": "1024",
+    "ARGON2_PARALLELISM": "1",
+    "BCRYPT_ROUNDS": "4",
+    "LOGIN_RATE_LIMIT_ENABLED": "false",
+    "AUDIT_LOG_BUFFERED": "false",
+    "MAIL_OUTBOX_WORKER": "false",
+    "LOG_PARTITION_MAINTENANCE": "false",
+    "PASSWORD_RESET_SWEEP_INTERVAL_SECONDS": "0",
+}.items():
+    os.environ.setdefault(name, value)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.core.config.database import Base, get_db
+from app.core.utils.form_field_cache import form_field_cache
+from app.core.utils import query_profiler
+from app.core.config.settings import settings
+from app.core.utils.permission_bits import permission_registry
+from app.core.utils.security import create_access_token
+from app.core.utils.permission_cache import permission_cache
+from app.core.utils.token_deny_list import token_deny_list
+from app.core.utils.token_versions import token_versions
+from app.domain.entities.auth_session import AuthSession  # noqa: F401
+from app.domain.entities.email_outbox import EmailOutbox  # noqa: F401
+from app.domain.entities.form_field import FormField
+from app.domain.entities.log import Log  # noqa: F401
+from app.domain.entities.password_reset_token import PasswordResetToken  # noqa: F401
+from app.domain.entities.permission import Permission, role_permissions
+from app.domain.entities.role import Role, user_roles
+from app.domain.entities.user import User
+from app.infrastructure.repositories.role_repository import RoleRepository
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture(autouse=True)
+def reset_process_state():
+    """
+    Start every test with empty per-process caches and revocation state.
+    """
+    form_field_cache.invalidate()
+    permission_cache.clear()
+    # Keep the registry version growing so masks cached by the permission
+    # dependencies are recomputed; empty bits force a reload on first use.
+    permission_registry.bits = {}
+    permission_registry.names_by_bit = {}
+    permission_registry._loaded_at = 0.0
+    token_versions.__init__()
+    token_deny_list.__init__()
+
+
+@pytest.fixture
+def session_factory():
+    """
+    Session factory bound to a fresh in-memory SQLite database with the
+    full schema and the default email form field.
+    """
+    engine = create_async_engine("sqlite+aiosqlite://")
+    factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as session:
+            session.add(FormField(
+                name="email", label="Email", field_type="email", is_required=True, is_active=True,
+            ))
+            await session.commit()
+
+    run(setup())
+    yield factory
+    run(engine.dispose())
+
+
+@pytest.fixture
+def add_user(session_factory):
+    """
+    `add_user(username, permissions)` creates a user holding the given
+    permissions through a role of the same name and returns an access token.
+    """
+    async def create(username: str, permissions) -> None:
+        async with session_factory() as session:
+            result = await session.execute(select(Permission.name).where(Permission.name.in_(permissions)))
+            existing = set(result.scalars().all())
+            session.add_all([Permission(name=name) for name in permissions if name not in existing])
+            session.add(Role(id=f"r-{username}", name=username))
+            session.add(User(
+                id=username, username=username, email=f"{username}@example.com", hashed_password="x",
+            ))
+            await session.flush()
+            if permissions:
+                await session.execute(insert(role_permissions), [
+                    {"role_id": f"r-{username}", "permission_name": name} for name in permissions
+                ])
+            await session.execute(insert(user_roles).values(user_id=username, role_id=f"r-{username}"))
+            await RoleRepository(session).rebuild_all()
+            await session.commit()
+
+    def add(username: str, permissions=()) -> str:
+        run(create(username, list(permissions)))
+        return create_access_token({"sub": username})
+    return add
+
+
+@pytest.fixture
+def client(session_factory):
+    async def override_get_db():
+        async with session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except BaseException:
+                await session.rollback()
+                raise
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def query_budget():
+    """
+    `query_budget(max_queries)` context manager that also fails on N+1
+    patterns at the configured threshold, e.g.:
+
+        with query_budget(3) as profile:
+            client.get("/api/v1/users/")
+    """
+    def budget(max_queries: int, n_plus_one_threshold: int | None = settings.QUERY_PROFILER_N_PLUS_ONE_THRESHOLD):
+        return query_profiler.query_budget(max_queries, n_plus_one_threshold=n_plus_one_threshold)
+    return budget
@@ -0,0 +1,123 @@
+import asyncio
+
+from sqlalchemy import select
+
+from app.domain.entities.log import Log
+from app.infrastructure.repositories import log_repository
+from app.infrastructure.repositories.log_repository import LogRepository
+from app.infrastructure.repositories.user_repository import UserRepository
+from app.infrastructure.workers.audit_log_writer import AuditLogWriter
+
+
+def test_buffered_logs_are_queued_only_when_the_transaction_commits(session_factory, monkeypatch):
+    writer = AuditLogWriter(session_factory, flush_interval=60)
+    monkeypatch.setattr(log_repository, "audit_log_writer", writer)
+
+    async def scenario():
+        writer.start()
+        try:
+            async with session_factory() as session:
+                await LogRepository(session).create_log(None, "rolled_back")
+                assert writer.depth == 0
+                await session.rollback()
+                await LogRepository(session).create_log(None, "committed")
+                assert writer.depth == 0
+                await session.commit()
+                await asyncio.sleep(0)
+        finally:
+            await writer.stop()
+        async with session_factory() as session:
+            return (await session.execute(select(Log.action))).scalars().all()
+
+    assert asyncio.run(scenario()) == ["committed"]
+
+
+def _written(session_factory):
+    async def query():
+        async with session_factory() as session:
+            return (await session.execute(select(Log.action).order_by(Log.action))).scalars().all()
+    return query()
+
+
+def _submit_and_stop(writer, actions):
+    async def scenario():
+        writer.start()
+        # The consumer task has not run yet, so the queue fills synchronously.
+        for action in actions:
+            writer.submit(log_repository.new_log_entry(None, action))
+        await writer.stop()
+    return scenario()
+
+
+def test_block_policy_keeps_every_row_when_the_buffer_is_full(session_factory):
+    writer = AuditLogWriter(session_factory, max_buffer=2, flush_interval=60)
+
+    async def scenario():
+        await _submit_and_stop(writer, ["a", "b", "c"])
+        return await _written(session_factory)
+
+    assert asyncio.run(scenario()) == ["a", "b", "c"]
+
+
+def test_drop_policies_discard_one_end_of_a_full_buffer(session_factory):
+    async def scenario(policy):
+        writer = AuditLogWriter(session_factory, max_buffer=2, flush_interval=60, overflow_policy=policy)
+        await _submit_and_stop(writer, [f"{policy}-a", f"{policy}-b", f"{policy}-c"])
+        return [a for a in await _written(session_factory) if a.startswith(policy)]
+
+    assert asyncio.run(scenario("drop_newest")) == ["drop_newest-a", "drop_newest-b"]
+    assert asyncio.run(scenario("drop_oldest")) == ["drop_oldest-b", "drop_oldest-c"]
+
+
+def test_stop_flushes_rows_still_buffered(session_factory):
+    writer = AuditLogWriter(session_factory, batch_size=500, flush_interval=60)
+
+    async def scenario():
+        writer.start()
+        writer.submit(log_repository.new_log_entry(None, "queued"))
+        await asyncio.sleep(0)
+        assert await _written(session_factory) == []
+        await writer.stop()
+        return await _written(session_factory)
+
+    assert asyncio.run(scenario()) == ["queued"]
+
+
+def test_failed_flush_is_retried_before_rows_are_dropped(session_factory):
+    calls = []
+
+    def flaky_factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ConnectionError("lost connection")
+        return session_factory()
+
+    writer = AuditLogWriter(flaky_factory, flush_interval=60, retry_delay=0)
+
+    async def scenario():
+        await _submit_and_stop(writer, ["retried"])
+        return await _written(session_factory)
+
+    assert asyncio.run(scenario()) == ["retried"]
+    assert len(calls) == 2
+
+
+def test_rows_of_a_user_deleted_while_queued_are_written_without_the_user(session_factory, add_user):
+    add_user("alice")
+    writer = AuditLogWriter(session_factory, flush_interval=60)
+
+    async def scenario():
+        async with session_factory() as session:
+            await LogRepository(session).create_log("alice", "written")
+            await session.commit()
+        writer.start()
+        writer.submit(log_repository.new_log_entry("alice", "queued"))
+        async with session_factory() as session:
+            await UserRepository(session).delete_user("alice")
+            await session.commit()
+        writer.submit(log_repository.new_log_entry("alice", "after_delete"))
+        await writer.stop()
+        async with session_factory() as session:
+            return (await session.execute(select(Log.action, Log.user_id).order_by(Log.action))).all()
+
+    assert asyncio.run(scenario()) == [("after_delete", None), ("queued", None), ("written", None)]
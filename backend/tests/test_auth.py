@@ -0,0 +1,98 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.api.v1.endpoints import auth
+from app.core.config.settings import settings
+from app.core.utils.rate_limit import LoginThrottle, MemoryRateLimitBackend
+from app.core.utils.security import build_password_context, create_access_token, hash_password
+from app.domain.entities.auth_session import AuthSession
+from app.domain.entities.user import User
+from app.infrastructure.repositories.auth_session_repository import AuthSessionRepository
+
+
+def test_session_revoked_by_another_worker_rejects_its_access_token(client, add_user, session_factory):
+    add_user("alice")
+
+    async def open_session():
+        async with session_factory() as session:
+            auth_session, _ = await AuthSessionRepository(session).create("alice", timedelta(days=1))
+            await session.commit()
+            return auth_session.id
+
+    session_id = asyncio.run(open_session())
+    client.cookies["access_token"] = create_access_token({"sub": "alice", "sid": session_id})
+    assert client.get("/api/v1/users/me").status_code == 200
+
+    async def revoke():
+        # Not in this process's deny list, as if another worker logged out
+        async with session_factory() as session:
+            (await session.get(AuthSession, session_id)).revoked_at = datetime.utcnow()
+            await session.commit()
+
+    asyncio.run(revoke())
+    assert client.get("/api/v1/users/me").status_code == 401
+
+
+def _set_password_hash(session_factory, username: str, hashed_password: str) -> None:
+    async def update():
+        async with session_factory() as session:
+            (await session.get(User, username)).hashed_password = hashed_password
+            await session.commit()
+    asyncio.run(update())
+
+
+def _login(client, username: str, password: str):
+    return client.post("/api/v1/token", data={"username": username, "password": password})
+
+
+@pytest.fixture
+def throttle(monkeypatch):
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_ENABLED", True)
+    throttle = LoginThrottle(
+        MemoryRateLimitBackend(100),
+        per_ip=100, per_username=100, window=60,
+        lockout_threshold=3, lockout_base=30, lockout_max=3600,
+    )
+    monkeypatch.setattr(auth, "login_throttle", throttle)
+    return throttle
+
+
+def test_repeated_failures_lock_the_username_out(client, add_user, session_factory, throttle):
+    add_user("alice")
+    _set_password_hash(session_factory, "alice", hash_password("right password"))
+
+    assert [_login(client, "alice", "wrong").status_code for _ in range(3)] == [401, 401, 401]
+    response = _login(client, "alice", "right password")
+    assert response.status_code == 429
+    assert 29 <= int(response.headers["retry-after"]) <= 30
+    # Other usernames are unaffected
+    assert _login(client, "bob", "wrong").status_code == 401
+
+
+def test_successful_login_resets_the_failure_count(client, add_user, session_factory, throttle):
+    add_user("alice")
+    _set_password_hash(session_factory, "alice", hash_password("right password"))
+
+    assert [_login(client, "alice", "wrong").status_code for _ in range(2)] == [401, 401]
+    assert _login(client, "alice", "right password").status_code == 200
+    assert [_login(client, "alice", "wrong").status_code for _ in range(2)] == [401, 401]
+    assert _login(client, "alice", "right password").status_code == 200
+
+
+def test_login_upgrades_a_bcrypt_hash_to_argon2id(client, add_user, session_factory):
+    add_user("alice")
+    legacy = build_password_context("bcrypt", bcrypt_rounds=4).hash("right password")
+    _set_password_hash(session_factory, "alice", legacy)
+
+    assert _login(client, "alice", "right password").status_code == 200
+
+    async def stored_hash():
+        async with session_factory() as session:
+            return (await session.get(User, "alice")).hashed_password
+    upgraded = asyncio.run(stored_hash())
+    assert upgraded.startswith("$argon2id$")
+    # The upgraded hash still verifies and needs no further update
+    assert _login(client, "alice", "right password").status_code == 200
+    assert asyncio.run(stored_hash()) == upgraded
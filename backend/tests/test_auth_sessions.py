@@ -0,0 +1,61 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from app.core.utils.token_deny_list import token_deny_list
+from app.domain.entities.auth_session import AuthSession
+from app.domain.entities.user import User
+from app.infrastructure.repositories.auth_session_repository import (
+    AuthSessionRepository,
+    RefreshTokenReusedError,
+)
+from app.infrastructure.repositories.password_reset_token_repository import PasswordResetTokenRepository
+
+
+def add_user(session) -> None:
+    session.add(User(id="u-1", username="alice", email="alice@example.com", hashed_password="x"))
+
+
+def test_only_the_rotated_out_secret_counts_as_reuse(session_factory):
+    async def scenario():
+        async with session_factory() as session:
+            add_user(session)
+            repo = AuthSessionRepository(session)
+            auth_session, first = await repo.create("u-1", timedelta(days=1))
+            _, second = await repo.rotate(first)
+            session_id = auth_session.id
+
+            assert await repo.rotate(f"{session_id}.not-a-secret-we-issued") is None
+            assert auth_session.revoked_at is None
+
+            with pytest.raises(RefreshTokenReusedError):
+                await repo.rotate(first)
+            assert auth_session.revoked_at is not None
+            assert await repo.rotate(second) is None
+
+    asyncio.run(scenario())
+
+
+def test_password_reset_denies_access_tokens_of_revoked_sessions(client, session_factory):
+    async def setup():
+        async with session_factory() as session:
+            add_user(session)
+            repo = AuthSessionRepository(session)
+            sessions = [await repo.create("u-1", timedelta(days=1)) for _ in range(2)]
+            token = await PasswordResetTokenRepository(session).issue("u-1", timedelta(minutes=5))
+            await session.commit()
+            return [auth_session.id for auth_session, _ in sessions], token
+
+    session_ids, token = asyncio.run(setup())
+    response = client.post("/api/v1/password-reset/confirm", json={
+        "token": token, "new_password": "a new password 123",
+    })
+    assert response.status_code == 200, response.text
+    assert all(token_deny_list.is_denied(session_id) for session_id in session_ids)
+
+    async def revoked():
+        async with session_factory() as session:
+            return [(await session.get(AuthSession, session_id)).revoked_at for session_id in session_ids]
+
+    assert all(asyncio.run(revoked()))
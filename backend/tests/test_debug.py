@@ -0,0 +1,72 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.api.v1.endpoints import debug
+from app.core.utils.query_profiler import QueryProfile, QueryProfilerMiddleware, profile_engine, recent_profiles
+from app.domain.entities.user import User
+from app.main import app
+
+
+@pytest.fixture
+def debug_client(client):
+    debug_app = FastAPI()
+    debug_app.include_router(debug.router)
+    debug_app.dependency_overrides = app.dependency_overrides
+    return TestClient(debug_app)
+
+
+def test_query_profiles_require_logs_permission(debug_client, add_user):
+    viewer = add_user("viewer", ["user:view"])
+    auditor = add_user("auditor", ["logs:view"])
+    assert debug_client.get("/debug/queries").status_code == 401
+    debug_client.cookies["access_token"] = viewer
+    assert debug_client.get("/debug/queries").status_code == 403
+    debug_client.cookies["access_token"] = auditor
+    assert debug_client.get("/debug/queries").status_code == 200
+
+
+def test_query_budget_fixture_fails_over_budget(client, query_budget, add_user):
+    client.cookies["access_token"] = add_user("auditor", ["logs:view"])
+
+    with pytest.raises(AssertionError, match="exceed the budget"):
+        with query_budget(0):
+            client.get("/api/v1/users/me")
+
+
+def test_repeated_lookups_are_reported_as_n_plus_one_and_duplicates(session_factory):
+    profiled_app = FastAPI()
+    profiled_app.add_middleware(QueryProfilerMiddleware, n_plus_one_threshold=3)
+    profile_engine(session_factory.kw["bind"])
+
+    @profiled_app.get("/lookups")
+    async def lookups():
+        async with session_factory() as session:
+            for user_id in ["a", "b", "c", "c"]:
+                await session.execute(select(User.id).where(User.id == user_id))
+        return {}
+
+    response = TestClient(profiled_app).get("/lookups")
+
+    assert response.headers["x-query-count"] == "4"
+    assert response.headers["x-query-n-plus-one"] == "1"
+    assert response.headers["x-query-duplicates"] == "1"
+    [pattern] = recent_profiles[-1]["n_plus_one"]
+    assert pattern["statement"].endswith("WHERE users.id = ?")
+    assert (pattern["count"], pattern["duplicates"]) == (4, 1)
+
+
+def test_profile_summary_below_the_threshold_reports_no_n_plus_one():
+    profile = QueryProfile()
+    profile.record("SELECT users.id FROM users WHERE users.id IN (?, ?)", ("a", "b"), 0.001)
+    profile.record("SELECT users.id FROM users WHERE users.id IN (?, ?, ?)", ("c", "d", "e"), 0.001)
+
+    summary = profile.summary(n_plus_one_threshold=3)
+
+    assert summary["queries"] == 2
+    assert summary["duplicates"] == 0
+    assert summary["n_plus_one"] == []
+    assert [entry["statement"] for entry in summary["statements"]] == [
+        "SELECT users.id FROM users WHERE users.id IN (...)",
+    ]
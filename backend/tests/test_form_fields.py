@@ -0,0 +1,50 @@
+import asyncio
+
+from app.domain.entities.form_field import FormField
+
+
+def test_active_fields_are_cached_and_served_with_an_etag(client, query_budget):
+    first = client.get("/api/v1/form-fields")
+    assert first.status_code == 200
+    assert [field["name"] for field in first.json()] == ["email"]
+
+    with query_budget(0):
+        second = client.get("/api/v1/form-fields", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 304
+    assert second.headers["etag"] == first.headers["etag"]
+
+
+def test_committed_field_change_invalidates_the_cache(client, session_factory, query_budget):
+    etag = client.get("/api/v1/form-fields").headers["etag"]
+
+    async def add_field(commit):
+        async with session_factory() as session:
+            session.add(FormField(name="phone", label="Phone", field_type="text", is_required=True, is_active=True))
+            await session.flush()
+            await (session.commit() if commit else session.rollback())
+
+    asyncio.run(add_field(commit=False))
+    with query_budget(0):
+        assert client.get("/api/v1/form-fields").headers["etag"] == etag
+
+    asyncio.run(add_field(commit=True))
+    response = client.get("/api/v1/form-fields")
+    assert response.headers["etag"] != etag
+    assert [field["name"] for field in response.json()] == ["email", "phone"]
+
+
+def test_signup_is_validated_against_the_cached_rules(client, session_factory):
+    async def require_phone():
+        async with session_factory() as session:
+            session.add(FormField(name="phone", label="Phone", field_type="text", is_required=True, is_active=True))
+            await session.commit()
+
+    asyncio.run(require_phone())
+    response = client.post("/api/v1/users/", json={
+        "username": "alice",
+        "email": "alice@example.com",
+        "password": "correct horse battery staple",
+        "consent_lgpd": True,
+    })
+    assert response.status_code == 422, response.text
+    assert response.json()["detail"]["errors"] == {"phone": "Phone is required"}
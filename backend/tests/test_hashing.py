@@ -0,0 +1,54 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.utils.hashing import PasswordHasher, password_hasher
+
+
+def test_saturated_pool_rejects_with_503():
+    hasher = PasswordHasher(workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(hasher._run("hash", release.wait))
+        await asyncio.sleep(0.01)
+        try:
+            with pytest.raises(HTTPException) as error:
+                await hasher._run("hash", lambda: None)
+        finally:
+            release.set()
+            await running
+        return error.value
+
+    error = asyncio.run(scenario())
+    hasher.shutdown()
+    assert error.status_code == 503
+    assert error.headers == {"Retry-After": "1"}
+    assert hasher.pending == 0
+
+
+def test_hashing_runs_on_the_worker_pool():
+    hasher = PasswordHasher(workers=2)
+
+    async def scenario():
+        thread_name = await hasher._run("hash", lambda: threading.current_thread().name)
+        hashed = await hasher.hash("a password")
+        return thread_name, hashed, await hasher.verify("a password", hashed)
+
+    thread_name, hashed, verified = asyncio.run(scenario())
+    hasher.shutdown()
+    assert thread_name.startswith("password-hash")
+    assert hashed.startswith("$argon2id$")
+    assert verified
+
+
+def test_signup_returns_503_when_the_hash_pool_is_full(client, monkeypatch):
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+    response = client.post("/api/v1/users/", json={
+        "username": "alice", "email": "alice@example.com",
+        "password": "correct horse battery staple", "consent_lgpd": True,
+    })
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
@@ -0,0 +1,66 @@
+import threading
+
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from app.api.v1.endpoints import jwks
+from app.core.utils import jwt_keys
+from app.core.utils.jwt_keys import KeyRing
+
+
+def wait_for_key_generation() -> None:
+    for thread in threading.enumerate():
+        if thread.name == "jwt-keygen":
+            thread.join()
+
+
+def test_next_period_key_is_generated_off_the_request_path(tmp_path, monkeypatch):
+    generated_on = []
+
+    def generate():
+        generated_on.append(threading.current_thread().name)
+        return ec.generate_private_key(ec.SECP256R1())
+
+    monkeypatch.setitem(jwt_keys.ASYMMETRIC_ALGORITHMS, "ES256", generate)
+    now = [10 * 86400.0]
+    monkeypatch.setattr(jwt_keys.time, "time", lambda: now[0])
+    key_ring = KeyRing("ES256", "unused", str(tmp_path), rotation_days=1)
+
+    key_ring.refresh()
+    wait_for_key_generation()
+    key_ring.refresh()
+    assert generated_on == ["MainThread", "jwt-keygen"]
+    assert len(key_ring.jwks["keys"]) == 2
+
+    # Crossing into the next period signs with the pre-generated key and
+    # only generates the following one in the background.
+    now[0] += 86400
+    token = key_ring.encode({"sub": "alice"})
+    wait_for_key_generation()
+    assert generated_on == ["MainThread", "jwt-keygen", "jwt-keygen"]
+    assert key_ring.decode(token)["sub"] == "alice"
+    assert len(key_ring.jwks["keys"]) == 3
+
+
+def test_jwks_endpoint_loads_new_keys_off_the_event_loop(client, tmp_path, monkeypatch):
+    generated_on = []
+
+    def generate():
+        generated_on.append(threading.current_thread().name)
+        return ec.generate_private_key(ec.SECP256R1())
+
+    monkeypatch.setitem(jwt_keys.ASYMMETRIC_ALGORITHMS, "ES256", generate)
+    key_ring = KeyRing("ES256", "unused", str(tmp_path), rotation_days=1)
+    monkeypatch.setattr(jwks, "key_ring", key_ring)
+
+    response = client.get("/.well-known/jwks.json")
+    wait_for_key_generation()
+
+    assert response.status_code == 200
+    assert generated_on[0].startswith("asyncio_")
+    # The background key is published by the next request.
+    assert key_ring.stale
+    response = client.get("/.well-known/jwks.json")
+    assert len(response.json()["keys"]) == 2
+    assert not key_ring.stale
+    etag = response.headers["etag"]
+    assert client.get("/.well-known/jwks.json", headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,76 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.api.v1.endpoints import users
+from app.domain.entities.log import Log
+
+
+@pytest.fixture
+def logs(session_factory, monkeypatch):
+    # The export opens its own session outside the request
+    monkeypatch.setattr(users, "AsyncSessionLocal", session_factory)
+    start = datetime(2026, 1, 1)
+
+    async def seed():
+        async with session_factory() as session:
+            session.add_all([
+                Log(
+                    id=f"log-{number:02d}",
+                    user_id=None,
+                    action="login_success" if number % 2 else "login_failed",
+                    timestamp=start + timedelta(minutes=number // 2),
+                    details=f'detail, "{number}"',
+                )
+                for number in range(9)
+            ])
+            await session.commit()
+
+    asyncio.run(seed())
+    return [f"log-{number:02d}" for number in reversed(range(9))]
+
+
+@pytest.fixture
+def auditor(client, add_user):
+    client.cookies["access_token"] = add_user("auditor", ["logs:view"])
+    return client
+
+
+def test_log_cursor_pages_through_every_row_once(auditor, logs):
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 4}
+        if cursor:
+            params["cursor"] = cursor
+        page = auditor.get("/api/v1/users/logs", params=params).json()
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == logs
+
+    page = auditor.get("/api/v1/users/logs", params={"action": "login_failed", "limit": 100}).json()
+    assert [item["id"] for item in page["items"]] == [log_id for log_id in logs if int(log_id[-2:]) % 2 == 0]
+
+
+def test_export_streams_every_row_as_ndjson_and_csv(auditor, logs):
+    response = auditor.get("/api/v1/users/logs/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == logs
+
+    response = auditor.get("/api/v1/users/logs/export", params={"format": "csv", "action": "login_success"})
+    assert response.headers["content-disposition"] == 'attachment; filename="audit_logs.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["id"] for row in rows] == [log_id for log_id in logs if int(log_id[-2:]) % 2]
+    assert rows[0]["details"] == 'detail, "7"'
+
+
+def test_export_requires_logs_permission(client, add_user, logs):
+    client.cookies["access_token"] = add_user("viewer", ["user:view"])
+    assert client.get("/api/v1/users/logs/export").status_code == 403
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from app.domain.entities.email_outbox import EmailOutbox
+from app.infrastructure.repositories.email_outbox_repository import EmailOutboxRepository
+from app.infrastructure.repositories.log_repository import LogRepository
+from app.infrastructure.workers.mail_outbox import MailOutboxWorker, mail_outbox_worker
+
+
+class FakePool:
+    size = 1
+
+    def __init__(self, error: Exception | None = None):
+        self.error = error
+        self.sent = []
+
+    def send(self, message) -> None:
+        if self.error is not None:
+            raise self.error
+        self.sent.append(message)
+
+    def close(self) -> None:
+        pass
+
+
+def deliver(session_factory, pool: FakePool) -> EmailOutbox:
+    async def scenario():
+        async with session_factory() as session:
+            EmailOutboxRepository(session).add_email(
+                "alice@example.com", "Reset", "Use this link: https://example.com/reset?token=secret",
+            )
+            await session.commit()
+        worker = MailOutboxWorker(session_factory, pool, max_attempts=1, rate_limit=0)
+        try:
+            await worker.deliver_due()
+        finally:
+            await worker.stop()
+        async with session_factory() as session:
+            return (await session.execute(select(EmailOutbox))).scalar_one()
+
+    return asyncio.run(scenario())
+
+
+def test_sent_email_body_is_erased(session_factory):
+    pool = FakePool()
+    email = deliver(session_factory, pool)
+    assert len(pool.sent) == 1
+    assert "token=secret" in str(pool.sent[0])
+    assert email.status == "sent"
+    assert email.body == ""
+
+
+def test_failed_email_body_is_erased(session_factory):
+    email = deliver(session_factory, FakePool(ConnectionError("refused")))
+    assert email.status == "failed"
+    assert email.body == ""
+
+
+def _outbox(session_factory) -> list[EmailOutbox]:
+    async def query():
+        async with session_factory() as session:
+            return (await session.execute(select(EmailOutbox))).scalars().all()
+    return asyncio.run(query())
+
+
+def test_reset_request_queues_the_email_and_wakes_the_worker_on_commit(client, session_factory, add_user, monkeypatch):
+    add_user("alice")
+    woken = []
+    monkeypatch.setattr(mail_outbox_worker, "wake", lambda: woken.append(True))
+
+    response = client.post("/api/v1/password-reset/request", json={"email": "alice@example.com"})
+
+    assert response.status_code == 200, response.text
+    assert woken == [True]
+    emails = _outbox(session_factory)
+    assert [(email.to_email, email.status) for email in emails] == [("alice@example.com", "pending")]
+    assert "/reset?token=" in emails[0].body
+
+
+def test_failed_reset_request_leaves_no_email_behind(client, session_factory, add_user, monkeypatch):
+    add_user("alice")
+    woken = []
+    monkeypatch.setattr(mail_outbox_worker, "wake", lambda: woken.append(True))
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("log store unavailable")
+    monkeypatch.setattr(LogRepository, "create_log", fail)
+
+    with pytest.raises(RuntimeError):
+        client.post("/api/v1/password-reset/request", json={"email": "alice@example.com"})
+
+    assert woken == []
+    assert _outbox(session_factory) == []
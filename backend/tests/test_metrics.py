@@ -0,0 +1,14 @@
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.endpoints.metrics import require_metrics_scraper
+from app.core.config.settings import settings
+
+
+def test_metrics_scraper_token_is_checked(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_BEARER_TOKEN", "scrape")
+    require_metrics_scraper("Bearer scrape")
+    for authorization in (None, "Bearer wrong", "Bearer café"):
+        with pytest.raises(HTTPException) as error:
+            require_metrics_scraper(authorization)
+        assert error.value.status_code == 401
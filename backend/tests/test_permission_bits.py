@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+from sqlalchemy import delete, insert
+
+from app.core.utils.permission_bits import PermissionRegistry
+from app.domain.entities.permission import Permission, role_effective_permissions
+from app.domain.entities.role import Role, user_roles
+from app.domain.entities.user import User
+from app.infrastructure.repositories.permission_repository import PermissionRepository
+from app.infrastructure.repositories.user_repository import UserRepository
+
+
+def test_bits_of_deleted_permissions_are_not_reused(session_factory):
+    async def scenario():
+        async with session_factory() as session:
+            session.add_all([Permission(name="a"), Permission(name="b")])
+            await session.commit()
+            first = await PermissionRepository(session).get_bits()
+            await session.execute(delete(Permission).where(Permission.name == "b"))
+            session.add(Permission(name="c"))
+            await session.commit()
+            second = await PermissionRepository(session).get_bits()
+            return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == {"a": 0, "b": 1}
+    assert second == {"a": 0, "c": 2}
+
+
+def test_mask_check_matches_join_and_is_faster(session_factory):
+    names = [f"perm:{number}" for number in range(40)]
+    granted = set(names[::3])
+
+    async def scenario():
+        async with session_factory() as session:
+            session.add_all([Permission(name=name) for name in names])
+            session.add_all([
+                Role(id="r-1", name="r1"),
+                User(id="u-1", username="u1", email="u1@example.com", hashed_password="x"),
+            ])
+            await session.flush()
+            await session.execute(insert(user_roles).values(user_id="u-1", role_id="r-1"))
+            await session.execute(insert(role_effective_permissions), [
+                {"role_id": "r-1", "permission_name": name} for name in granted
+            ])
+            await session.commit()
+
+            registry = PermissionRegistry()
+            await registry.load(session)
+            repo = UserRepository(session)
+            user_mask = registry.mask(await repo.get_permissions("u-1"))
+
+            start = time.perf_counter()
+            by_join = {name: await repo.has_permission("u-1", name) for name in names}
+            join_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            by_mask = {}
+            for name in names:
+                mask = registry.mask([name])
+                by_mask[name] = user_mask & mask == mask
+            mask_seconds = time.perf_counter() - start
+            return by_join, by_mask, join_seconds, mask_seconds
+
+    by_join, by_mask, join_seconds, mask_seconds = asyncio.run(scenario())
+    assert by_mask == by_join
+    assert {name for name, allowed in by_mask.items() if allowed} == granted
+    assert mask_seconds < join_seconds
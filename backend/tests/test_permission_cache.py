@@ -0,0 +1,25 @@
+from app.core.utils.permission_cache import permission_cache
+
+
+def permission_queries(profile) -> int:
+    return sum("role_effective_permissions" in shape for shape, _, _ in profile.statements)
+
+
+def test_permissions_are_cached_and_invalidated_on_role_change(client, add_user, query_budget):
+    admin = add_user("admin", ["user:edit_roles", "logs:view"])
+    bob = add_user("bob")
+
+    client.cookies["access_token"] = bob
+    assert client.get("/api/v1/users/logs").status_code == 403
+    with query_budget(10) as profile:
+        assert client.get("/api/v1/users/logs").status_code == 403
+    assert permission_queries(profile) == 0
+    assert permission_cache.get("bob") is not None
+
+    client.cookies["access_token"] = admin
+    response = client.patch("/api/v1/users/users/bob/roles", json={"roles": ["admin"]})
+    assert response.status_code == 200, response.text
+    assert permission_cache.get("bob") is None
+
+    client.cookies["access_token"] = bob
+    assert client.get("/api/v1/users/logs").status_code == 200
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config.database import Base
+from app.core.config.routing import RoutingSession
+from app.domain.entities.log import Log, new_log_entry
+from app.domain.entities.permission import Permission, role_effective_permissions
+from app.domain.entities.role import Role, user_roles
+from app.domain.entities.user import User
+from app.infrastructure.repositories.log_repository import LogRepository
+from app.infrastructure.repositories.user_repository import UserRepository
+
+
+@pytest.fixture
+def routed():
+    """
+    Session factory routing to two SQLite databases standing in for the
+    primary and a lagging replica. Alice exists on both, with a different
+    email on each, so every read shows where it was answered.
+    """
+    primary = create_async_engine("sqlite+aiosqlite://")
+    replica = create_async_engine("sqlite+aiosqlite://")
+    factory = sessionmaker(
+        bind=primary,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        replica_bind=replica.sync_engine,
+        expire_on_commit=False,
+    )
+
+    async def seed(engine, where):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as session:
+            session.add_all([
+                Permission(name="users:view"),
+                Role(id="r-viewer", name="viewer"),
+                User(id="alice", username="alice", email=f"alice@{where}.test", hashed_password="x"),
+            ])
+            await session.flush()
+            await session.execute(insert(Log), [new_log_entry("alice", f"seen_on_{where}")])
+            if where == "primary":
+                # Granted after the replica's last sync
+                await session.execute(insert(user_roles).values(user_id="alice", role_id="r-viewer"))
+                await session.execute(
+                    insert(role_effective_permissions).values(role_id="r-viewer", permission_name="users:view")
+                )
+            await session.commit()
+
+    async def setup():
+        await seed(primary, "primary")
+        await seed(replica, "replica")
+
+    asyncio.run(setup())
+    yield factory
+
+    async def dispose():
+        await primary.dispose()
+        await replica.dispose()
+
+    asyncio.run(dispose())
+
+
+def test_auth_and_write_path_lookups_read_the_primary(routed):
+    async def scenario():
+        async with routed() as session:
+            repo = UserRepository(session)
+            return [
+                (await repo.get_by_username("alice")).email,
+                (await repo.get_by_email("alice@primary.test")).email,
+                (await repo.get_by_id("alice")).email,
+                (await repo.get_by_usernames(["alice"]))["alice"].email,
+                await repo.get_permissions("alice"),
+            ]
+
+    assert asyncio.run(scenario()) == [
+        "alice@primary.test", "alice@primary.test", "alice@primary.test", "alice@primary.test", ["users:view"],
+    ]
+
+
+def test_listings_read_the_replica(routed):
+    async def scenario():
+        async with routed() as session:
+            users, _, total = await UserRepository(session).list_users_page(10, include_total=True)
+            all_users = await UserRepository(session).list_all_users()
+            logs, _ = await LogRepository(session).list_logs_page(10)
+            streamed = [row async for row in LogRepository(session).stream_logs()]
+            return (
+                [user.email for user in users], total, [user.email for user in all_users],
+                [row.action for row in logs], [row.action for row in streamed],
+            )
+
+    assert asyncio.run(scenario()) == (
+        ["alice@replica.test"], 1, ["alice@replica.test"], ["seen_on_replica"], ["seen_on_replica"],
+    )
+
+
+def test_listings_read_their_own_writes_until_the_transaction_ends(routed):
+    async def scenario():
+        async with routed() as session:
+            repo = LogRepository(session)
+            repo.add_log("alice", "written_now")
+            await session.flush()
+            during, _ = await repo.list_logs_page(10)
+            await session.commit()
+            after, _ = await repo.list_logs_page(10)
+            return sorted(row.action for row in during), [row.action for row in after]
+
+    assert asyncio.run(scenario()) == (["seen_on_primary", "written_now"], ["seen_on_replica"])
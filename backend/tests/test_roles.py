@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import mysql
+
+from app.domain.entities.permission import Permission, role_effective_permissions, role_permissions
+from app.domain.entities.role import Role, role_inheritance
+from app.infrastructure.repositories.role_repository import RoleRepository
+from app.infrastructure.workers import role_closure
+
+
+def test_rebuild_role_closure_includes_inherited_permissions(session_factory, monkeypatch):
+    monkeypatch.setattr(role_closure, "AsyncSessionLocal", session_factory)
+
+    async def scenario():
+        async with session_factory() as session:
+            session.add_all([
+                Permission(name="users:view"),
+                Permission(name="logs:view"),
+                Role(id="r-viewer", name="viewer"),
+                Role(id="r-auditor", name="auditor"),
+            ])
+            await session.flush()
+            # Edited by hand, bypassing RoleRepository
+            await session.execute(insert(role_permissions), [
+                {"role_id": "r-viewer", "permission_name": "users:view"},
+                {"role_id": "r-auditor", "permission_name": "logs:view"},
+            ])
+            await session.execute(insert(role_inheritance), [
+                {"role_id": "r-auditor", "parent_role_id": "r-viewer"},
+            ])
+            await session.commit()
+
+        await role_closure.rebuild_role_closure()
+
+        async with session_factory() as session:
+            result = await session.execute(select(
+                role_effective_permissions.c.role_id, role_effective_permissions.c.permission_name,
+            ))
+            return set(result.all())
+
+    assert asyncio.run(scenario()) == {
+        ("r-viewer", "users:view"),
+        ("r-auditor", "users:view"),
+        ("r-auditor", "logs:view"),
+    }
+
+
+def test_role_permissions_relationship_is_read_only(session_factory):
+    async def scenario():
+        async with session_factory() as session:
+            permission = Permission(name="users:view")
+            session.add_all([permission, Role(id="r-viewer", name="viewer")])
+            await session.commit()
+            role = await session.get(Role, "r-viewer")
+            await session.refresh(role, ["permissions"])
+            role.permissions.append(permission)
+            await session.commit()
+            result = await session.execute(select(role_permissions))
+            return result.all()
+
+    assert asyncio.run(scenario()) == []
+
+
+def test_set_parents_checks_for_cycles_under_lock(session_factory):
+    async def scenario():
+        async with session_factory() as session:
+            session.add_all([Role(id="r-viewer", name="viewer"), Role(id="r-auditor", name="auditor")])
+            await session.commit()
+            repo = RoleRepository(session)
+            await repo.set_parents("auditor", ["viewer"])
+            await session.commit()
+
+            statements = []
+            execute = session.execute
+
+            async def record(statement, *args, **kwargs):
+                statements.append(str(statement.compile(dialect=mysql.dialect())))
+                return await execute(statement, *args, **kwargs)
+
+            session.execute = record
+            with pytest.raises(ValueError, match="cycles"):
+                await repo.set_parents("viewer", ["auditor"])
+            return statements
+
+    statements = asyncio.run(scenario())
+    locked = [sql for sql in statements if sql.endswith(("FOR UPDATE", "LOCK IN SHARE MODE"))]
+    assert [sql.split("FROM ")[1].split()[0] for sql in locked] == ["roles", "role_inheritance"]
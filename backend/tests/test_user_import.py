@@ -0,0 +1,67 @@
+import asyncio
+
+from app.core.config.settings import settings
+from app.core.utils.form_field_cache import form_field_cache
+from app.core.utils.user_import import UserImporter
+from app.domain.entities.user import User
+from app.infrastructure.repositories.user_repository import UserRepository
+
+
+def test_import_retries_without_rows_registered_concurrently(session_factory, monkeypatch):
+    find_existing = UserRepository.find_existing
+    calls = []
+
+    async def miss_first_lookup(self, usernames, emails):
+        # The first lookup runs before the concurrent signup is visible,
+        # so the conflict is only caught by the unique index on insert.
+        calls.append(usernames)
+        if len(calls) == 1:
+            return set(), set()
+        return await find_existing(self, usernames, emails)
+
+    monkeypatch.setattr(UserRepository, "find_existing", miss_first_lookup)
+
+    async def run_import():
+        async with session_factory() as session:
+            session.add(User(
+                id="existing-id", username="bob", email="bob@example.com",
+                hashed_password="x", is_active=True, role="user",
+            ))
+            await session.commit()
+            importer = UserImporter(session, await form_field_cache.get(session), chunk_size=10)
+            return await importer.run([
+                {"username": "alice", "email": "alice@example.com", "password": "secret123", "consent_lgpd": True},
+                {"username": "bob", "email": "bob@other.com", "password": "secret123", "consent_lgpd": True},
+            ])
+
+    report = asyncio.run(run_import())
+
+    assert len(calls) == 2
+    assert report.created == 1
+    assert report.duplicates == 1
+    assert [(row.username, row.status) for row in report.rows] == [("alice", "created"), ("bob", "duplicate")]
+
+
+def test_import_keeps_committed_chunks_when_the_file_stops_decoding(client, add_user, monkeypatch):
+    monkeypatch.setattr(settings, "USER_IMPORT_CHUNK_SIZE", 50)
+    client.cookies["access_token"] = add_user("admin", ["user:import"])
+    # Large enough that the first decoded block is clean and the bad byte is
+    # only reached after some chunks were committed.
+    lines = [f"user{n},user{n}@example.com,secret123,true" for n in range(300)]
+    body = ("username,email,password,consent_lgpd\n" + "\n".join(lines) + "\n").encode() + b"bad\xff,row\n"
+
+    response = client.post("/api/v1/users/import?format=csv", files={"file": ("users.csv", body)})
+
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert 0 < report["created"] <= 300
+    assert report["error"].startswith(f"File is not valid UTF-8 after row {report['created']};")
+
+
+def test_import_rejects_a_file_that_is_not_utf8_from_the_start(client, add_user):
+    client.cookies["access_token"] = add_user("admin", ["user:import"])
+    response = client.post(
+        "/api/v1/users/import?format=csv",
+        files={"file": ("users.csv", b"username,email\n\xff\xfe,x\n")},
+    )
+    assert response.status_code == 400
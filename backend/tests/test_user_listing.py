@@ -0,0 +1,78 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from app.domain.entities.permission import Permission, role_effective_permissions
+from app.domain.entities.role import Role, user_roles
+from app.domain.entities.user import User
+
+
+def seed_users(session_factory, count: int) -> None:
+    async def scenario():
+        async with session_factory() as session:
+            session.add_all([Permission(name="users:view"), Permission(name="logs:view")])
+            session.add_all([Role(id="r-viewer", name="viewer"), Role(id="r-auditor", name="auditor")])
+            session.add_all([
+                User(id=f"u-{number}", username=f"user{number}", email=f"user{number}@example.com", hashed_password="x")
+                for number in range(count)
+            ])
+            await session.flush()
+            await session.execute(insert(role_effective_permissions), [
+                {"role_id": "r-viewer", "permission_name": "users:view"},
+                {"role_id": "r-auditor", "permission_name": "logs:view"},
+            ])
+            await session.execute(insert(user_roles), [
+                {"user_id": f"u-{number}", "role_id": role_id}
+                for number in range(count)
+                for role_id in ("r-viewer", "r-auditor")[: number % 2 + 1]
+            ])
+            await session.commit()
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("count", [3, 40])
+def test_listing_runs_a_constant_number_of_queries(client, session_factory, query_budget, count):
+    seed_users(session_factory, count)
+    with query_budget(3, n_plus_one_threshold=2):
+        response = client.get("/api/v1/users/", params={"limit": 50})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == count
+    assert {tuple(item["permissions"]) for item in items} == {("users:view",), ("logs:view", "users:view")}
+
+
+def test_cursor_pages_through_every_user_once(client, session_factory):
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    async def scenario():
+        async with session_factory() as session:
+            # Pairs of users share a timestamp, so pages must break ties on id
+            session.add_all([
+                User(
+                    id=f"u-{number}", username=f"user{number}", email=f"user{number}@example.com",
+                    hashed_password="x", created_at=created_at + timedelta(minutes=number // 2),
+                )
+                for number in range(7)
+            ])
+            await session.commit()
+
+    asyncio.run(scenario())
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, "include_total": True}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/v1/users/", params=params).json()
+        assert page["total"] == 7
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == ["u-6", "u-5", "u-4", "u-3", "u-2", "u-1", "u-0"]
+
+    page = client.get("/api/v1/users/", params={"username_prefix": "user1"}).json()
+    assert [item["id"] for item in page["items"]] == ["u-1"]
+    assert client.get("/api/v1/users/", params={"cursor": "garbage"}).status_code == 400
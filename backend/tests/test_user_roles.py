@@ -0,0 +1,75 @@
+import asyncio
+
+from sqlalchemy import select
+
+from app.domain.entities.log import Log
+from app.domain.entities.role import Role, user_roles
+
+
+def _memberships(session_factory):
+    async def query():
+        async with session_factory() as session:
+            result = await session.execute(select(user_roles.c.user_id, user_roles.c.role_id))
+            return {row for row in result.all() if row[0] != "admin"}
+    return asyncio.run(query())
+
+
+def _add_role(session_factory, name):
+    async def create():
+        async with session_factory() as session:
+            session.add(Role(id=f"r-{name}", name=name))
+            await session.commit()
+    asyncio.run(create())
+
+
+def test_bulk_add_and_remove_only_touch_changed_memberships(client, session_factory, add_user):
+    client.cookies["access_token"] = add_user("admin", ["user:edit_roles"])
+    add_user("bob")
+    add_user("carol")
+    _add_role(session_factory, "auditor")
+
+    response = client.post("/api/v1/users/roles/bulk", json={
+        "user_ids": ["bob", "carol", "ghost"], "add": ["auditor"], "remove": ["bob"],
+    })
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {"updated": 2, "missing_user_ids": ["ghost"]}
+    assert _memberships(session_factory) == {
+        ("bob", "r-auditor"), ("carol", "r-auditor"), ("carol", "r-carol"),
+    }
+
+    async def logged():
+        async with session_factory() as session:
+            result = await session.execute(select(Log.user_id).where(Log.action == "user_roles_updated"))
+            return sorted(result.scalars().all())
+    assert asyncio.run(logged()) == ["bob", "carol"]
+
+    # Repeating the request changes nothing.
+    response = client.post("/api/v1/users/roles/bulk", json={
+        "user_ids": ["bob", "carol"], "add": ["auditor"], "remove": ["bob"],
+    })
+    assert response.json() == {"updated": 0, "missing_user_ids": []}
+
+
+def test_bulk_replace_sets_the_exact_role_list(client, session_factory, add_user):
+    client.cookies["access_token"] = add_user("admin", ["user:edit_roles"])
+    add_user("bob")
+    add_user("carol")
+    _add_role(session_factory, "auditor")
+
+    response = client.post("/api/v1/users/roles/bulk", json={
+        "user_ids": ["bob", "carol"], "replace": ["auditor"],
+    })
+
+    assert response.json() == {"updated": 2, "missing_user_ids": []}
+    assert _memberships(session_factory) == {("bob", "r-auditor"), ("carol", "r-auditor")}
+
+
+def test_bulk_update_with_an_unknown_role_changes_nothing(client, session_factory, add_user):
+    client.cookies["access_token"] = add_user("admin", ["user:edit_roles"])
+    add_user("bob")
+
+    response = client.post("/api/v1/users/roles/bulk", json={"user_ids": ["bob"], "add": ["nope"]})
+
+    assert response.status_code == 404
+    assert _memberships(session_factory) == {("bob", "r-bob")}
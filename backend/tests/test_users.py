@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config.unit_of_work import count_commits
+from app.infrastructure.repositories.user_repository import duplicate_user_field
+
+
+def test_signup_inserts_once_and_commits_once(client, query_budget):
+    with count_commits() as counter, query_budget(10) as profile:
+        response = client.post("/api/v1/users/", json={
+            "username": "alice",
+            "email": "alice@example.com",
+            "password": "correct horse battery staple",
+            "consent_lgpd": True,
+        })
+    assert response.status_code == 201, response.text
+    assert counter.commits == 1
+    assert counter.rollbacks == 0
+    user_inserts = [shape for shape, _, _ in profile.statements if shape.startswith("INSERT INTO users")]
+    assert len(user_inserts) == 1
+
+
+@pytest.mark.parametrize("orig, field", [
+    (Exception(1062, "Duplicate entry 'a@example.com' for key 'users.ix_users_email'"), "email"),
+    (Exception(1062, "Duplicate entry 'alice' for key 'ix_users_username'"), "username"),
+    (Exception("UNIQUE constraint failed: users.email"), "email"),
+    (Exception("UNIQUE constraint failed: users.username"), "username"),
+    (Exception(1452, "Cannot add or update a child row: a foreign key constraint fails"), None),
+])
+def test_duplicate_user_field_reads_the_constraint_from_the_driver_error(orig, field):
+    assert duplicate_user_field(IntegrityError("INSERT INTO users", {}, orig)) == field
+
+
+def test_signup_reports_which_field_is_taken(client):
+    payload = {
+        "username": "alice",
+        "email": "alice@example.com",
+        "password": "correct horse battery staple",
+        "consent_lgpd": True,
+    }
+    assert client.post("/api/v1/users/", json=payload).status_code == 201
+    response = client.post("/api/v1/users/", json={**payload, "username": "alice2"})
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Email already registered"
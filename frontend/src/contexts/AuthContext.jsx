@@ -37,7 +37,12 @@ export function AuthProvider({ children }) {
     }
   };
 
-  const logout = () => {
+  const logout = async () => {
+    try {
+      await axios.post(`${import.meta.env.VITE_API_URL}/users/logout`);
+    } catch {
+      // The cookies are cleared server side; nothing else to undo here
+    }
     localStorage.removeItem('access_token');
     setUser(null);
   };
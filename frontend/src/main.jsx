@@ -6,6 +6,29 @@ import './App.css';
 
 axios.defaults.withCredentials = true;
 
+// On 401, exchange the refresh token cookie for a new access token once and
+// retry. Concurrent failures share a single refresh request.
+let refreshing = null;
+axios.interceptors.response.use(
+  (response) => response,
+  async (error) => {
+    const { config, response } = error;
+    if (response?.status !== 401 || !config || config._retried || config.url?.includes('/token')) {
+      return Promise.reject(error);
+    }
+    config._retried = true;
+    refreshing = refreshing || axios
+      .post(`${import.meta.env.VITE_API_URL}/token/refresh`)
+      .finally(() => { refreshing = null; });
+    try {
+      await refreshing;
+    } catch {
+      return Promise.reject(error);
+    }
+    return axios(config);
+  }
+);
+
 ReactDOM.createRoot(document.getElementById('root')).render(
   <React.StrictMode>
     <App />
@@ -111,6 +111,8 @@ const AdminPage = () => {
   const { user } = useAuth();
   const [users, setUsers] = useState([]);
   const [logs, setLogs] = useState([]);
+  const [usersCursor, setUsersCursor] = useState(null);
+  const [logsCursor, setLogsCursor] = useState(null);
   const [newUser, setNewUser] = useState({ username: '', email: '', password: '', consent_lgpd: false });
   const [rolesEdit, setRolesEdit] = useState({});
   const [message, setMessage] = useState('');
@@ -130,14 +132,45 @@ const AdminPage = () => {
         axios.get(`${API}/users/`, { withCredentials: true }),
         axios.get(`${API}/users/logs`, { withCredentials: true }),
       ]);
-      setUsers(usersRes.data);
-      setLogs(logsRes.data);
+      setUsers(usersRes.data.items);
+      setUsersCursor(usersRes.data.next_cursor);
+      setLogs(logsRes.data.items);
+      setLogsCursor(logsRes.data.next_cursor);
     } catch (err) {
       setError('Failed to fetch users or logs');
     }
     setLoading(false);
   };
 
+  // Fetch the next page using the cursor returned with the previous one
+  const loadMoreUsers = async () => {
+    setError('');
+    try {
+      const res = await axios.get(`${API}/users/`, {
+        params: { cursor: usersCursor },
+        withCredentials: true,
+      });
+      setUsers(prev => [...prev, ...res.data.items]);
+      setUsersCursor(res.data.next_cursor);
+    } catch (err) {
+      setError('Failed to fetch more users');
+    }
+  };
+
+  const loadMoreLogs = async () => {
+    setError('');
+    try {
+      const res = await axios.get(`${API}/users/logs`, {
+        params: { cursor: logsCursor },
+        withCredentials: true,
+      });
+      setLogs(prev => [...prev, ...res.data.items]);
+      setLogsCursor(res.data.next_cursor);
+    } catch (err) {
+      setError('Failed to fetch more logs');
+    }
+  };
+
   // Register new user
   const handleRegister = async (e) => {
     e.preventDefault();
@@ -322,6 +355,11 @@ const AdminPage = () => {
             )}
           </tbody>
         </table>
+        {usersCursor && (
+          <button style={{ ...styles.button, marginTop: 12 }} onClick={loadMoreUsers}>
+            Load more users
+          </button>
+        )}
       </div>
 
       {/* Audit Logs */}
@@ -341,6 +379,11 @@ const AdminPage = () => {
             </div>
           ))}
         </div>
+        {logsCursor && (
+          <button style={{ ...styles.button, marginTop: 12 }} onClick={loadMoreLogs}>
+            Load more logs
+          </button>
+        )}
       </div>
     </div>
   );